@@ -67,6 +67,41 @@ DATABASES = {
     }
 }
 
+# Production deployments set POSTGRES_DB to use PostgreSQL (psycopg2-binary is in requirements.txt)
+if os.environ.get('POSTGRES_DB'):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ['POSTGRES_DB'],
+        'USER': os.environ.get('POSTGRES_USER', ''),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', ''),
+        'PORT': os.environ.get('POSTGRES_PORT', ''),
+    }
+
+# Opt-in SQLite production profile (SQLITE_PRODUCTION=true): WAL journal, synchronous=NORMAL,
+# larger page cache and mmap (applied by equipment_api.signals) and persistent connections
+SQLITE_PRODUCTION = os.environ.get('SQLITE_PRODUCTION', '').lower() in ('1', 'true', 'yes', 'on')
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+if SQLITE_PRODUCTION and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        # Seconds a writer waits for the lock before raising "database is locked"
+        'OPTIONS': {'timeout': 20},
+    })
+
+# Cache backend for rendered API responses - local memory by default. Deployments running
+# several worker processes should point CACHE_BACKEND/CACHE_LOCATION at a shared cache
+# (e.g. django.core.cache.backends.redis.RedisCache) so invalidation reaches every worker
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'equipment-api'),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -98,6 +133,42 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# CSV ingestion configuration
+# Maximum accepted upload size in bytes (set to 0 to disable the check)
+CSV_UPLOAD_MAX_SIZE = int(os.environ.get('CSV_UPLOAD_MAX_SIZE', 1024 * 1024 * 1024))
+# Rows read from the CSV per chunk and rows written per INSERT statement
+CSV_INGEST_CHUNK_SIZE = int(os.environ.get('CSV_INGEST_CHUNK_SIZE', 50000))
+CSV_INGEST_BATCH_SIZE = int(os.environ.get('CSV_INGEST_BATCH_SIZE', 5000))
+# Worker threads for background ingestion jobs (POST /api/upload/?async=true)
+CSV_INGEST_WORKERS = int(os.environ.get('CSV_INGEST_WORKERS', 2))
+# Queued/running jobs without progress for this many seconds are treated as orphaned by a restart
+INGESTION_JOB_STALE_SECONDS = int(os.environ.get('INGESTION_JOB_STALE_SECONDS', 600))
+# Resumable uploads (/api/upload/chunked/): default bytes per chunk and hours an unfinished upload is kept
+CSV_UPLOAD_CHUNK_SIZE = int(os.environ.get('CSV_UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024))
+CSV_CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.environ.get('CSV_CHUNKED_UPLOAD_EXPIRY_HOURS', 24))
+# Uploads larger than this are returned without nested equipment records
+CSV_UPLOAD_RESPONSE_MAX_RECORDS = int(os.environ.get('CSV_UPLOAD_RESPONSE_MAX_RECORDS', 10000))
+
+# Rows sampled per upload for percentile statistics (exact below this size)
+STATISTICS_SAMPLE_SIZE = int(os.environ.get('STATISTICS_SAMPLE_SIZE', 200000))
+
+# Upper bound for cached PDF reports under MEDIA_ROOT/reports (least recently used are evicted)
+REPORT_CACHE_MAX_SIZE = int(os.environ.get('REPORT_CACHE_MAX_SIZE', 200 * 1024 * 1024))
+
+# Batch uploads: parser processes (0 uses every CPU) and files accepted per request
+CSV_BATCH_WORKERS = int(os.environ.get('CSV_BATCH_WORKERS', 0))
+CSV_BATCH_MAX_FILES = int(os.environ.get('CSV_BATCH_MAX_FILES', 100))
+# Total bytes ZIP archives in one batch may expand to (members are streamed to temporary files)
+CSV_BATCH_MAX_EXTRACTED_SIZE = int(os.environ.get('CSV_BATCH_MAX_EXTRACTED_SIZE', 2 * 1024 * 1024 * 1024))
+
+# Delta uploads chained on top of one full upload before the next upload stores every row again
+CSV_DELTA_MAX_DEPTH = int(os.environ.get('CSV_DELTA_MAX_DEPTH', 8))
+
+# Rendered history/detail/statistics responses: seconds kept in the cache (0 disables caching,
+# ETags are still sent) and the largest response body stored
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+RESPONSE_CACHE_MAX_SIZE = int(os.environ.get('RESPONSE_CACHE_MAX_SIZE', 8 * 1024 * 1024))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
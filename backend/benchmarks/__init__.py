@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks for the Chemical Equipment Parameter Visualizer backend
+Run from the backend directory, e.g. python -m benchmarks.bench_row_conversion
+"""
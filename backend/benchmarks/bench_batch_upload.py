@@ -0,0 +1,63 @@
+"""
+Benchmark batch CSV uploads
+Compares one upload_csv request per file with a single /api/upload/batch/ request
+
+Usage: python -m benchmarks.bench_batch_upload [files] [rows per file]
+"""
+
+import sys
+
+from .common import setup_django, make_equipment_frame, timed
+
+
+def make_files(count, rows, first_seed):
+    """Distinct CSV payloads, so deduplication does not skip any of them."""
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    return [
+        SimpleUploadedFile(
+            f'unit_{seed}.csv',
+            make_equipment_frame(rows, seed=seed).to_csv(index=False).encode()
+        )
+        for seed in range(first_seed, first_seed + count)
+    ]
+
+
+def upload_one_by_one(client, files):
+    for csv_file in files:
+        response = client.post('/api/upload/', {'csv_file': csv_file}, format='multipart')
+        assert response.status_code == 201, response.data
+
+
+def upload_batch(client, files):
+    response = client.post('/api/upload/batch/', {'files': files}, format='multipart')
+    assert response.data['summary']['created'] == len(files), response.data
+
+
+def main(file_count, rows):
+    setup_django()
+
+    from django.conf import settings
+    from rest_framework.test import APIClient
+    from equipment_api.batch import get_process_pool, parser_worker_count
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    client = APIClient()
+
+    # Start the parser processes outside the timed section
+    get_process_pool().submit(int).result()
+
+    _, sequential = timed(upload_one_by_one, client, make_files(file_count, rows, first_seed=0))
+    _, batched = timed(upload_batch, client, make_files(file_count, rows, first_seed=file_count))
+
+    total_rows = file_count * rows
+    print(f'{file_count} files x {rows} rows, {parser_worker_count()} parser processes')
+    print(f'{"mode":>12} {"seconds":>9} {"files/s":>9} {"rows/s":>11}')
+    for mode, elapsed in (('one by one', sequential), ('batch', batched)):
+        print(f'{mode:>12} {elapsed:>9.2f} {file_count / elapsed:>9.1f} {total_rows / elapsed:>11,.0f}')
+    print(f'speedup: {sequential / batched:.1f}x')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 24, args[1] if len(args) > 1 else 20000)
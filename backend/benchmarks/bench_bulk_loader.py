@@ -0,0 +1,38 @@
+"""
+Benchmark EquipmentData bulk loading
+Compares bulk_create with the database-specific loader (COPY on PostgreSQL, executemany on SQLite)
+
+Usage: python -m benchmarks.bench_bulk_loader [rows ...]
+Set POSTGRES_DB (and POSTGRES_USER/PASSWORD/HOST/PORT) to run against PostgreSQL;
+every measurement is rolled back.
+"""
+
+import sys
+
+from .common import setup_django, build_records, make_equipment_frame, measure
+
+
+def main(row_counts):
+    setup_django()
+
+    from django.db import connection
+    from equipment_api.ingestion import build_record_frame
+    from equipment_api.loaders import load_records
+    from equipment_api.models import EquipmentData, EquipmentUpload
+
+    upload = EquipmentUpload.objects.create(csv_file='csvs/benchmark.csv')
+    loader = {'postgresql': 'COPY', 'sqlite': 'executemany'}.get(connection.vendor, 'bulk_create')
+
+    print(f'database: {connection.vendor}, loader: {loader}')
+    print(f'{"rows":>10} {"bulk_create rows/s":>20} {"loader rows/s":>15} {"speedup":>9}')
+    for rows in row_counts:
+        chunk = make_equipment_frame(rows)
+        baseline = measure(
+            lambda: EquipmentData.objects.bulk_create(build_records(upload, chunk), batch_size=5000)
+        )
+        loaded = measure(lambda: load_records(build_record_frame(upload, chunk)))
+        print(f'{rows:>10} {rows / baseline:>20,.0f} {rows / loaded:>15,.0f} {baseline / loaded:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 500000])
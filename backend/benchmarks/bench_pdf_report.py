@@ -0,0 +1,65 @@
+"""
+Benchmark full-dataset PDF report rendering
+Data is loaded and the report rendered in separate subprocesses so peak RSS reflects rendering only
+
+Usage: python -m benchmarks.bench_pdf_report [rows ...]
+"""
+
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+
+from .common import setup_django, build_records, make_equipment_frame, timed
+
+
+def load(database_name, rows):
+    """Create a synthetic upload of the given size in the benchmark database."""
+    setup_django(database_name)
+
+    from equipment_api.models import EquipmentUpload, EquipmentData
+
+    upload = EquipmentUpload.objects.create(csv_file='csvs/benchmark.csv', total_equipment_count=rows)
+    EquipmentData.objects.bulk_create(build_records(upload, make_equipment_frame(rows)), batch_size=5000)
+
+
+def render(database_name, rows):
+    """Render the full report for the upload created by load()."""
+    setup_django(database_name)
+
+    from equipment_api.models import EquipmentUpload
+    from equipment_api.utils import generate_pdf_report
+
+    upload = EquipmentUpload.objects.get()
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pdf_path, elapsed = timed(generate_pdf_report, upload, full=True)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with open(pdf_path, 'rb') as f:
+        pages = len(re.findall(rb'/Type /Page\b(?!s)', f.read()))
+
+    # ru_maxrss is reported in kilobytes on Linux
+    print(f'{rows:>10} {pages:>8} {elapsed:>9.2f} {pages / elapsed:>10.1f} '
+          f'{peak_rss / 1024:>14.1f} {(peak_rss - baseline_rss) / 1024:>14.1f}')
+
+
+def main(row_counts):
+    print(f'{"rows":>10} {"pages":>8} {"seconds":>9} {"pages/s":>10} {"peak RSS MB":>14} {"report RSS MB":>14}')
+    for rows in row_counts:
+        database_name = os.path.join(tempfile.mkdtemp(prefix='equipment-bench-'), 'bench.sqlite3')
+        for step in ('--load', '--render'):
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_pdf_report', step, database_name, str(rows)],
+                check=True
+            )
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--load']:
+        load(sys.argv[2], int(sys.argv[3]))
+    elif sys.argv[1:2] == ['--render']:
+        render(sys.argv[2], int(sys.argv[3]))
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
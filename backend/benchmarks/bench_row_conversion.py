@@ -0,0 +1,59 @@
+"""
+Benchmark row-to-model conversion used by CSV ingestion
+Compares the old per-row iterrows() loop with build_record_frame, the conversion
+ingestion uses, alone and together with load_records (rolled back)
+
+Usage: python -m benchmarks.bench_row_conversion [rows ...]
+"""
+
+import sys
+
+from .common import setup_django, make_equipment_frame, measure, timed
+
+
+def convert_iterrows(upload, chunk):
+    """Baseline: the per-row conversion upload_csv used before vectorization."""
+    from equipment_api.ingestion import resolve_type_ids
+    from equipment_api.models import EquipmentData
+
+    type_ids = resolve_type_ids(chunk['Type'].unique().tolist())
+    records = []
+    for _, row in chunk.iterrows():
+        records.append(
+            EquipmentData(
+                upload=upload,
+                equipment_name=str(row['Equipment Name']),
+                equipment_type_id=type_ids[str(row['Type'])],
+                flowrate=float(row['Flowrate']),
+                pressure=float(row['Pressure']),
+                temperature=float(row['Temperature'])
+            )
+        )
+    return records
+
+
+def main(row_counts):
+    setup_django()
+
+    from equipment_api.ingestion import build_record_frame
+    from equipment_api.loaders import load_records
+    from equipment_api.models import EquipmentUpload
+
+    upload = EquipmentUpload.objects.create(csv_file='csvs/benchmark.csv')
+    # Type ids are resolved once up front so no timed run pays for creating them
+    build_record_frame(upload, make_equipment_frame(100))
+
+    print(f'{"rows":>10} {"iterrows rows/s":>18} {"frame rows/s":>15} {"frame+load rows/s":>19} {"speedup":>9}')
+    for rows in row_counts:
+        chunk = make_equipment_frame(rows)
+        _, baseline = timed(convert_iterrows, upload, chunk)
+        _, vectorized = timed(build_record_frame, upload, chunk)
+        loaded = measure(lambda: load_records(build_record_frame(upload, chunk)))
+        print(
+            f'{rows:>10} {rows / baseline:>18,.0f} {rows / vectorized:>15,.0f} '
+            f'{rows / loaded:>19,.0f} {baseline / vectorized:>8.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 50000, 200000])
@@ -0,0 +1,113 @@
+"""
+Benchmark API reads while an upload is being written to SQLite
+Compares the default SQLite settings with the SQLITE_PRODUCTION profile (WAL, pragmas, persistent connections)
+
+Usage: python -m benchmarks.bench_sqlite_concurrency [rows] [reader threads]
+Each profile runs in its own subprocess, because settings are read at startup.
+Requests go through Django's WSGI handler, so connections are opened and closed as in a server.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from wsgiref.util import setup_testing_defaults
+
+import numpy as np
+
+from .common import setup_django, write_equipment_csv
+
+# (path, query string) pairs requested round-robin by every reader
+READ_REQUESTS = [('/api/history/', ''), ('/api/upload/1/records/', 'page_size=100')]
+
+
+def read_loop(handler, stop, latencies, errors):
+    """Issue GET requests round-robin until stop is set."""
+    statuses = []
+    count = 0
+    while not stop.is_set():
+        path, query = READ_REQUESTS[count % len(READ_REQUESTS)]
+        environ = {'PATH_INFO': path, 'QUERY_STRING': query}
+        setup_testing_defaults(environ)
+
+        start = time.perf_counter()
+        body = b''.join(handler(environ, lambda status, headers: statuses.append(status)))
+        latencies.append(time.perf_counter() - start)
+        if not statuses[-1].startswith('200'):
+            errors.append(body[:200])
+        count += 1
+
+
+def run_profile(rows, readers):
+    """Measure one profile in this process and print a result line."""
+    work_dir = setup_django()
+
+    from django.conf import settings
+    from django.core.files import File
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+    from equipment_api.ingestion import create_upload
+
+    settings.ALLOWED_HOSTS = ['*']
+    settings.DEBUG = False
+
+    # A small upload for the readers, then a large one written while they run
+    with open(write_equipment_csv(os.path.join(work_dir, 'seed.csv'), 1000), 'rb') as seed:
+        create_upload(File(seed, name='seed.csv'))
+    big_csv = write_equipment_csv(os.path.join(work_dir, 'big.csv'), rows, seed=1)
+
+    handler = WSGIHandler()
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=read_loop, args=(handler, stop, latencies, errors))
+        for _ in range(readers)
+    ]
+
+    def write():
+        try:
+            with open(big_csv, 'rb') as csv_file:
+                create_upload(File(csv_file, name='big.csv'))
+        finally:
+            connections.close_all()
+
+    writer = threading.Thread(target=write)
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    writer.start()
+    writer.join()
+    write_seconds = time.perf_counter() - start
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    profile = 'production' if settings.SQLITE_PRODUCTION else 'default'
+    p95 = np.percentile(latencies, 95) * 1000 if latencies else float('nan')
+    print(
+        f'{profile:>11} {write_seconds:>9.2f} {len(latencies) / write_seconds:>9.1f} '
+        f'{p95:>9.1f} {max(latencies, default=0) * 1000:>9.1f} {len(errors):>7}'
+    )
+
+
+def main(rows, readers):
+    paths = ', '.join(path for path, _ in READ_REQUESTS)
+    print(f'{rows} rows written while {readers} reader threads request {paths}')
+    print(f'{"profile":>11} {"write s":>9} {"reads/s":>9} {"p95 ms":>9} {"max ms":>9} {"errors":>7}')
+    sys.stdout.flush()
+    for production in ('', 'true'):
+        env = dict(os.environ, SQLITE_PRODUCTION=production)
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_sqlite_concurrency', '--run', str(rows), str(readers)],
+            env=env,
+            check=True
+        )
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--run']:
+        run_profile(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        args = [int(arg) for arg in sys.argv[1:]]
+        main(args[0] if args else 300000, args[1] if len(args) > 1 else 4)
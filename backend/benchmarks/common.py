@@ -0,0 +1,127 @@
+"""
+Shared helpers for backend benchmarks
+Configures Django against a throwaway SQLite database and builds synthetic equipment data
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+EQUIPMENT_TYPES = [
+    'Centrifugal Pump', 'CSTR', 'Shell and Tube', 'Distillation Column',
+    'PFR', 'Reciprocating Compressor', 'Plate Heat Exchanger', 'Batch Reactor',
+]
+
+
+def setup_django(database_name=None):
+    """
+    Configure Django with a temporary database and media root, then migrate.
+    A configured PostgreSQL database (POSTGRES_DB) is used as is.
+    Returns the temporary directory used for the database and media files.
+    """
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+    import django
+    from django.conf import settings
+
+    work_dir = tempfile.mkdtemp(prefix='equipment-bench-')
+    if settings.DATABASES['default']['ENGINE'].endswith('sqlite3'):
+        settings.DATABASES['default']['NAME'] = database_name or os.path.join(work_dir, 'bench.sqlite3')
+    settings.MEDIA_ROOT = os.path.join(work_dir, 'media')
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    return work_dir
+
+
+def make_equipment_frame(rows, seed=0):
+    """Build a cleaned equipment DataFrame with the given number of rows."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Equipment Name': [f'EQ-{i:07d}' for i in range(rows)],
+        'Type': rng.choice(EQUIPMENT_TYPES, size=rows),
+        'Flowrate': rng.uniform(50, 300, size=rows).round(2),
+        'Pressure': rng.uniform(1, 20, size=rows).round(2),
+        'Temperature': rng.uniform(20, 250, size=rows).round(2),
+    })
+
+
+def write_equipment_csv(path, rows, seed=0):
+    """Write a synthetic equipment CSV with the given number of rows."""
+    make_equipment_frame(rows, seed).to_csv(path, index=False)
+    return path
+
+
+def timed(func, *args, **kwargs):
+    """Call func and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class Rollback(Exception):
+    """Raised to discard the rows written by one measurement."""
+
+
+def measure(load):
+    """Time load() inside a transaction that is rolled back afterwards."""
+    from django.db import transaction
+
+    elapsed = None
+    try:
+        with transaction.atomic():
+            _, elapsed = timed(load)
+            raise Rollback
+    except Rollback:
+        pass
+    return elapsed
+
+
+def iter_record_tuples(chunk):
+    """
+    Yield (name, type, flowrate, pressure, temperature) tuples for a cleaned chunk.
+    Columns are converted to Python objects once per chunk with to_numpy().tolist()
+    instead of building a pandas Series for every row.
+    """
+    return zip(
+        chunk['Equipment Name'].to_numpy().tolist(),
+        chunk['Type'].to_numpy().tolist(),
+        chunk['Flowrate'].to_numpy().tolist(),
+        chunk['Pressure'].to_numpy().tolist(),
+        chunk['Temperature'].to_numpy().tolist(),
+    )
+
+
+def build_records(upload, chunk, removed=False):
+    """
+    Create unsaved EquipmentData instances for a cleaned chunk, for bulk_create baselines.
+    Call after setup_django().
+    """
+    from equipment_api.ingestion import resolve_type_ids
+    from equipment_api.models import EquipmentData
+
+    type_ids = resolve_type_ids(chunk['Type'].unique().tolist())
+    type_id_column = chunk['Type'].map(type_ids).to_numpy().tolist()
+    return [
+        EquipmentData(
+            upload_id=upload.id,
+            equipment_name=name,
+            equipment_type_id=type_id,
+            flowrate=flowrate,
+            pressure=pressure,
+            temperature=temperature,
+            removed=removed
+        )
+        for type_id, (name, _, flowrate, pressure, temperature)
+        in zip(type_id_column, iter_record_tuples(chunk))
+    ]
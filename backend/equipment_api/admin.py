@@ -4,7 +4,15 @@ Registers models for Django admin interface with custom display options
 """
 
 from django.contrib import admin
-from .models import EquipmentUpload, EquipmentData
+from .models import (
+    ChunkedUpload,
+    DailyTypeRollup,
+    EquipmentUpload,
+    EquipmentData,
+    EquipmentStatistics,
+    EquipmentType,
+    IngestionJob,
+)
 
 
 @admin.register(EquipmentUpload)
@@ -16,14 +24,18 @@ class EquipmentUploadAdmin(admin.ModelAdmin):
     list_display = [
         'id',
         'uploaded_at',
+        'status',
         'total_equipment_count',
         'average_pressure',
         'average_temperature'
     ]
-    list_filter = ['uploaded_at']
-    search_fields = ['id']
+    list_filter = ['uploaded_at', 'status']
+    search_fields = ['id', 'content_hash']
     readonly_fields = [
         'uploaded_at',
+        'status',
+        'content_hash',
+        'base_upload',
         'total_equipment_count',
         'average_pressure',
         'average_temperature',
@@ -32,7 +44,7 @@ class EquipmentUploadAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('File Information', {
-            'fields': ('csv_file', 'uploaded_at')
+            'fields': ('csv_file', 'content_hash', 'base_upload', 'uploaded_at', 'status')
         }),
         ('Statistics', {
             'fields': (
@@ -45,6 +57,15 @@ class EquipmentUploadAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(EquipmentType)
+class EquipmentTypeAdmin(admin.ModelAdmin):
+    """
+    Admin interface for EquipmentType lookup table.
+    """
+    list_display = ['id', 'name']
+    search_fields = ['name']
+
+
 @admin.register(EquipmentData)
 class EquipmentDataAdmin(admin.ModelAdmin):
     """
@@ -57,16 +78,112 @@ class EquipmentDataAdmin(admin.ModelAdmin):
         'flowrate',
         'pressure',
         'temperature',
+        'removed',
         'upload'
     ]
-    list_filter = ['equipment_type', 'upload']
-    search_fields = ['equipment_name', 'equipment_type']
+    list_filter = ['equipment_type', 'removed', 'upload']
+    search_fields = ['equipment_name', 'equipment_type__name']
     
     fieldsets = (
         ('Equipment Information', {
-            'fields': ('upload', 'equipment_name', 'equipment_type')
+            'fields': ('upload', 'equipment_name', 'equipment_type', 'removed')
         }),
         ('Parameters', {
             'fields': ('flowrate', 'pressure', 'temperature')
         }),
     )
+
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    """
+    Admin interface for IngestionJob model.
+    Shows background ingestion progress and failures.
+    """
+    list_display = [
+        'id',
+        'upload',
+        'phase',
+        'rows_processed',
+        'created_at',
+        'finished_at'
+    ]
+    list_filter = ['phase', 'created_at']
+    readonly_fields = [
+        'upload',
+        'phase',
+        'rows_processed',
+        'chunks_processed',
+        'error',
+        'created_at',
+        'started_at',
+        'finished_at'
+    ]
+
+
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    """
+    Admin interface for ChunkedUpload model.
+    Shows resumable uploads in progress and the uploads they produced.
+    """
+    list_display = [
+        'id',
+        'filename',
+        'total_size',
+        'status',
+        'upload',
+        'created_at',
+        'updated_at'
+    ]
+    list_filter = ['status', 'created_at']
+    readonly_fields = [
+        'filename',
+        'total_size',
+        'chunk_size',
+        'content_hash',
+        'status',
+        'upload',
+        'created_at',
+        'updated_at'
+    ]
+
+
+@admin.register(EquipmentStatistics)
+class EquipmentStatisticsAdmin(admin.ModelAdmin):
+    """
+    Admin interface for EquipmentStatistics model.
+    Read-only view of the statistics computed at ingestion.
+    """
+    list_display = [
+        'upload',
+        'row_count',
+        'sample_size',
+        'percentiles_exact',
+        'computed_at'
+    ]
+    readonly_fields = [
+        'upload',
+        'row_count',
+        'sample_size',
+        'percentiles_exact',
+        'column_summary',
+        'type_summary',
+        'computed_at'
+    ]
+
+
+@admin.register(DailyTypeRollup)
+class DailyTypeRollupAdmin(admin.ModelAdmin):
+    """
+    Admin interface for DailyTypeRollup model.
+    Shows the per day × type totals behind the analytics endpoint.
+    """
+    list_display = [
+        'date',
+        'equipment_type',
+        'upload_count',
+        'record_count'
+    ]
+    list_filter = ['equipment_type']
+    date_hierarchy = 'date'
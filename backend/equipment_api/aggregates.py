@@ -0,0 +1,232 @@
+"""
+Vectorized statistics aggregation for Chemical Equipment Parameter Visualizer
+Folds per-type moments chunk by chunk and keeps a bounded sample for percentiles
+"""
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .models import DailyTypeRollup, EquipmentStatistics
+from .snapshots import iter_snapshot_frames
+import numpy as np
+import pandas as pd
+
+
+# CSV parameter columns and the names used in statistics payloads
+SUMMARY_COLUMNS = {
+    'Flowrate': 'flowrate',
+    'Pressure': 'pressure',
+    'Temperature': 'temperature',
+}
+PERCENTILES = [50, 95, 99]
+
+# Rows kept for percentile estimation; uploads up to this size get exact percentiles
+DEFAULT_SAMPLE_SIZE = 200000
+
+
+def _clean_float(value):
+    """Convert NumPy scalars to JSON-friendly floats, mapping NaN to None."""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+class SummaryAccumulator:
+    """
+    Accumulates count, mean, std, min, max and percentiles per column and per type.
+    Moments are merged per chunk with the parallel variance formula; percentiles come
+    from a uniform bottom-k sample of at most sample_size rows, so memory stays bounded.
+    """
+
+    def __init__(self, sample_size=None, seed=None):
+        self.sample_size = sample_size or getattr(settings, 'STATISTICS_SAMPLE_SIZE', DEFAULT_SAMPLE_SIZE)
+        self._rng = np.random.default_rng(seed)
+        self.total_count = 0
+
+        # Per-type moments, indexed by equipment type
+        self._count = None
+        self._mean = None
+        self._m2 = None
+        self._min = None
+        self._max = None
+
+        # Bottom-k sample: random keys, types and parameter values
+        self._sample_keys = np.empty(0)
+        self._sample_types = np.empty(0, dtype=object)
+        self._sample_values = np.empty((0, len(SUMMARY_COLUMNS)))
+
+    def update(self, chunk):
+        """Fold a cleaned DataFrame chunk (CSV column names) into the summaries."""
+        if chunk.empty:
+            return
+        self.total_count += len(chunk)
+        self._update_moments(chunk)
+        self._update_sample(chunk)
+
+    def _update_moments(self, chunk):
+        grouped = chunk.groupby('Type', sort=False)[list(SUMMARY_COLUMNS)]
+        count = grouped.size()
+        mean = grouped.mean()
+        m2 = grouped.var(ddof=0).mul(count, axis=0)
+        minimum = grouped.min()
+        maximum = grouped.max()
+
+        if self._count is None:
+            self._count, self._mean, self._m2 = count, mean, m2
+            self._min, self._max = minimum, maximum
+            return
+
+        index = self._count.index.union(count.index, sort=False)
+        count_a = self._count.reindex(index, fill_value=0)
+        count_b = count.reindex(index, fill_value=0)
+        total = count_a + count_b
+
+        mean_a = self._mean.reindex(index, fill_value=0.0)
+        delta = mean.reindex(index, fill_value=0.0) - mean_a
+
+        self._mean = mean_a + delta.mul(count_b / total, axis=0)
+        self._m2 = (
+            self._m2.reindex(index, fill_value=0.0)
+            + m2.reindex(index, fill_value=0.0)
+            + (delta ** 2).mul(count_a * count_b / total, axis=0)
+        )
+        self._min = np.fmin(self._min.reindex(index), minimum.reindex(index))
+        self._max = np.fmax(self._max.reindex(index), maximum.reindex(index))
+        self._count = total
+
+    def _update_sample(self, chunk):
+        keys = np.concatenate([self._sample_keys, self._rng.random(len(chunk))])
+        types = np.concatenate([self._sample_types, chunk['Type'].to_numpy(dtype=object)])
+        values = np.concatenate([self._sample_values, chunk[list(SUMMARY_COLUMNS)].to_numpy(dtype=float)])
+
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, types, values = keys[keep], types[keep], values[keep]
+
+        self._sample_keys, self._sample_types, self._sample_values = keys, types, values
+
+    @property
+    def percentiles_exact(self):
+        return self.total_count <= self.sample_size
+
+    @staticmethod
+    def _describe(count, mean, m2, minimum, maximum, quantiles):
+        """Build the summary dict for one column."""
+        summary = {
+            'count': int(count),
+            'mean': _clean_float(mean),
+            'std': _clean_float(np.sqrt(m2 / (count - 1))) if count > 1 else None,
+            'min': _clean_float(minimum),
+            'max': _clean_float(maximum),
+        }
+        for percentile, value in zip(PERCENTILES, quantiles):
+            summary[f'p{percentile}'] = _clean_float(value)
+        return summary
+
+    def column_summary(self):
+        """Summaries over all rows, keyed by column name."""
+        if self._count is None:
+            return {}
+
+        # Combine per-type moments into overall moments
+        count = self._count.sum()
+        weights = self._count / count
+        mean = self._mean.mul(weights, axis=0).sum()
+        m2 = self._m2.sum() + ((self._mean - mean) ** 2).mul(self._count, axis=0).sum()
+        quantiles = np.percentile(self._sample_values, PERCENTILES, axis=0)
+
+        return {
+            name: self._describe(
+                count, mean[column], m2[column],
+                self._min[column].min(), self._max[column].max(),
+                quantiles[:, position]
+            )
+            for position, (column, name) in enumerate(SUMMARY_COLUMNS.items())
+        }
+
+    def type_summary(self):
+        """Summaries per equipment type, most common type first."""
+        if self._count is None:
+            return {}
+
+        sample = pd.DataFrame(self._sample_values, columns=list(SUMMARY_COLUMNS))
+        sample['Type'] = self._sample_types
+        quantiles = sample.groupby('Type')[list(SUMMARY_COLUMNS)].quantile([p / 100 for p in PERCENTILES])
+
+        summaries = {}
+        for equipment_type in self._count.sort_values(ascending=False, kind='stable').index:
+            count = self._count[equipment_type]
+            type_quantiles = (
+                quantiles.loc[equipment_type] if equipment_type in quantiles.index.get_level_values(0)
+                else pd.DataFrame(np.nan, index=PERCENTILES, columns=list(SUMMARY_COLUMNS))
+            )
+            summaries[equipment_type] = {'count': int(count)}
+            for column, name in SUMMARY_COLUMNS.items():
+                summaries[equipment_type][name] = self._describe(
+                    count,
+                    self._mean.at[equipment_type, column],
+                    self._m2.at[equipment_type, column],
+                    self._min.at[equipment_type, column],
+                    self._max.at[equipment_type, column],
+                    type_quantiles[column].to_numpy()
+                )
+        return summaries
+
+    def type_totals(self):
+        """Per-type record counts and column sums, used for rollups."""
+        if self._count is None:
+            return {}
+        sums = self._mean.mul(self._count, axis=0)
+        return {
+            equipment_type: {
+                'record_count': int(self._count[equipment_type]),
+                **{f'{name}_sum': float(sums.at[equipment_type, column]) for column, name in SUMMARY_COLUMNS.items()}
+            }
+            for equipment_type in self._count.index
+        }
+
+    def to_model_fields(self):
+        """Field values for an EquipmentStatistics row."""
+        return {
+            'row_count': self.total_count,
+            'sample_size': int(len(self._sample_keys)),
+            'percentiles_exact': self.percentiles_exact,
+            'column_summary': self.column_summary(),
+            'type_summary': self.type_summary(),
+        }
+
+
+def compute_upload_statistics(upload, chunk_size=50000):
+    """
+    Compute and store statistics for an upload from its Parquet snapshot.
+    Used for uploads ingested before statistics were precomputed.
+
+    Returns:
+        EquipmentStatistics: the stored statistics row
+    """
+    accumulator = SummaryAccumulator()
+    columns = {'equipment_type': 'Type', **{name: column for column, name in SUMMARY_COLUMNS.items()}}
+
+    for frame in iter_snapshot_frames(upload, columns=list(columns), batch_size=chunk_size):
+        frame = frame.rename(columns=columns)
+        frame['Type'] = frame['Type'].astype(object)
+        accumulator.update(frame)
+
+    statistics, _ = EquipmentStatistics.objects.update_or_create(
+        upload=upload,
+        defaults=accumulator.to_model_fields()
+    )
+    return statistics
+
+
+def update_daily_rollups(upload, accumulator):
+    """
+    Add an ingested upload's per-type totals to the day × type rollups.
+    Counters are incremented with F() expressions so concurrent ingestions do not lose updates.
+    """
+    date = timezone.localdate(upload.uploaded_at)
+    for equipment_type, totals in accumulator.type_totals().items():
+        DailyTypeRollup.objects.get_or_create(date=date, equipment_type=equipment_type)
+        DailyTypeRollup.objects.filter(date=date, equipment_type=equipment_type).update(
+            upload_count=F('upload_count') + 1,
+            **{field: F(field) + value for field, value in totals.items()}
+        )
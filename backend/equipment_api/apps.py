@@ -9,3 +9,7 @@ class EquipmentApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'equipment_api'
     verbose_name = 'Chemical Equipment API'
+    
+    def ready(self):
+        # Connect signal receivers
+        from . import signals  # noqa: F401
@@ -0,0 +1,298 @@
+"""
+Batch CSV uploads for Chemical Equipment Parameter Visualizer
+Parses many CSV files (or the members of a ZIP archive) on a process pool and ingests each one separately
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import io
+import os
+import tempfile
+import threading
+import traceback
+import zipfile
+import django
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from .ingestion import create_upload, describe_error, find_duplicate_upload, hash_file, iter_csv_chunks
+from .serializers import CSVUploadSerializer
+
+
+DEFAULT_MAX_FILES = 100
+DEFAULT_MAX_EXTRACTED_SIZE = 2 * 1024 * 1024 * 1024
+# Bytes copied per read when extracting ZIP members
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class BatchError(ValueError):
+    """Raised when a batch upload request cannot be processed at all."""
+
+
+def parser_worker_count():
+    """Parser processes to run: CSV_BATCH_WORKERS, or one per CPU when unset."""
+    return getattr(settings, 'CSV_BATCH_WORKERS', None) or os.cpu_count()
+
+
+def get_process_pool():
+    """
+    Return the process-wide CSV parsing pool, creating it on first use.
+    Workers only parse; every database write happens in the request process.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=parser_worker_count(),
+                # Spawned workers need the app registry to import the ingestion module
+                initializer=django.setup
+            )
+    return _pool
+
+
+def _discard_pool(pool):
+    """Forget a pool whose worker died so the next batch starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_csv_source(source, chunk_size=None):
+    """
+    Parse one CSV into cleaned chunks and spool them to a temporary Parquet file,
+    one row group per chunk. Runs inside a pool worker; only the file path travels
+    back to the request process, which then reads one chunk at a time.
+
+    Args:
+        source: path of a CSV on disk, or its content as bytes
+
+    Returns:
+        str: path of the spooled chunks, or None when the CSV has no rows
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    fd, path = tempfile.mkstemp(suffix='.parquet', prefix='csv-batch-')
+    os.close(fd)
+    writer = None
+    try:
+        for chunk in iter_csv_chunks(source, chunk_size):
+            if chunk.empty:
+                continue
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        os.remove(path)
+        raise
+    if writer is None:
+        os.remove(path)
+        return None
+    writer.close()
+    return path
+
+
+def iter_spooled_chunks(path):
+    """Yield the cleaned chunks written by parse_csv_source, one row group at a time."""
+    if path is None:
+        return
+    parquet_file = pq.ParquetFile(path)
+    for group in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(group).to_pandas()
+
+
+def _is_zip(uploaded_file):
+    return uploaded_file.name.lower().endswith('.zip')
+
+
+def _extract_member(archive, member, limit):
+    """
+    Stream a ZIP member into a temporary file, reading at most limit + 1 bytes,
+    so the declared size in the archive does not have to be trusted.
+
+    Returns:
+        tuple: (TemporaryUploadedFile, bytes extracted)
+    """
+    name = os.path.basename(member.filename)
+    extracted = TemporaryUploadedFile(name, 'text/csv', 0, None)
+    size = 0
+    with archive.open(member) as source:
+        while limit is None or size <= limit:
+            data = source.read(EXTRACT_BUFFER_SIZE)
+            if not data:
+                break
+            extracted.write(data)
+            size += len(data)
+    extracted.flush()
+    extracted.size = size
+    extracted.seek(0)
+    return extracted, size
+
+
+def expand_files(uploaded_files):
+    """
+    Turn uploaded files into (name, file, error) entries, extracting the members of ZIP archives.
+    Members are streamed to temporary files; error is set for members larger than
+    CSV_UPLOAD_MAX_SIZE, and the batch is rejected once everything extracted exceeds
+    CSV_BATCH_MAX_EXTRACTED_SIZE. Directories and macOS resource forks are skipped.
+    The caller closes the returned files, which removes the temporary ones.
+    """
+    max_files = getattr(settings, 'CSV_BATCH_MAX_FILES', DEFAULT_MAX_FILES)
+    max_size = getattr(settings, 'CSV_UPLOAD_MAX_SIZE', None)
+    max_extracted = getattr(settings, 'CSV_BATCH_MAX_EXTRACTED_SIZE', DEFAULT_MAX_EXTRACTED_SIZE)
+    files = []
+    extracted_total = 0
+
+    for uploaded_file in uploaded_files:
+        if not _is_zip(uploaded_file):
+            files.append((uploaded_file.name, uploaded_file, None))
+            continue
+
+        try:
+            archive = zipfile.ZipFile(uploaded_file)
+        except zipfile.BadZipFile:
+            raise BatchError(f'{uploaded_file.name} is not a valid ZIP archive')
+
+        with archive:
+            for member in archive.infolist():
+                name = os.path.basename(member.filename)
+                if member.is_dir() or not name or member.filename.startswith('__MACOSX/'):
+                    continue
+                if len(files) >= max_files:
+                    _close_files(files)
+                    raise BatchError(f'A batch may contain at most {max_files} files')
+                if max_size and member.file_size > max_size:
+                    # Keep the entry so it is reported as failed, without extracting it
+                    files.append((name, ContentFile(b'', name=name), 'File exceeds the upload size limit'))
+                    continue
+
+                limit = max_size or None
+                if max_extracted:
+                    remaining = max_extracted - extracted_total
+                    limit = remaining if limit is None else min(limit, remaining)
+                try:
+                    extracted, size = _extract_member(archive, member, limit)
+                except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError, OSError) as e:
+                    files.append((name, ContentFile(b'', name=name), f'Could not extract file: {e}'))
+                    continue
+                extracted_total += size
+                if max_extracted and extracted_total > max_extracted:
+                    extracted.close()
+                    _close_files(files)
+                    raise BatchError(
+                        f'ZIP archives may expand to at most {max_extracted // (1024 * 1024)}MB in one batch'
+                    )
+                if max_size and size > max_size:
+                    # The member is larger than its header claimed
+                    extracted.close()
+                    files.append((name, ContentFile(b'', name=name), 'File exceeds the upload size limit'))
+                    continue
+                files.append((name, extracted, None))
+
+    if len(files) > max_files:
+        _close_files(files)
+        raise BatchError(f'A batch may contain at most {max_files} files')
+    return files
+
+
+def _close_files(files):
+    for _, csv_file, _ in files:
+        csv_file.close()
+
+
+def _source_for(csv_file):
+    """Hand workers a path when the file is on disk, otherwise its bytes."""
+    if hasattr(csv_file, 'temporary_file_path'):
+        return csv_file.temporary_file_path()
+    csv_file.seek(0)
+    return csv_file.read()
+
+
+def process_batch(uploaded_files, force=False):
+    """
+    Validate, deduplicate, parse and ingest a batch of CSV files.
+    Files are parsed concurrently on the process pool and each parsed file is
+    ingested in its own transaction as soon as it is ready, so one bad file
+    never affects the others.
+
+    Returns:
+        list: one result dict per file, in submission order
+    """
+    files = expand_files(uploaded_files)
+    try:
+        return _process_files(files, force)
+    finally:
+        _close_files(files)
+
+
+def _process_files(files, force):
+    results = [{'filename': name} for name, _, _ in files]
+    pending = {}
+    batch_hashes = {}
+
+    for index, (name, csv_file, error) in enumerate(files):
+        serializer = CSVUploadSerializer(data={'csv_file': csv_file})
+        if error is None and not serializer.is_valid():
+            error = ' '.join(str(message) for message in serializer.errors['csv_file'])
+        if error is not None:
+            results[index].update({'status': 'failed', 'error': error})
+            continue
+
+        content_hash = hash_file(csv_file)
+        if not force:
+            duplicate = find_duplicate_upload(content_hash)
+            if duplicate is not None:
+                results[index].update({'status': 'duplicate', 'upload_id': duplicate.id})
+                continue
+            if content_hash in batch_hashes:
+                results[index].update({'status': 'duplicate', 'duplicate_of': files[batch_hashes[content_hash]][0]})
+                continue
+        batch_hashes[content_hash] = index
+        pending[index] = (csv_file, content_hash)
+
+    pool = get_process_pool()
+    futures = {
+        pool.submit(parse_csv_source, _source_for(csv_file)): index
+        for index, (csv_file, _) in pending.items()
+    }
+
+    for future in as_completed(futures):
+        index = futures[future]
+        csv_file, content_hash = pending[index]
+        spool_path = None
+        try:
+            spool_path = future.result()
+            upload, stats = create_upload(
+                csv_file, content_hash=content_hash, chunks=iter_spooled_chunks(spool_path)
+            )
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            results[index].update({'status': 'failed', 'error': 'A parser process exited unexpectedly'})
+            continue
+        except Exception as e:
+            if not isinstance(e, ValueError):
+                print(f"Error processing batch file {files[index][0]}: {traceback.format_exc()}")
+            results[index].update({'status': 'failed', 'error': describe_error(e)})
+            continue
+        finally:
+            if spool_path is not None:
+                os.remove(spool_path)
+
+        results[index].update({
+            'status': 'created',
+            'upload_id': upload.id,
+            'total_equipment': stats.total_count,
+            'average_pressure': round(stats.average_pressure, 2),
+            'average_temperature': round(stats.average_temperature, 2),
+        })
+
+    return results
@@ -0,0 +1,125 @@
+"""
+Response caching for Chemical Equipment Parameter Visualizer
+Keeps rendered history, detail and statistics responses in Django's cache and answers conditional GETs with 304
+"""
+
+from functools import wraps
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control, set_response_etag
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from .renderers import ArrowStreamRenderer, MessagePackRenderer
+
+
+CACHE_PREFIX = 'equipment_api:response'
+DEFAULT_TIMEOUT = 300
+DEFAULT_MAX_SIZE = 8 * 1024 * 1024
+
+# Scope shared by every response that lists uploads
+HISTORY_SCOPE = 'uploads'
+# Renderers whose output depends only on the request path and data. HTML from the
+# browsable API embeds the CSRF token and the requesting user, so it is never stored.
+CACHEABLE_RENDERERS = (JSONRenderer, ArrowStreamRenderer, MessagePackRenderer)
+
+
+def _scope_key(scope):
+    return f'{CACHE_PREFIX}:version:{scope}'
+
+
+def _scope_version(scope):
+    """
+    Current version token of a scope. Cache keys embed it, so replacing the
+    token invalidates every response of the scope without enumerating keys.
+    """
+    key = _scope_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_upload(upload_id=None):
+    """
+    Drop cached responses affected by a change to an upload: the upload history
+    and, when upload_id is given, that upload's detail and statistics.
+    """
+    scopes = [HISTORY_SCOPE]
+    if upload_id is not None:
+        scopes.append(f'upload:{upload_id}')
+    cache.set_many({_scope_key(scope): uuid.uuid4().hex for scope in scopes}, timeout=None)
+
+
+def _negotiate_renderer(view, request, kwargs):
+    """
+    Renderer the wrapped @api_view will pick for this request, found with the view's
+    own renderers and content negotiator, or None when nothing is acceptable.
+    """
+    api_view = view.cls(**view.initkwargs)
+    api_view.kwargs = kwargs
+    try:
+        return api_view.get_content_negotiator().select_renderer(
+            Request(request), api_view.get_renderers(), api_view.get_format_suffix(**kwargs)
+        )[0]
+    except NotAcceptable:
+        return None
+
+
+def _cache_key(request, view_name, scope, renderer):
+    """The full path covers query parameters; the negotiated renderer covers the representation."""
+    variant = f'{request.get_full_path()}|{renderer.media_type}'
+    digest = hashlib.md5(variant.encode()).hexdigest()
+    return f'{CACHE_PREFIX}:{view_name}:{_scope_version(scope)}:{digest}'
+
+
+def cache_response(per_upload=False, cacheable=None):
+    """
+    Cache the rendered responses of an @api_view GET view (apply it above @api_view).
+
+    Only JSON, Arrow and MessagePack representations are stored, keyed on the
+    negotiated renderer; other renderers such as the browsable API bypass the cache.
+    Successful responses get an ETag computed from their body and must be revalidated
+    by clients; a matching If-None-Match is answered with 304 and no body. Entries are
+    versioned per scope and dropped by invalidate_upload().
+
+    Args:
+        per_upload: scope entries to the view's upload_id instead of the upload history
+        cacheable: optional callable(response) deciding whether a 200 response may be stored
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+            renderer = _negotiate_renderer(view, request, kwargs)
+            if not isinstance(renderer, CACHEABLE_RENDERERS):
+                return view(request, *args, **kwargs)
+
+            scope = f"upload:{kwargs['upload_id']}" if per_upload else HISTORY_SCOPE
+            key = _cache_key(request, view.__name__, scope, renderer)
+            response = cache.get(key)
+
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                response.render()
+                set_response_etag(response)
+                # Clients may keep the body but must revalidate with the ETag
+                patch_cache_control(response, private=True, no_cache=True)
+
+                timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+                max_size = getattr(settings, 'RESPONSE_CACHE_MAX_SIZE', DEFAULT_MAX_SIZE)
+                storable = isinstance(getattr(response, 'accepted_renderer', None), CACHEABLE_RENDERERS)
+                if storable and timeout and len(response.content) <= max_size and (cacheable is None or cacheable(response)):
+                    cache.set(key, response, timeout)
+
+            return get_conditional_response(request, etag=response['ETag'], response=response)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,180 @@
+"""
+Chart data for Chemical Equipment Parameter Visualizer
+Histograms, a pressure x temperature density grid and downsampled scatter points computed with NumPy from snapshots
+"""
+
+from .snapshots import read_snapshot_columns
+import numpy as np
+
+
+# Snapshot columns with a histogram in the chart payload
+HISTOGRAM_COLUMNS = ['flowrate', 'pressure', 'temperature']
+# Scatter plot and density grid axes
+SCATTER_X = 'pressure'
+SCATTER_Y = 'temperature'
+
+DEFAULT_BINS = 30
+MAX_BINS = 500
+DEFAULT_GRID_SIZE = 50
+MAX_GRID_SIZE = 200
+DEFAULT_MAX_POINTS = 2000
+MAX_MAX_POINTS = 50000
+
+SAMPLING_METHODS = ('lttb', 'stratified')
+
+
+def histogram(values, bins):
+    """Counts and bin edges of the finite values of one column."""
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=bins)
+    return {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+
+def density_grid(x, y, size):
+    """
+    2D histogram of two columns on a size x size grid.
+    counts[i][j] is the number of rows in x bin i and y bin j.
+    """
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=size)
+    return {
+        'x': SCATTER_X,
+        'y': SCATTER_Y,
+        'x_edges': x_edges.tolist(),
+        'y_edges': y_edges.tolist(),
+        'counts': counts.astype(np.int64).tolist(),
+    }
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling of points sorted by x.
+
+    The first and last points are kept; every bucket in between contributes the
+    point forming the largest triangle with the previously selected point and the
+    average of the next bucket, which preserves peaks and outliers.
+
+    Returns:
+        ndarray: indices of the selected points, ascending
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1][:threshold], dtype=np.int64)
+
+    # threshold - 2 buckets between the first and last point
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    anchor = 0
+
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[anchor] - average_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (average_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        selected[bucket + 1] = anchor
+
+    return selected
+
+
+def stratified_indices(groups, max_points, seed=0):
+    """
+    Uniform random sample of max_points rows, allocated to each group in
+    proportion to its size. Every group keeps at least one row, even when
+    there are more groups than max_points.
+    The seed is fixed so repeated requests return the same points.
+
+    Args:
+        groups: integer group code per row
+
+    Returns:
+        ndarray: indices of the selected rows, ascending
+    """
+    n = len(groups)
+    if max_points >= n:
+        return np.arange(n)
+
+    sizes = np.bincount(groups)
+    present = sizes > 0
+    exact = max_points * sizes / n
+    quotas = np.floor(exact).astype(np.int64)
+    quotas[present] = np.maximum(quotas[present], 1)
+
+    # Hand out the remaining points by largest fractional part
+    remaining = max_points - quotas.sum()
+    if remaining > 0:
+        fractions = np.where(present & (quotas < sizes), exact - np.floor(exact), -1.0)
+        top = np.argsort(-fractions, kind='stable')[:remaining]
+        quotas[top[fractions[top] >= 0]] += 1
+
+    # Rank rows within their group by a random key and keep the first quota of each
+    keys = np.random.default_rng(seed).random(n)
+    order = np.lexsort((keys, groups))
+    sorted_groups = groups[order]
+    group_start = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    rank = np.arange(n) - group_start[sorted_groups]
+    return np.sort(order[rank < quotas[sorted_groups]])
+
+
+def scatter_points(x, y, types, max_points, method='lttb'):
+    """
+    Downsample scatter points to at most max_points.
+
+    lttb runs Largest-Triangle-Three-Buckets along the x axis; stratified samples
+    each equipment type in proportion to its share of the rows.
+    """
+    codes, categories = types
+    if method == 'stratified':
+        keep = stratified_indices(codes, max_points)
+    else:
+        order = np.argsort(x, kind='stable')
+        keep = order[lttb_indices(x[order], y[order], max_points)]
+
+    return {
+        'method': method,
+        'count': len(keep),
+        SCATTER_X: x[keep].tolist(),
+        SCATTER_Y: y[keep].tolist(),
+        'equipment_type': np.asarray(categories, dtype=object)[codes[keep]].tolist(),
+    }
+
+
+def build_chart_data(upload, bins=DEFAULT_BINS, grid_size=DEFAULT_GRID_SIZE,
+                     max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """
+    Compute the chart payload of an upload from its snapshot. The payload size
+    depends only on bins, grid_size and max_points, not on the number of records.
+
+    Returns:
+        dict: upload_id, total_count, histograms, density and scatter
+    """
+    table = read_snapshot_columns(upload, columns=['equipment_type'] + HISTOGRAM_COLUMNS)
+    columns = {name: table.column(name).to_numpy() for name in HISTOGRAM_COLUMNS}
+    equipment_types = table.column('equipment_type').to_pandas().astype('category')
+
+    # Scatter and density need both coordinates
+    x, y = columns[SCATTER_X], columns[SCATTER_Y]
+    finite = np.isfinite(x) & np.isfinite(y)
+    codes = equipment_types.cat.codes.to_numpy()[finite]
+
+    return {
+        'upload_id': upload.id,
+        'total_count': table.num_rows,
+        'histograms': {name: histogram(values, bins) for name, values in columns.items()},
+        'density': density_grid(x[finite], y[finite], grid_size),
+        'scatter': scatter_points(
+            x[finite], y[finite], (codes, list(equipment_types.cat.categories)), max_points, method
+        ),
+    }
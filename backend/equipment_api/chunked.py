@@ -0,0 +1,204 @@
+"""
+Resumable chunked uploads for Chemical Equipment Parameter Visualizer
+Stores numbered chunks of a CSV on disk and assembles them into one file once every chunk has arrived
+"""
+
+from datetime import timedelta
+import hashlib
+import os
+import shutil
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from .models import ChunkedUpload
+
+
+# Defaults used when the corresponding settings are not configured
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_EXPIRY_HOURS = 24
+# Bounds for a chunk size requested by the client
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+# Bytes copied per read while receiving and assembling chunks
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ChunkError(ValueError):
+    """
+    Raised when a chunk or upload session is rejected.
+    The message is safe to return to API clients.
+    """
+
+
+class AssembledFile(File):
+    """
+    Assembled CSV on local disk. Like Django's TemporaryUploadedFile it exposes
+    temporary_file_path(), so FileSystemStorage moves it into csvs/ instead of copying.
+    """
+
+    def __init__(self, path, name):
+        super().__init__(open(path, 'rb'), name=name)
+        self._path = path
+
+    def temporary_file_path(self):
+        return self._path
+
+
+def get_chunks_dir(session):
+    """Directory holding the received chunks of an upload session."""
+    return os.path.join(settings.MEDIA_ROOT, 'chunked_uploads', str(session.pk))
+
+
+def _chunk_path(session, index):
+    return os.path.join(get_chunks_dir(session), f'{index:06d}.chunk')
+
+
+def clamp_chunk_size(requested):
+    """Chunk size for a new session: the requested size within bounds, or the configured default."""
+    if not requested:
+        return getattr(settings, 'CSV_UPLOAD_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    return min(max(requested, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+
+def start_session(filename, total_size, chunk_size=None, content_hash=''):
+    """
+    Create an upload session and its chunk directory.
+    Expired sessions are purged first so abandoned chunks do not pile up.
+
+    Raises:
+        ChunkError: if the file name or size is not acceptable
+    """
+    if not filename.endswith('.csv'):
+        raise ChunkError('Only CSV files are accepted. Please upload a .csv file.')
+    if total_size < 0:
+        raise ChunkError('size must be a non-negative integer')
+    max_size = getattr(settings, 'CSV_UPLOAD_MAX_SIZE', None)
+    if max_size and total_size > max_size:
+        raise ChunkError(f'CSV file size must be less than {max_size // (1024 * 1024)}MB.')
+    if content_hash and len(content_hash) != 64:
+        raise ChunkError('sha256 must be a hex SHA-256 digest')
+
+    purge_expired_sessions()
+    session = ChunkedUpload.objects.create(
+        filename=os.path.basename(filename),
+        total_size=total_size,
+        chunk_size=clamp_chunk_size(chunk_size),
+        content_hash=content_hash.lower()
+    )
+    os.makedirs(get_chunks_dir(session), exist_ok=True)
+    return session
+
+
+def received_chunks(session):
+    """Sorted indices of the chunks stored for a session."""
+    try:
+        names = os.listdir(get_chunks_dir(session))
+    except FileNotFoundError:
+        return []
+    return sorted(int(name.split('.')[0]) for name in names if name.endswith('.chunk'))
+
+
+def missing_chunks(session):
+    """Sorted indices of the chunks still to be sent."""
+    received = set(received_chunks(session))
+    return [index for index in range(session.total_chunks) if index not in received]
+
+
+def write_chunk(session, index, stream, length):
+    """
+    Store chunk number index, read from stream in COPY_BUFFER_SIZE pieces.
+    The chunk is written to a temporary name and renamed once complete, so an
+    interrupted request never leaves a partial chunk behind. Sending a chunk
+    again replaces it, which makes retries safe.
+
+    Raises:
+        ChunkError: if the index is out of range or the body has the wrong length
+    """
+    if session.status != ChunkedUpload.STATUS_UPLOADING:
+        raise ChunkError('This upload has already been finalized')
+    if not 0 <= index < session.total_chunks:
+        raise ChunkError(f'Chunk index must be between 0 and {session.total_chunks - 1}')
+    expected = session.expected_chunk_size(index)
+    if length is not None and length != expected:
+        raise ChunkError(f'Chunk {index} must be {expected} bytes, got {length}')
+
+    path = _chunk_path(session, index)
+    partial_path = f'{path}.part'
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    try:
+        with open(partial_path, 'wb') as target:
+            while written < expected:
+                data = stream.read(min(COPY_BUFFER_SIZE, expected - written))
+                if not data:
+                    break
+                target.write(data)
+                written += len(data)
+        if written != expected:
+            raise ChunkError(f'Chunk {index} must be {expected} bytes, got {written}')
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    ChunkedUpload.objects.filter(pk=session.pk).update(updated_at=timezone.now())
+    return written
+
+
+def assemble(session):
+    """
+    Concatenate the chunks in order into one file next to them, hashing as it goes.
+    The chunks are kept until discard_chunks(), so a failed finalize can be retried.
+
+    Returns:
+        tuple: (AssembledFile named after the original file, SHA-256 hex digest)
+
+    Raises:
+        ChunkError: if chunks are missing or the digest differs from the announced one
+    """
+    missing = missing_chunks(session)
+    if missing:
+        raise ChunkError(f'{len(missing)} chunks are missing, first missing chunk is {missing[0]}')
+
+    path = os.path.join(get_chunks_dir(session), 'assembled.csv')
+    digest = hashlib.sha256()
+    with open(path, 'wb') as target:
+        for index in range(session.total_chunks):
+            with open(_chunk_path(session, index), 'rb') as chunk:
+                while True:
+                    data = chunk.read(COPY_BUFFER_SIZE)
+                    if not data:
+                        break
+                    digest.update(data)
+                    target.write(data)
+
+    content_hash = digest.hexdigest()
+    if session.content_hash and content_hash != session.content_hash:
+        discard_chunks(session)
+        raise ChunkError('The assembled file does not match the announced sha256; upload it again')
+    return AssembledFile(path, session.filename), content_hash
+
+
+def discard_chunks(session):
+    """Remove a session's chunk directory."""
+    shutil.rmtree(get_chunks_dir(session), ignore_errors=True)
+
+
+def purge_expired_sessions(now=None):
+    """
+    Delete unfinished sessions without a chunk for CSV_CHUNKED_UPLOAD_EXPIRY_HOURS,
+    along with their chunks.
+
+    Returns:
+        int: number of sessions removed
+    """
+    hours = getattr(settings, 'CSV_CHUNKED_UPLOAD_EXPIRY_HOURS', DEFAULT_EXPIRY_HOURS)
+    cutoff = (now or timezone.now()) - timedelta(hours=hours)
+    expired = list(ChunkedUpload.objects.filter(
+        status=ChunkedUpload.STATUS_UPLOADING,
+        updated_at__lt=cutoff
+    ))
+    for session in expired:
+        discard_chunks(session)
+    ChunkedUpload.objects.filter(pk__in=[session.pk for session in expired]).delete()
+    return len(expired)
@@ -0,0 +1,154 @@
+"""
+Delta ingestion for Chemical Equipment Parameter Visualizer
+Stores only equipment rows that were added, changed or removed since the previous upload
+"""
+
+from django.conf import settings
+from .models import EquipmentUpload
+from .snapshots import CSV_TO_SNAPSHOT, read_snapshot_columns
+import numpy as np
+
+
+# Upload columns compared to decide whether a piece of equipment changed
+COMPARED_COLUMNS = ['Type', 'Flowrate', 'Pressure', 'Temperature']
+
+DEFAULT_MAX_DEPTH = 8
+
+
+def select_delta_base(upload):
+    """
+    Return the upload a new delta should be stored against, or None.
+    That is the latest completed upload, unless its chain of deltas is already
+    CSV_DELTA_MAX_DEPTH long, in which case the new upload starts a fresh chain.
+    """
+    base = (
+        EquipmentUpload.objects
+        .filter(status=EquipmentUpload.STATUS_COMPLETED)
+        .exclude(pk=upload.pk)
+        .first()
+    )
+    if base is None:
+        return None
+    max_depth = getattr(settings, 'CSV_DELTA_MAX_DEPTH', DEFAULT_MAX_DEPTH)
+    if len(base.snapshot_chain()) > max_depth:
+        return None
+    return base
+
+
+def load_base_frame(base_upload):
+    """
+    Read the base upload's full snapshot into a DataFrame indexed by Equipment Name.
+
+    Raises:
+        ValueError: if equipment names repeat in the base, since rows can then not be
+            matched one to one (the same rule diff_chunk applies to the incoming file)
+    """
+    frame = read_snapshot_columns(base_upload).to_pandas()
+    frame = frame.rename(columns={column: name for name, column in CSV_TO_SNAPSHOT.items()})
+    frame['Type'] = frame['Type'].astype(object)
+
+    names = frame['Equipment Name']
+    if not names.is_unique:
+        raise ValueError(
+            f"Delta uploads need unique Equipment Name values; '{names[names.duplicated()].iloc[0]}' "
+            f"appears more than once in the latest upload {base_upload.id}. Upload without delta=true"
+        )
+
+    frame = frame.set_index('Equipment Name')
+    frame['_position'] = np.arange(len(frame))
+    return frame
+
+
+class DeltaBuilder:
+    """
+    Compares incoming cleaned chunks with the base snapshot, keyed by Equipment Name.
+    diff_chunk() keeps the new and changed rows of each chunk, and removed_rows()
+    returns the base rows that never appeared. Only those rows are stored.
+    """
+
+    def __init__(self, base_upload, base_frame):
+        self.base_upload = base_upload
+        self.base = base_frame
+        self._seen = np.zeros(len(base_frame), dtype=bool)
+        self._new_names = set()
+        self.added = 0
+        self.changed = 0
+        self.unchanged = 0
+
+    def _check_unique(self, names, matched_positions, new_names):
+        """Reject equipment names that occur more than once in the incoming file."""
+        repeated = (
+            names[names.duplicated()].tolist()
+            or self.base.index[matched_positions[self._seen[matched_positions]]].tolist()
+            or [name for name in new_names if name in self._new_names]
+        )
+        if repeated:
+            raise ValueError(
+                f"Delta uploads need unique Equipment Name values; '{repeated[0]}' appears more than once"
+            )
+
+    def diff_chunk(self, chunk):
+        """
+        Return the rows of a cleaned chunk that are new or differ from the base.
+
+        Args:
+            chunk: cleaned DataFrame with CSV column names
+        """
+        merged = chunk.merge(
+            self.base,
+            how='left',
+            left_on='Equipment Name',
+            right_index=True,
+            suffixes=('', '_base'),
+            indicator=True
+        )
+        is_new = (merged['_merge'] == 'left_only').to_numpy()
+        differs = np.zeros(len(merged), dtype=bool)
+        for column in COMPARED_COLUMNS:
+            differs |= (merged[column] != merged[f'{column}_base']).to_numpy()
+        is_changed = ~is_new & differs
+
+        matched_positions = merged['_position'].to_numpy()[~is_new].astype(np.int64)
+        new_names = chunk['Equipment Name'].to_numpy()[is_new].tolist()
+        self._check_unique(chunk['Equipment Name'], matched_positions, new_names)
+
+        self._seen[matched_positions] = True
+        self._new_names.update(new_names)
+        self.added += int(is_new.sum())
+        self.changed += int(is_changed.sum())
+        self.unchanged += int((~is_new & ~is_changed).sum())
+
+        return chunk[is_new | is_changed]
+
+    def removed_rows(self):
+        """Base rows whose equipment name did not appear in the incoming file."""
+        removed = self.base[~self._seen].drop(columns='_position')
+        return removed.reset_index()
+
+    def summary(self):
+        """Counts describing the delta, returned to API clients."""
+        return {
+            'base_upload_id': self.base_upload.id,
+            'added': self.added,
+            'changed': self.changed,
+            'removed': int((~self._seen).sum()),
+            'unchanged': self.unchanged,
+        }
+
+
+def start_delta(upload):
+    """
+    Prepare delta ingestion for an upload.
+    Equipment names must be unique in both the base and the incoming file; a
+    repeated name on either side rejects the upload rather than storing every row.
+
+    Returns:
+        DeltaBuilder, or None when there is no base and the upload stores every row
+
+    Raises:
+        ValueError: if equipment names repeat in the base upload
+    """
+    base_upload = select_delta_base(upload)
+    if base_upload is None:
+        return None
+    return DeltaBuilder(base_upload, load_base_frame(base_upload))
@@ -0,0 +1,53 @@
+"""
+Streaming record exports for Chemical Equipment Parameter Visualizer
+Encodes EquipmentData rows batch by batch so exports start at once and use constant memory
+"""
+
+from itertools import islice
+import csv
+import io
+import json
+
+
+# Rows fetched per database round trip and encoded per yielded chunk
+EXPORT_BATCH_SIZE = 2000
+
+# values_list lookups and the matching CSV header (same columns the upload endpoint accepts)
+EXPORT_FIELDS = ['equipment_name', 'equipment_type__name', 'flowrate', 'pressure', 'temperature']
+CSV_HEADER = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+
+# Keys of each NDJSON object, matching the JSON record representation
+NDJSON_KEYS = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
+
+
+def _iter_batches(queryset, fields, batch_size):
+    """Walk a queryset with a server-side cursor, yielding lists of value tuples."""
+    rows = queryset.order_by('id').values_list(*fields).iterator(chunk_size=batch_size)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_csv_export(queryset, batch_size=EXPORT_BATCH_SIZE):
+    """Yield a CSV export of EquipmentData rows as encoded chunks, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    yield buffer.getvalue().encode()
+
+    for batch in _iter_batches(queryset, EXPORT_FIELDS, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+def iter_ndjson_export(queryset, batch_size=EXPORT_BATCH_SIZE):
+    """Yield EquipmentData rows as newline-delimited JSON objects, in encoded chunks."""
+    encoder = json.JSONEncoder(separators=(',', ':'))
+    for batch in _iter_batches(queryset, ['id', *EXPORT_FIELDS], batch_size):
+        yield ''.join(
+            encoder.encode(dict(zip(NDJSON_KEYS, row))) + '\n' for row in batch
+        ).encode()
@@ -0,0 +1,314 @@
+"""
+CSV ingestion pipeline for Chemical Equipment Parameter Visualizer
+Reads uploaded CSV files in fixed-size chunks so memory stays flat regardless of file size
+"""
+
+from collections import Counter
+import hashlib
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import EquipmentUpload, EquipmentStatistics, EquipmentType, IngestionJob
+from .aggregates import SummaryAccumulator, update_daily_rollups
+from .deltas import start_delta
+from .loaders import load_records
+from .snapshots import SnapshotWriter
+import pandas as pd
+import json
+
+
+# Columns every equipment CSV must provide
+REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+
+# Defaults used when the corresponding settings are not configured
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_BATCH_SIZE = 5000
+
+# Committed equipment type name -> id, shared by all ingestions in this process
+_type_id_cache = {}
+
+
+class IngestionError(ValueError):
+    """
+    Raised when an uploaded CSV cannot be ingested.
+    The message is safe to return to API clients.
+    """
+
+
+class UploadStatistics:
+    """
+    Running statistics for an upload, folded in one chunk at a time.
+    Only sums, counts and a bounded percentile sample are kept, so memory
+    does not grow with row count.
+    """
+
+    def __init__(self):
+        self.chunk_count = 0
+        self.total_count = 0
+        self.pressure_sum = 0.0
+        self.temperature_sum = 0.0
+        self.type_counts = Counter()
+        self.summary = SummaryAccumulator()
+        # Added/changed/removed counts for delta uploads, None when every row is stored
+        self.delta = None
+
+    def update(self, chunk):
+        """Fold a cleaned DataFrame chunk into the running totals."""
+        self.chunk_count += 1
+        self.total_count += len(chunk)
+        self.pressure_sum += float(chunk['Pressure'].sum())
+        self.temperature_sum += float(chunk['Temperature'].sum())
+        self.type_counts.update(chunk['Type'].value_counts().to_dict())
+        self.summary.update(chunk)
+
+    @property
+    def average_pressure(self):
+        return self.pressure_sum / self.total_count if self.total_count else 0.0
+
+    @property
+    def average_temperature(self):
+        return self.temperature_sum / self.total_count if self.total_count else 0.0
+
+    @property
+    def type_distribution(self):
+        """Equipment type counts, most common first (same order as value_counts)."""
+        return dict(self.type_counts.most_common())
+
+
+def clean_chunk(chunk):
+    """
+    Validate and clean a single DataFrame chunk.
+    Drops incomplete rows and coerces parameter columns to floats.
+
+    Raises:
+        IngestionError: if required columns are missing
+        ValueError: if a parameter column holds non-numeric values
+    """
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+    if missing_columns:
+        raise IngestionError(f'Missing required columns: {", ".join(missing_columns)}')
+
+    chunk = chunk.dropna(subset=REQUIRED_COLUMNS)
+    return chunk.assign(**{
+        column: pd.to_numeric(chunk[column]).astype(float)
+        for column in NUMERIC_COLUMNS
+    })
+
+
+def iter_csv_chunks(csv_file, chunk_size=None):
+    """
+    Yield cleaned DataFrame chunks of at most chunk_size rows from a CSV file.
+
+    Args:
+        csv_file: path or file-like object positioned at the start of the CSV
+        chunk_size: rows per chunk, defaults to settings.CSV_INGEST_CHUNK_SIZE
+    """
+    chunk_size = chunk_size or getattr(settings, 'CSV_INGEST_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+    # Name and type are always text, so every chunk gets the same dtypes
+    reader = pd.read_csv(
+        csv_file,
+        chunksize=chunk_size,
+        dtype={'Equipment Name': str, 'Type': str},
+    )
+    with reader:
+        for chunk in reader:
+            yield clean_chunk(chunk)
+
+
+def resolve_type_ids(names):
+    """
+    Map equipment type names to EquipmentType ids, creating missing types.
+    Known names are served from a process-wide cache; new ids are only cached
+    once the surrounding transaction commits, so a rollback cannot leave stale ids.
+    """
+    type_ids = {name: _type_id_cache[name] for name in names if name in _type_id_cache}
+    missing = [name for name in names if name not in type_ids]
+
+    if missing:
+        EquipmentType.objects.bulk_create(
+            [EquipmentType(name=name) for name in missing],
+            ignore_conflicts=True
+        )
+        created = dict(EquipmentType.objects.filter(name__in=missing).values_list('name', 'id'))
+        type_ids.update(created)
+        transaction.on_commit(lambda: _type_id_cache.update(created))
+
+    return type_ids
+
+
+def build_record_frame(upload, chunk, removed=False):
+    """
+    Map a cleaned chunk to EquipmentData column values for load_records.
+    Type names are swapped for EquipmentType ids with one vectorized map.
+    """
+    type_ids = resolve_type_ids(chunk['Type'].unique().tolist())
+    return pd.DataFrame({
+        'upload_id': upload.id,
+        'equipment_name': chunk['Equipment Name'].to_numpy(),
+        'equipment_type_id': chunk['Type'].map(type_ids).to_numpy(),
+        'flowrate': chunk['Flowrate'].to_numpy(),
+        'pressure': chunk['Pressure'].to_numpy(),
+        'temperature': chunk['Temperature'].to_numpy(),
+        'removed': removed,
+    })
+
+
+def ingest_csv(upload, csv_file, chunk_size=None, batch_size=None, on_chunk=None, delta=False, chunks=None,
+               on_complete=None):
+    """
+    Stream a CSV into EquipmentData rows for an existing upload.
+    Each chunk is cleaned, bulk loaded, appended to the Parquet snapshot
+    and folded into the statistics, which are saved on the upload once the whole
+    file has been read.
+    
+    With delta=True only rows that were added, changed or removed since the latest
+    upload are inserted, and that upload becomes the base_upload. Statistics and
+    the snapshot still cover the full file.
+
+    Args:
+        upload: saved EquipmentUpload instance the rows belong to
+        csv_file: path or file-like object positioned at the start of the CSV
+        chunk_size: rows read per chunk
+        batch_size: rows per INSERT statement on databases without a bulk loader
+        on_chunk: optional callback invoked with the running statistics after each chunk
+        delta: store changes against the latest upload instead of every row
+        chunks: cleaned chunks that were already parsed, read instead of csv_file
+        on_complete: optional callback invoked with the statistics inside the transaction
+            that marks the upload completed; an exception from it rolls the completion back
+
+    Returns:
+        UploadStatistics: statistics for the ingested rows
+    """
+    batch_size = batch_size or getattr(settings, 'CSV_INGEST_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    stats = UploadStatistics()
+    delta_builder = start_delta(upload) if delta else None
+    snapshot = SnapshotWriter(upload)
+
+    try:
+        if chunks is None:
+            chunks = iter_csv_chunks(csv_file, chunk_size)
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            stored = delta_builder.diff_chunk(chunk) if delta_builder else chunk
+            load_records(build_record_frame(upload, stored), batch_size=batch_size)
+            snapshot.write_frame(chunk)
+            stats.update(chunk)
+            if on_chunk is not None:
+                on_chunk(stats)
+
+        if stats.total_count == 0:
+            raise IngestionError('No valid data rows found in CSV after removing incomplete entries')
+        if delta_builder:
+            load_records(
+                build_record_frame(upload, delta_builder.removed_rows(), removed=True),
+                batch_size=batch_size
+            )
+            upload.base_upload = delta_builder.base_upload
+            stats.delta = delta_builder.summary()
+        snapshot.commit()
+    except Exception:
+        snapshot.abort()
+        raise
+
+    upload.total_equipment_count = stats.total_count
+    upload.average_pressure = stats.average_pressure
+    upload.average_temperature = stats.average_temperature
+    upload.equipment_type_distribution = json.dumps(stats.type_distribution)
+    upload.status = EquipmentUpload.STATUS_COMPLETED
+    # The upload only shows as completed together with its statistics and rollups
+    with transaction.atomic():
+        if on_complete is not None:
+            on_complete(stats)
+        upload.save(update_fields=[
+            'total_equipment_count',
+            'average_pressure',
+            'average_temperature',
+            'equipment_type_distribution',
+            'status',
+            'snapshot',
+            'base_upload'
+        ])
+        EquipmentStatistics.objects.update_or_create(upload=upload, defaults=stats.summary.to_model_fields())
+        update_daily_rollups(upload, stats.summary)
+
+    return stats
+
+
+def hash_file(csv_file):
+    """
+    Compute the SHA-256 of an uploaded file, reading it chunk by chunk.
+    The file is rewound afterwards so it can be stored and parsed.
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    csv_file.seek(0)
+    for chunk in csv_file.chunks():
+        digest.update(chunk)
+    csv_file.seek(0)
+    return digest.hexdigest()
+
+
+def find_duplicate_upload(content_hash):
+    """
+    Return the most recent completed upload with the same content, or None.
+    An upload still being ingested counts while its job is alive, so a repeated
+    async upload joins the running job; one orphaned by a restart does not.
+    """
+    if not content_hash:
+        return None
+    # Imported here: jobs imports this module
+    from .jobs import get_stale_after
+    job_alive = Q(
+        ingestion_job__phase__in=[IngestionJob.PHASE_QUEUED, IngestionJob.PHASE_INGESTING],
+        ingestion_job__heartbeat_at__gte=timezone.now() - get_stale_after()
+    )
+    return (
+        EquipmentUpload.objects
+        .filter(content_hash=content_hash)
+        .filter(Q(status=EquipmentUpload.STATUS_COMPLETED) | job_alive)
+        .first()
+    )
+
+
+def create_upload(csv_file, content_hash='', **kwargs):
+    """
+    Store an uploaded CSV and ingest it inside a single transaction.
+    If ingestion fails no rows are kept and the stored file is removed.
+
+    Returns:
+        tuple: (EquipmentUpload, UploadStatistics)
+    """
+    upload = None
+    try:
+        with transaction.atomic():
+            upload = EquipmentUpload.objects.create(csv_file=csv_file, content_hash=content_hash)
+            csv_file.seek(0)
+            stats = ingest_csv(upload, csv_file, **kwargs)
+    except Exception:
+        if upload is not None:
+            upload.csv_file.delete(save=False)
+        raise
+
+    return upload, stats
+
+
+def describe_error(exc):
+    """
+    Convert an exception raised during ingestion into a client-facing message.
+    Mirrors the error responses returned by the upload endpoint.
+    """
+    if isinstance(exc, pd.errors.EmptyDataError):
+        return 'The uploaded CSV file is empty'
+    if isinstance(exc, pd.errors.ParserError):
+        return 'Invalid CSV format. Please check the file structure'
+    if isinstance(exc, IngestionError):
+        return str(exc)
+    if isinstance(exc, ValueError):
+        return f'Data validation error: {str(exc)}'
+    return f'Server error while processing CSV: {str(exc)}'
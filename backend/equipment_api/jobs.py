@@ -0,0 +1,195 @@
+"""
+Background ingestion jobs for Chemical Equipment Parameter Visualizer
+Runs CSV ingestion on a local thread pool so uploads do not block request workers
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import threading
+import traceback
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from .caching import invalidate_upload
+from .models import EquipmentUpload, IngestionJob
+from .ingestion import describe_error, ingest_csv
+
+
+DEFAULT_WORKERS = 2
+# Must exceed the time one chunk takes to ingest, since heartbeats are sent per chunk
+DEFAULT_STALE_SECONDS = 600
+
+INTERRUPTED_ERROR = 'Ingestion was interrupted by a server restart; please upload the file again'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class JobAbandoned(Exception):
+    """Raised in a worker whose job was recovered as stale while it was still running."""
+
+
+def get_executor():
+    """Return the process-wide ingestion thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'CSV_INGEST_WORKERS', DEFAULT_WORKERS),
+                thread_name_prefix='csv-ingest'
+            )
+    return _executor
+
+
+def start_ingestion_job(csv_file, content_hash='', delta=False):
+    """
+    Store an uploaded CSV and queue it for background ingestion.
+    The worker is only submitted once the job row has been committed.
+    Jobs orphaned by a restarted server are recovered first.
+
+    Returns:
+        IngestionJob: the queued job
+    """
+    recover_stale_jobs()
+    with transaction.atomic():
+        upload = EquipmentUpload.objects.create(
+            csv_file=csv_file,
+            content_hash=content_hash,
+            status=EquipmentUpload.STATUS_PENDING
+        )
+        job = IngestionJob.objects.create(upload=upload, delta=delta)
+        transaction.on_commit(lambda: get_executor().submit(run_ingestion_job, job.id))
+
+    return job
+
+
+def _update_running_job(job_id, **fields):
+    """
+    Persist progress or the outcome of a job, but only while it is still ingesting.
+
+    Raises:
+        JobAbandoned: if recover_stale_jobs() has failed the job in the meantime
+    """
+    updated = IngestionJob.objects.filter(pk=job_id, phase=IngestionJob.PHASE_INGESTING).update(**fields)
+    if not updated:
+        raise JobAbandoned(f'Ingestion job {job_id} is no longer running')
+
+
+def get_stale_after():
+    """Seconds without a heartbeat after which a queued or running job counts as orphaned."""
+    return timedelta(seconds=getattr(settings, 'INGESTION_JOB_STALE_SECONDS', DEFAULT_STALE_SECONDS))
+
+
+def _fail_upload(upload):
+    """Remove the partially inserted rows and snapshot of an upload and mark it failed."""
+    upload.equipment_records.all().delete()
+    if upload.snapshot.name:
+        upload.snapshot.delete(save=False)
+    EquipmentUpload.objects.filter(pk=upload.pk).update(status=EquipmentUpload.STATUS_FAILED)
+    invalidate_upload(upload.pk)
+
+
+def recover_stale_jobs(job_ids=None, now=None):
+    """
+    Recover jobs whose worker is gone: the thread pool lives in the server process,
+    so a restart drops queued jobs and interrupts running ones.
+
+    Queued jobs without a heartbeat for INGESTION_JOB_STALE_SECONDS are submitted
+    again; running ones are marked failed and their partial rows removed. Each job
+    is claimed with a conditional update on its phase and heartbeat, so concurrent
+    callers recover it once and run_ingestion_job only starts a job that is still
+    queued. A running job is claimed by failing it, so a worker that was only slow
+    finds its next update refused and discards its rows instead of completing.
+
+    Args:
+        job_ids: limit recovery to these jobs (e.g. the one being polled)
+
+    Returns:
+        int: number of jobs requeued or failed
+    """
+    now = now or timezone.now()
+    stale = IngestionJob.objects.select_related('upload').filter(
+        phase__in=[IngestionJob.PHASE_QUEUED, IngestionJob.PHASE_INGESTING],
+        heartbeat_at__lt=now - get_stale_after()
+    )
+    if job_ids is not None:
+        stale = stale.filter(pk__in=job_ids)
+
+    recovered = 0
+    for job in stale:
+        unchanged = IngestionJob.objects.filter(pk=job.pk, phase=job.phase, heartbeat_at=job.heartbeat_at)
+        if job.phase == IngestionJob.PHASE_QUEUED:
+            claimed = unchanged.update(heartbeat_at=now)
+            if claimed:
+                get_executor().submit(run_ingestion_job, job.pk)
+        else:
+            claimed = unchanged.update(
+                phase=IngestionJob.PHASE_FAILED, error=INTERRUPTED_ERROR, heartbeat_at=now, finished_at=now
+            )
+            if claimed:
+                _fail_upload(job.upload)
+        recovered += claimed
+    return recovered
+
+
+def run_ingestion_job(job_id):
+    """
+    Ingest the stored CSV for a job, recording progress after every chunk.
+    On failure the partially inserted rows are removed and the error is kept on the job.
+    A job that is no longer queued (already started elsewhere or recovered) is skipped,
+    and one recovered while running is abandoned: completion is only committed while
+    the job is still ingesting, in the same transaction that marks the upload completed.
+    """
+    try:
+        now = timezone.now()
+        claimed = IngestionJob.objects.filter(pk=job_id, phase=IngestionJob.PHASE_QUEUED).update(
+            phase=IngestionJob.PHASE_INGESTING, started_at=now, heartbeat_at=now
+        )
+        if not claimed:
+            return
+        job = IngestionJob.objects.select_related('upload').get(pk=job_id)
+        upload = job.upload
+
+        EquipmentUpload.objects.filter(pk=upload.pk).update(status=EquipmentUpload.STATUS_PROCESSING)
+        # update() sends no post_save signal
+        invalidate_upload(upload.pk)
+
+        def record_progress(stats):
+            _update_running_job(
+                job_id,
+                rows_processed=stats.total_count,
+                chunks_processed=stats.chunk_count,
+                heartbeat_at=timezone.now()
+            )
+
+        def record_completion(stats):
+            _update_running_job(
+                job_id,
+                phase=IngestionJob.PHASE_COMPLETED,
+                rows_processed=stats.total_count,
+                chunks_processed=stats.chunk_count,
+                heartbeat_at=timezone.now(),
+                finished_at=timezone.now()
+            )
+
+        try:
+            with upload.csv_file.open('rb') as csv_file:
+                ingest_csv(
+                    upload, csv_file,
+                    on_chunk=record_progress,
+                    on_complete=record_completion,
+                    delta=job.delta
+                )
+        except JobAbandoned:
+            # Recovery already failed the job; drop the rows this worker wrote since
+            print(f"Ingestion job {job_id} was recovered while still running; discarding its rows")
+            _fail_upload(upload)
+        except Exception as e:
+            print(f"Error in ingestion job {job_id}: {traceback.format_exc()}")
+            _fail_upload(upload)
+            IngestionJob.objects.filter(pk=job_id, phase=IngestionJob.PHASE_INGESTING).update(
+                phase=IngestionJob.PHASE_FAILED, error=describe_error(e), finished_at=timezone.now()
+            )
+    finally:
+        # Worker threads own their own connections; release them between jobs
+        connections.close_all()
@@ -0,0 +1,101 @@
+"""
+Database-specific bulk loaders for Chemical Equipment Parameter Visualizer
+Writes EquipmentData rows straight from DataFrames, skipping model instances and multi-row INSERTs
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from .models import EquipmentData
+import io
+
+
+# DataFrame columns expected by load_records, in table column order
+RECORD_FIELDS = ['upload_id', 'equipment_name', 'equipment_type_id', 'flowrate', 'pressure', 'temperature', 'removed']
+
+# Page cache for the SQLite loader when SQLITE_CACHE_SIZE_KB is not configured
+DEFAULT_SQLITE_CACHE_SIZE_KB = 64 * 1024
+
+
+def _table_and_columns():
+    """Quoted table name and column list of EquipmentData."""
+    quote = connection.ops.quote_name
+    fields = {field.attname: field.column for field in EquipmentData._meta.concrete_fields}
+    columns = ', '.join(quote(fields[name]) for name in RECORD_FIELDS)
+    return quote(EquipmentData._meta.db_table), columns
+
+
+def copy_records(frame):
+    """
+    PostgreSQL: stream rows through COPY ... FROM STDIN in CSV form.
+    The frame is encoded by pandas in one pass, without per-row Python objects.
+    """
+    table, columns = _table_and_columns()
+    buffer = io.StringIO()
+    frame[RECORD_FIELDS].to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    sql = f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)'
+
+    with connection.cursor() as cursor:
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, 'copy_expert'):
+            # psycopg2
+            raw_cursor.copy_expert(sql, buffer)
+        else:
+            # psycopg 3
+            with raw_cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _tune_sqlite(cursor):
+    """
+    Enlarge the page cache so index pages touched by large inserts stay in memory.
+    cache_size is one of the few pragmas that may be changed inside a transaction.
+    """
+    cache_size_kb = getattr(settings, 'SQLITE_CACHE_SIZE_KB', DEFAULT_SQLITE_CACHE_SIZE_KB)
+    cursor.execute(f'PRAGMA cache_size = -{cache_size_kb}')
+
+
+def executemany_records(frame):
+    """
+    SQLite: insert rows with executemany on a single prepared INSERT.
+    SQLite caps bound variables per statement, so multi-row INSERTs from
+    bulk_create only carry ~140 rows each; one reused statement is faster.
+    """
+    table, columns = _table_and_columns()
+    placeholders = ', '.join(['%s'] * len(RECORD_FIELDS))
+    sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+    rows = list(zip(*(frame[name].to_numpy().tolist() for name in RECORD_FIELDS)))
+
+    with connection.cursor() as cursor:
+        _tune_sqlite(cursor)
+        cursor.executemany(sql, rows)
+
+
+def bulk_create_records(frame, batch_size=None):
+    """Other databases: fall back to bulk_create."""
+    EquipmentData.objects.bulk_create(
+        [EquipmentData(**row) for row in frame[RECORD_FIELDS].to_dict('records')],
+        batch_size=batch_size
+    )
+
+
+def load_records(frame, batch_size=None):
+    """
+    Insert EquipmentData rows from a DataFrame with RECORD_FIELDS columns,
+    using the fastest path the database backend offers. All rows are written
+    in one transaction (a savepoint when one is already open).
+
+    Returns:
+        int: number of rows written
+    """
+    if frame.empty:
+        return 0
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            copy_records(frame)
+        elif connection.vendor == 'sqlite':
+            executemany_records(frame)
+        else:
+            bulk_create_records(frame, batch_size)
+    return len(frame)
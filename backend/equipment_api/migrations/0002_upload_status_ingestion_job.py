@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentupload',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='completed', help_text='Ingestion status of the uploaded CSV', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='IngestionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phase', models.CharField(choices=[('queued', 'Queued'), ('ingesting', 'Ingesting'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', help_text='Current job phase', max_length=20)),
+                ('rows_processed', models.IntegerField(default=0, help_text='Number of rows inserted so far')),
+                ('chunks_processed', models.IntegerField(default=0, help_text='Number of CSV chunks processed so far')),
+                ('error', models.TextField(blank=True, help_text='Error message if the job failed')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp the job was queued')),
+                ('started_at', models.DateTimeField(blank=True, help_text='Timestamp the worker picked up the job', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='Timestamp the job completed or failed', null=True)),
+                ('upload', models.OneToOneField(help_text='Upload being ingested by this job', on_delete=django.db.models.deletion.CASCADE, related_name='ingestion_job', to='equipment_api.equipmentupload')),
+            ],
+            options={
+                'verbose_name': 'Ingestion Job',
+                'verbose_name_plural': 'Ingestion Jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
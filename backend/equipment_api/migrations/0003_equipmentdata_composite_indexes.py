@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0002_upload_status_ingestion_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['upload', 'equipment_type'], name='eqdata_upload_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['upload', 'equipment_name'], name='eqdata_upload_name_idx'),
+        ),
+    ]
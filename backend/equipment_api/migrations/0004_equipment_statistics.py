@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0003_equipmentdata_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_count', models.IntegerField(default=0, help_text='Number of equipment rows summarized')),
+                ('sample_size', models.IntegerField(default=0, help_text='Rows used to estimate percentiles')),
+                ('percentiles_exact', models.BooleanField(default=True, help_text='Whether percentiles were computed from every row')),
+                ('column_summary', models.JSONField(default=dict, help_text='count/mean/std/min/max/p50/p95/p99 per column')),
+                ('type_summary', models.JSONField(default=dict, help_text='Per equipment type count and column summaries')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp the statistics were computed')),
+                ('upload', models.OneToOneField(help_text='Upload these statistics describe', on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='equipment_api.equipmentupload')),
+            ],
+            options={
+                'verbose_name': 'Equipment Statistics',
+                'verbose_name_plural': 'Equipment Statistics',
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:06
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    """Build rollups for uploads ingested before rollups existed."""
+    EquipmentData = apps.get_model('equipment_api', 'EquipmentData')
+    DailyTypeRollup = apps.get_model('equipment_api', 'DailyTypeRollup')
+    
+    totals = (
+        EquipmentData.objects
+        .filter(upload__status='completed')
+        .annotate(date=TruncDate('upload__uploaded_at'))
+        .values('date', 'equipment_type')
+        .annotate(
+            upload_count=Count('upload', distinct=True),
+            record_count=Count('id'),
+            flowrate_sum=Sum('flowrate'),
+            pressure_sum=Sum('pressure'),
+            temperature_sum=Sum('temperature'),
+        )
+        .order_by()
+    )
+    DailyTypeRollup.objects.bulk_create(
+        [DailyTypeRollup(**row) for row in totals],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0004_equipment_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTypeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Upload date (local time)')),
+                ('equipment_type', models.CharField(help_text='Type/category of equipment', max_length=100)),
+                ('upload_count', models.IntegerField(default=0, help_text='Uploads on this day containing this type')),
+                ('record_count', models.BigIntegerField(default=0, help_text='Equipment records of this type on this day')),
+                ('flowrate_sum', models.FloatField(default=0.0, help_text='Sum of flowrates, for averages')),
+                ('pressure_sum', models.FloatField(default=0.0, help_text='Sum of pressures, for averages')),
+                ('temperature_sum', models.FloatField(default=0.0, help_text='Sum of temperatures, for averages')),
+            ],
+            options={
+                'verbose_name': 'Daily Type Rollup',
+                'verbose_name_plural': 'Daily Type Rollups',
+                'ordering': ['date', 'equipment_type'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailytyperollup',
+            constraint=models.UniqueConstraint(fields=('date', 'equipment_type'), name='rollup_unique_date_type'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
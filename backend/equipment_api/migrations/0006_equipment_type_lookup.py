@@ -0,0 +1,85 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_equipment_types(apps, schema_editor):
+    """Create one EquipmentType per distinct name and point records at it."""
+    EquipmentData = apps.get_model('equipment_api', 'EquipmentData')
+    EquipmentType = apps.get_model('equipment_api', 'EquipmentType')
+
+    names = (
+        EquipmentData.objects.order_by()
+        .values_list('equipment_type_name', flat=True)
+        .distinct()
+    )
+    for name in names:
+        equipment_type, _ = EquipmentType.objects.get_or_create(name=name)
+        EquipmentData.objects.filter(equipment_type_name=name).update(equipment_type=equipment_type)
+
+
+def restore_type_names(apps, schema_editor):
+    """Copy type names back onto records when unapplying."""
+    EquipmentData = apps.get_model('equipment_api', 'EquipmentData')
+    EquipmentType = apps.get_model('equipment_api', 'EquipmentType')
+
+    for equipment_type in EquipmentType.objects.all():
+        EquipmentData.objects.filter(equipment_type=equipment_type).update(equipment_type_name=equipment_type.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0005_daily_type_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Type/category of equipment', max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Equipment Type',
+                'verbose_name_plural': 'Equipment Types',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='equipmentdata',
+            name='eqdata_upload_type_idx',
+        ),
+        migrations.RenameField(
+            model_name='equipmentdata',
+            old_name='equipment_type',
+            new_name='equipment_type_name',
+        ),
+        # Nullable before it is removed, so unapplying can re-add the column to a table with
+        # rows; restore_type_names then fills it before it becomes NOT NULL again
+        migrations.AlterField(
+            model_name='equipmentdata',
+            name='equipment_type_name',
+            field=models.CharField(help_text='Type/category of equipment', max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmentdata',
+            name='equipment_type',
+            field=models.ForeignKey(help_text='Type/category of equipment', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='equipment_records', to='equipment_api.equipmenttype'),
+        ),
+        migrations.RunPython(populate_equipment_types, restore_type_names),
+        migrations.RemoveField(
+            model_name='equipmentdata',
+            name='equipment_type_name',
+        ),
+        migrations.AlterField(
+            model_name='equipmentdata',
+            name='equipment_type',
+            field=models.ForeignKey(help_text='Type/category of equipment', on_delete=django.db.models.deletion.PROTECT, related_name='equipment_records', to='equipment_api.equipmenttype'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['upload', 'equipment_type'], name='eqdata_upload_type_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0006_equipment_type_lookup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentupload',
+            name='snapshot',
+            field=models.FileField(blank=True, help_text='Columnar Parquet copy of the ingested records', upload_to='snapshots/'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:41
+
+import hashlib
+from django.db import migrations, models
+
+
+def hash_existing_uploads(apps, schema_editor):
+    """Hash the stored CSV of every completed upload whose file is still available."""
+    EquipmentUpload = apps.get_model('equipment_api', 'EquipmentUpload')
+
+    for upload in EquipmentUpload.objects.filter(status='completed', content_hash='').iterator():
+        if not upload.csv_file or not upload.csv_file.storage.exists(upload.csv_file.name):
+            continue
+        digest = hashlib.sha256()
+        with upload.csv_file.open('rb') as csv_file:
+            for chunk in csv_file.chunks():
+                digest.update(chunk)
+        EquipmentUpload.objects.filter(pk=upload.pk).update(content_hash=digest.hexdigest())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0007_upload_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentupload',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-256 of the uploaded file, used to detect repeated uploads', max_length=64),
+        ),
+        migrations.RunPython(hash_existing_uploads, migrations.RunPython.noop),
+    ]
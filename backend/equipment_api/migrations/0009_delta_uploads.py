@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0008_upload_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentdata',
+            name='removed',
+            field=models.BooleanField(default=False, help_text='Marks equipment dropped since the base upload (delta uploads only)'),
+        ),
+        migrations.AddField(
+            model_name='equipmentupload',
+            name='base_upload',
+            field=models.ForeignKey(blank=True, help_text='Upload this one stores changes against; empty when every row is stored', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='delta_uploads', to='equipment_api.equipmentupload'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0009_delta_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkedUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(help_text='Original name of the CSV file', max_length=255)),
+                ('total_size', models.BigIntegerField(help_text='Size of the complete file in bytes')),
+                ('chunk_size', models.IntegerField(help_text='Bytes per chunk; only the last chunk may be shorter')),
+                ('content_hash', models.CharField(blank=True, help_text='SHA-256 announced by the client, checked when the chunks are assembled', max_length=64)),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('assembling', 'Assembling'), ('completed', 'Completed')], default='uploading', help_text='Upload session state', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp the upload session was started')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp of the last received chunk')),
+                ('upload', models.ForeignKey(blank=True, help_text='Upload created from the assembled file', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='chunked_uploads', to='equipment_api.equipmentupload')),
+            ],
+            options={
+                'verbose_name': 'Chunked Upload',
+                'verbose_name_plural': 'Chunked Uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:57
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0010_chunked_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionjob',
+            name='delta',
+            field=models.BooleanField(default=False, help_text='Store only rows changed since the latest upload'),
+        ),
+        migrations.AddField(
+            model_name='ingestionjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Last sign of life from the worker; jobs silent for too long are recovered'),
+        ),
+    ]
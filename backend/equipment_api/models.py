@@ -3,7 +3,8 @@ Models for Chemical Equipment Parameter Visualizer
 Stores metadata and statistics for uploaded equipment CSV files
 """
 
-from django.db import models
+from django.db import connection, models
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 
@@ -13,9 +14,47 @@ class EquipmentUpload(models.Model):
     Tracks equipment specifications and calculated statistics.
     """
     
+    # Ingestion status values
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
     # File metadata
     csv_file = models.FileField(upload_to='csvs/', help_text="Uploaded CSV file")
+    snapshot = models.FileField(
+        upload_to='snapshots/',
+        blank=True,
+        help_text="Columnar Parquet copy of the ingested records"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="SHA-256 of the uploaded file, used to detect repeated uploads"
+    )
+    base_upload = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name='delta_uploads',
+        help_text="Upload this one stores changes against; empty when every row is stored"
+    )
     uploaded_at = models.DateTimeField(default=timezone.now, help_text="Timestamp of upload")
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_COMPLETED,
+        db_index=True,
+        help_text="Ingestion status of the uploaded CSV"
+    )
     
     # Statistical data computed from CSV
     total_equipment_count = models.IntegerField(default=0, help_text="Total number of equipment entries")
@@ -35,6 +74,74 @@ class EquipmentUpload(models.Model):
     
     def __str__(self):
         return f"Upload {self.id} - {self.total_equipment_count} equipment - {self.uploaded_at.strftime('%Y-%m-%d %H:%M')}"
+    
+    def snapshot_chain(self):
+        """
+        Ids of the uploads whose rows make up this upload's full snapshot, oldest first.
+        A full upload is its own chain; a delta upload follows base_upload back to a full one,
+        walked in a single recursive query. A base is always older, so ids ascend along the chain.
+        """
+        if self.base_upload_id is None:
+            return [self.id]
+        
+        quote = connection.ops.quote_name
+        table = quote(self._meta.db_table)
+        pk = quote(self._meta.pk.column)
+        base = quote(self._meta.get_field('base_upload').column)
+        sql = (
+            f'WITH RECURSIVE chain (id, base_id) AS ('
+            f'SELECT {pk}, {base} FROM {table} WHERE {pk} = %s '
+            f'UNION ALL '
+            f'SELECT upload.{pk}, upload.{base} FROM {table} upload JOIN chain ON upload.{pk} = chain.base_id'
+            f') SELECT id FROM chain'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.id])
+            return sorted(row[0] for row in cursor.fetchall())
+    
+    def snapshot_records(self):
+        """
+        All equipment records of this upload's full snapshot.
+        Delta uploads are rebuilt in one query: for each equipment name the row from the
+        newest upload in the chain wins, and names whose newest row is a removal are dropped.
+        """
+        if self.base_upload_id is None:
+            return self.equipment_records.all()
+        
+        chain = self.snapshot_chain()
+        superseded = EquipmentData.objects.filter(
+            upload_id__in=chain,
+            upload_id__gt=OuterRef('upload_id'),
+            equipment_name=OuterRef('equipment_name')
+        )
+        return EquipmentData.objects.filter(upload_id__in=chain, removed=False).exclude(Exists(superseded))
+
+
+class EquipmentType(models.Model):
+    """
+    Lookup table of equipment types.
+    Equipment records reference a type by integer id instead of repeating its name.
+    """
+    
+    name = models.CharField(max_length=100, unique=True, help_text="Type/category of equipment")
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name = "Equipment Type"
+        verbose_name_plural = "Equipment Types"
+    
+    def __str__(self):
+        return self.name
+
+
+class EquipmentDataManager(models.Manager):
+    """
+    Default manager for EquipmentData.
+    Joins the type lookup so record serialization never issues a query per row.
+    """
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('equipment_type')
 
 
 class EquipmentData(models.Model):
@@ -52,15 +159,188 @@ class EquipmentData(models.Model):
     
     # Equipment parameters from CSV
     equipment_name = models.CharField(max_length=200, help_text="Name/ID of the equipment")
-    equipment_type = models.CharField(max_length=100, help_text="Type/category of equipment")
+    equipment_type = models.ForeignKey(
+        EquipmentType,
+        on_delete=models.PROTECT,
+        related_name='equipment_records',
+        help_text="Type/category of equipment"
+    )
     flowrate = models.FloatField(help_text="Flowrate in L/min or specified units")
     pressure = models.FloatField(help_text="Operating pressure in bar")
     temperature = models.FloatField(help_text="Operating temperature in °C")
+    removed = models.BooleanField(
+        default=False,
+        help_text="Marks equipment dropped since the base upload (delta uploads only)"
+    )
+    
+    objects = EquipmentDataManager()
     
     class Meta:
         ordering = ['equipment_name']
+        indexes = [
+            # Back per-upload type filters and name-ordered keyset pagination
+            models.Index(fields=['upload', 'equipment_type'], name='eqdata_upload_type_idx'),
+            models.Index(fields=['upload', 'equipment_name'], name='eqdata_upload_name_idx'),
+        ]
         verbose_name = "Equipment Data"
         verbose_name_plural = "Equipment Data"
     
     def __str__(self):
         return f"{self.equipment_name} ({self.equipment_type})"
+
+
+class IngestionJob(models.Model):
+    """
+    Model to track background ingestion of an uploaded CSV file.
+    Progress is written after every chunk so clients can poll the job status.
+    """
+    
+    # Job phases
+    PHASE_QUEUED = 'queued'
+    PHASE_INGESTING = 'ingesting'
+    PHASE_COMPLETED = 'completed'
+    PHASE_FAILED = 'failed'
+    PHASE_CHOICES = [
+        (PHASE_QUEUED, 'Queued'),
+        (PHASE_INGESTING, 'Ingesting'),
+        (PHASE_COMPLETED, 'Completed'),
+        (PHASE_FAILED, 'Failed'),
+    ]
+    
+    upload = models.OneToOneField(
+        EquipmentUpload,
+        on_delete=models.CASCADE,
+        related_name='ingestion_job',
+        help_text="Upload being ingested by this job"
+    )
+    phase = models.CharField(max_length=20, choices=PHASE_CHOICES, default=PHASE_QUEUED, help_text="Current job phase")
+    rows_processed = models.IntegerField(default=0, help_text="Number of rows inserted so far")
+    chunks_processed = models.IntegerField(default=0, help_text="Number of CSV chunks processed so far")
+    error = models.TextField(blank=True, help_text="Error message if the job failed")
+    delta = models.BooleanField(default=False, help_text="Store only rows changed since the latest upload")
+    created_at = models.DateTimeField(default=timezone.now, help_text="Timestamp the job was queued")
+    heartbeat_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Last sign of life from the worker; jobs silent for too long are recovered"
+    )
+    started_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp the worker picked up the job")
+    finished_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp the job completed or failed")
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Ingestion Job"
+        verbose_name_plural = "Ingestion Jobs"
+    
+    def __str__(self):
+        return f"Job {self.id} - upload {self.upload_id} - {self.phase}"
+
+
+class ChunkedUpload(models.Model):
+    """
+    Model to track a resumable CSV upload sent as numbered chunks.
+    Received chunks are kept on disk until the client finalizes the upload,
+    which assembles them into csvs/ and ingests the file like a direct upload.
+    """
+    
+    # Upload session states
+    STATUS_UPLOADING = 'uploading'
+    STATUS_ASSEMBLING = 'assembling'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_UPLOADING, 'Uploading'),
+        (STATUS_ASSEMBLING, 'Assembling'),
+        (STATUS_COMPLETED, 'Completed'),
+    ]
+    
+    filename = models.CharField(max_length=255, help_text="Original name of the CSV file")
+    total_size = models.BigIntegerField(help_text="Size of the complete file in bytes")
+    chunk_size = models.IntegerField(help_text="Bytes per chunk; only the last chunk may be shorter")
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="SHA-256 announced by the client, checked when the chunks are assembled"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING, help_text="Upload session state")
+    upload = models.ForeignKey(
+        EquipmentUpload,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='chunked_uploads',
+        help_text="Upload created from the assembled file"
+    )
+    created_at = models.DateTimeField(default=timezone.now, help_text="Timestamp the upload session was started")
+    updated_at = models.DateTimeField(default=timezone.now, help_text="Timestamp of the last received chunk")
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Chunked Upload"
+        verbose_name_plural = "Chunked Uploads"
+    
+    def __str__(self):
+        return f"Chunked upload {self.id} - {self.filename} - {self.status}"
+    
+    @property
+    def total_chunks(self):
+        """Number of chunks the file is split into (at least one, even for an empty file)."""
+        return max(1, -(-self.total_size // self.chunk_size))
+    
+    def expected_chunk_size(self, index):
+        """Length in bytes of chunk number index."""
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
+
+
+class EquipmentStatistics(models.Model):
+    """
+    Model to store precomputed statistics for an upload.
+    Computed once at ingestion so statistics requests read a single row.
+    """
+    
+    upload = models.OneToOneField(
+        EquipmentUpload,
+        on_delete=models.CASCADE,
+        related_name='statistics',
+        help_text="Upload these statistics describe"
+    )
+    row_count = models.IntegerField(default=0, help_text="Number of equipment rows summarized")
+    sample_size = models.IntegerField(default=0, help_text="Rows used to estimate percentiles")
+    percentiles_exact = models.BooleanField(default=True, help_text="Whether percentiles were computed from every row")
+    
+    # Summaries keyed by column (flowrate, pressure, temperature) and by equipment type
+    column_summary = models.JSONField(default=dict, help_text="count/mean/std/min/max/p50/p95/p99 per column")
+    type_summary = models.JSONField(default=dict, help_text="Per equipment type count and column summaries")
+    computed_at = models.DateTimeField(default=timezone.now, help_text="Timestamp the statistics were computed")
+    
+    class Meta:
+        verbose_name = "Equipment Statistics"
+        verbose_name_plural = "Equipment Statistics"
+    
+    def __str__(self):
+        return f"Statistics for upload {self.upload_id} - {self.row_count} rows"
+
+
+class DailyTypeRollup(models.Model):
+    """
+    Model to store per day × equipment type totals across all uploads.
+    Updated incrementally at ingestion so fleet-wide trends read a few rollup rows.
+    """
+    
+    date = models.DateField(help_text="Upload date (local time)")
+    equipment_type = models.CharField(max_length=100, help_text="Type/category of equipment")
+    
+    upload_count = models.IntegerField(default=0, help_text="Uploads on this day containing this type")
+    record_count = models.BigIntegerField(default=0, help_text="Equipment records of this type on this day")
+    flowrate_sum = models.FloatField(default=0.0, help_text="Sum of flowrates, for averages")
+    pressure_sum = models.FloatField(default=0.0, help_text="Sum of pressures, for averages")
+    temperature_sum = models.FloatField(default=0.0, help_text="Sum of temperatures, for averages")
+    
+    class Meta:
+        ordering = ['date', 'equipment_type']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'equipment_type'], name='rollup_unique_date_type'),
+        ]
+        verbose_name = "Daily Type Rollup"
+        verbose_name_plural = "Daily Type Rollups"
+    
+    def __str__(self):
+        return f"{self.date} - {self.equipment_type} - {self.record_count} records"
@@ -0,0 +1,112 @@
+"""
+Keyset (cursor) pagination for equipment records
+Pages are selected with a WHERE clause on the last seen row, so deep pages cost the same as the first
+"""
+
+import base64
+import binascii
+import json
+from django.db.models import Q
+
+
+# Columns records may be ordered by; id is always appended as a tie-breaker
+ORDERING_FIELDS = ['equipment_name', 'flowrate', 'pressure', 'temperature', 'id']
+DEFAULT_ORDERING = 'equipment_name'
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor or ordering parameter cannot be used."""
+
+
+def encode_cursor(ordering, value, pk):
+    """Encode the position after a row as an opaque URL-safe token."""
+    payload = json.dumps({'o': ordering, 'v': value, 'id': pk}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a token produced by encode_cursor into a dict."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(position, dict) or not {'o', 'v', 'id'} <= set(position):
+        raise InvalidCursor('Invalid cursor')
+    # Ordering fields are never null, so the value is a string or a number (bools are ints in Python)
+    value, pk = position['v'], position['id']
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise InvalidCursor('Invalid cursor')
+    if isinstance(pk, bool) or not isinstance(pk, int) or not isinstance(position['o'], str):
+        raise InvalidCursor('Invalid cursor')
+    return position
+
+
+def parse_ordering(ordering):
+    """
+    Validate an ordering parameter such as 'pressure' or '-temperature'.
+
+    Returns:
+        tuple: (field name, descending flag)
+    """
+    ordering = ordering or DEFAULT_ORDERING
+    field = ordering.lstrip('-')
+    if field not in ORDERING_FIELDS:
+        raise InvalidCursor(f'ordering must be one of: {", ".join(ORDERING_FIELDS)} (prefix with - for descending)')
+    return field, ordering.startswith('-')
+
+
+def paginate_keyset(queryset, ordering=None, cursor=None, page_size=DEFAULT_PAGE_SIZE, values=None):
+    """
+    Return one page of a queryset using keyset pagination.
+
+    Args:
+        queryset: filtered queryset of model instances
+        ordering: field name, optionally prefixed with '-'
+        cursor: token returned as next_cursor by the previous page
+        page_size: rows per page
+        values: optional values_list lookups; rows are then tuples, and the
+            lookups must include id and every orderable field
+
+    Returns:
+        tuple: (list of rows, next cursor or None)
+    """
+    field, descending = parse_ordering(ordering)
+    prefix = '-' if descending else ''
+    normalized = f'{prefix}{field}'
+
+    if cursor:
+        position = decode_cursor(cursor)
+        if position['o'] != normalized:
+            raise InvalidCursor('Cursor does not match the requested ordering')
+        lookup = 'lt' if descending else 'gt'
+        try:
+            if field == 'id':
+                queryset = queryset.filter(**{f'id__{lookup}': position['id']})
+            else:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__{lookup}': position['v']}) |
+                    Q(**{field: position['v'], f'id__{lookup}': position['id']})
+                )
+        except (TypeError, ValueError):
+            # A value the field cannot compare against, such as text for a numeric column
+            raise InvalidCursor('Invalid cursor')
+
+    queryset = queryset.order_by(normalized, f'{prefix}id')
+    if values is not None:
+        queryset = queryset.values_list(*values)
+    rows = list(queryset[:page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        if values is not None:
+            next_cursor = encode_cursor(normalized, last[values.index(field)], last[values.index('id')])
+        else:
+            next_cursor = encode_cursor(normalized, getattr(last, field), last.pk)
+
+    return rows, next_cursor
@@ -0,0 +1,153 @@
+"""
+Response renderers for Chemical Equipment Parameter Visualizer
+Serve record listings as Arrow IPC streams or MessagePack instead of per-row JSON,
+and negotiate the format of streaming exports
+"""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+import json
+import msgpack
+import pyarrow as pa
+
+
+# values_list lookups for equipment records and the column names clients see
+RECORD_COLUMNS = {
+    'id': 'id',
+    'equipment_name': 'equipment_name',
+    'equipment_type__name': 'equipment_type',
+    'flowrate': 'flowrate',
+    'pressure': 'pressure',
+    'temperature': 'temperature',
+}
+
+RECORD_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('equipment_name', pa.string()),
+    ('equipment_type', pa.string()),
+    ('flowrate', pa.float64()),
+    ('pressure', pa.float64()),
+    ('temperature', pa.float64()),
+])
+
+# Schema metadata key holding the non-record fields of an Arrow response
+ARROW_METADATA_KEY = b'metadata'
+
+
+class RecordColumns:
+    """
+    Equipment records held column-wise, built from values_list rows.
+    Columnar renderers emit the columns directly instead of one object per row.
+    """
+
+    def __init__(self, rows):
+        columns = list(zip(*rows)) if rows else [() for _ in RECORD_COLUMNS]
+        self.columns = {name: list(column) for name, column in zip(RECORD_COLUMNS.values(), columns)}
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def to_arrow(self):
+        """Return the records as a pyarrow Table with a dictionary-encoded type column."""
+        table = pa.Table.from_pydict(self.columns, schema=RECORD_SCHEMA)
+        type_index = RECORD_SCHEMA.get_field_index('equipment_type')
+        return table.set_column(
+            type_index, 'equipment_type', table.column('equipment_type').dictionary_encode()
+        )
+
+
+def wants_columnar(request):
+    """True when content negotiation picked one of the columnar renderers."""
+    return isinstance(getattr(request, 'accepted_renderer', None), (ArrowStreamRenderer, MessagePackRenderer))
+
+
+def _split_payload(data):
+    """Separate the RecordColumns value of a response payload from the other fields."""
+    records = [(key, value) for key, value in data.items() if isinstance(value, RecordColumns)]
+    if len(records) != 1:
+        return None, None, data
+    key, columns = records[0]
+    return key, columns, {name: value for name, value in data.items() if name != key}
+
+
+def _render_json_fallback(data, renderer_context):
+    """Render a payload the binary format cannot carry (such as an error) as JSON."""
+    response = (renderer_context or {}).get('response')
+    if response is not None:
+        response['Content-Type'] = JSONRenderer.media_type
+    return JSONRenderer().render(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders responses as MessagePack.
+    Record listings become {column: [values, ...]} maps under their usual key.
+    """
+
+    media_type = 'application/x-msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    @staticmethod
+    def _default(value):
+        if isinstance(value, RecordColumns):
+            return value.columns
+        return json.loads(json.dumps(value, cls=JSONEncoder))
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self._default, use_bin_type=True)
+
+
+class ArrowStreamRenderer(BaseRenderer):
+    """
+    Renders record listings as an Arrow IPC stream.
+    The records form the table; the remaining response fields are stored as JSON
+    in the schema metadata. Responses without records (errors) fall back to JSON.
+    """
+
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        key, columns, metadata = _split_payload(data) if isinstance(data, dict) else (None, None, data)
+        if columns is None:
+            return _render_json_fallback(metadata, renderer_context)
+
+        table = columns.to_arrow()
+        table = table.replace_schema_metadata({
+            ARROW_METADATA_KEY: json.dumps({**metadata, 'records_key': key}, cls=JSONEncoder).encode()
+        })
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+class CSVExportRenderer(BaseRenderer):
+    """
+    Selects CSV for the streaming export endpoint.
+    Exports are streamed by the view itself; this renderer only handles
+    ordinary responses such as errors, which are returned as JSON.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return _render_json_fallback(data, renderer_context)
+
+
+class NDJSONExportRenderer(CSVExportRenderer):
+    """Selects newline-delimited JSON for the streaming export endpoint."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
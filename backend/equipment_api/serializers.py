@@ -4,28 +4,48 @@ Handles conversion between Django models and JSON representations
 """
 
 from rest_framework import serializers
-from .models import EquipmentUpload, EquipmentData
+from django.conf import settings
+from .models import EquipmentUpload, EquipmentData, EquipmentStatistics, IngestionJob
 import json
 
 
+class DynamicFieldsMixin:
+    """
+    Serializer mixin that accepts a `fields` argument to limit the output.
+    Unknown field names are ignored.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
 class EquipmentDataSerializer(serializers.ModelSerializer):
     """
     Serializer for individual equipment records.
     Used to represent equipment parameters in API responses.
     """
     
+    # Types are stored in a lookup table but exposed by name
+    equipment_type = serializers.CharField(source='equipment_type.name', read_only=True)
+    
     class Meta:
         model = EquipmentData
         fields = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
 
 
-class EquipmentUploadSerializer(serializers.ModelSerializer):
+class EquipmentUploadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for equipment upload metadata.
     Includes nested equipment records and computed statistics.
     """
     
-    equipment_records = EquipmentDataSerializer(many=True, read_only=True)
+    # Delta uploads are rebuilt into their full set of records
+    equipment_records = EquipmentDataSerializer(many=True, read_only=True, source='snapshot_records')
     equipment_type_distribution_json = serializers.SerializerMethodField()
     
     class Meta:
@@ -34,6 +54,9 @@ class EquipmentUploadSerializer(serializers.ModelSerializer):
             'id',
             'csv_file',
             'uploaded_at',
+            'status',
+            'content_hash',
+            'base_upload',
             'total_equipment_count',
             'average_pressure',
             'average_temperature',
@@ -43,6 +66,9 @@ class EquipmentUploadSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             'uploaded_at',
+            'status',
+            'content_hash',
+            'base_upload',
             'total_equipment_count',
             'average_pressure',
             'average_temperature',
@@ -62,6 +88,67 @@ class EquipmentUploadSerializer(serializers.ModelSerializer):
             return {}
 
 
+class EquipmentUploadSummarySerializer(EquipmentUploadSerializer):
+    """
+    Serializer for upload metadata and statistics only.
+    Omits nested equipment records so large uploads stay cheap to return.
+    """
+    
+    class Meta(EquipmentUploadSerializer.Meta):
+        fields = [
+            field for field in EquipmentUploadSerializer.Meta.fields
+            if field != 'equipment_records'
+        ]
+
+
+class EquipmentStatisticsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for precomputed upload statistics.
+    Returns per-column and per-type summaries stored at ingestion.
+    """
+    
+    upload_id = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = EquipmentStatistics
+        fields = [
+            'upload_id',
+            'row_count',
+            'sample_size',
+            'percentiles_exact',
+            'column_summary',
+            'type_summary',
+            'computed_at'
+        ]
+        read_only_fields = fields
+
+
+class IngestionJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for background ingestion job progress.
+    Reports the job phase alongside the status of the upload it populates.
+    """
+    
+    upload_id = serializers.IntegerField(read_only=True)
+    upload_status = serializers.CharField(source='upload.status', read_only=True)
+    
+    class Meta:
+        model = IngestionJob
+        fields = [
+            'id',
+            'upload_id',
+            'upload_status',
+            'phase',
+            'rows_processed',
+            'chunks_processed',
+            'error',
+            'created_at',
+            'started_at',
+            'finished_at'
+        ]
+        read_only_fields = fields
+
+
 class CSVUploadSerializer(serializers.Serializer):
     """
     Serializer for handling CSV file uploads.
@@ -77,8 +164,11 @@ class CSVUploadSerializer(serializers.Serializer):
         if not value.name.endswith('.csv'):
             raise serializers.ValidationError("Only CSV files are accepted. Please upload a .csv file.")
         
-        # Additional validation: check file size (limit to 5MB)
-        if value.size > 5 * 1024 * 1024:
-            raise serializers.ValidationError("CSV file size must be less than 5MB.")
+        # Additional validation: check file size against the configured limit
+        max_size = getattr(settings, 'CSV_UPLOAD_MAX_SIZE', None)
+        if max_size and value.size > max_size:
+            raise serializers.ValidationError(
+                f"CSV file size must be less than {max_size // (1024 * 1024)}MB."
+            )
         
         return value
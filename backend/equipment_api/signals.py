@@ -0,0 +1,41 @@
+"""
+Signal receivers for Chemical Equipment Parameter Visualizer
+Applies the SQLite production pragmas to every new database connection and invalidates cached responses
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .caching import invalidate_upload
+from .models import EquipmentUpload
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    With SQLITE_PRODUCTION enabled, switch SQLite connections to WAL journaling
+    so readers are not blocked by an upload being written, relax fsyncs to
+    synchronous=NORMAL (safe with WAL) and enlarge the page cache and mmap window.
+    """
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_PRODUCTION', False):
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode = WAL')
+        cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.execute(f'PRAGMA cache_size = -{settings.SQLITE_CACHE_SIZE_KB}')
+        cursor.execute(f'PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}')
+        cursor.execute('PRAGMA temp_store = MEMORY')
+
+
+@receiver(post_save, sender=EquipmentUpload)
+@receiver(post_delete, sender=EquipmentUpload)
+def invalidate_upload_responses(sender, instance, **kwargs):
+    """
+    Drop cached history, detail and statistics responses once a created, updated
+    or deleted upload is committed, so no request re-caches the old state.
+    """
+    upload_id = instance.pk
+    transaction.on_commit(lambda: invalidate_upload(upload_id))
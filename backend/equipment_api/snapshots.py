@@ -0,0 +1,142 @@
+"""
+Columnar Parquet snapshots for Chemical Equipment Parameter Visualizer
+Each upload is also stored as a compressed Parquet file so analytics reads skip the ORM
+"""
+
+import os
+import tempfile
+from django.conf import settings
+from itertools import islice
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Snapshot column names match the EquipmentData fields
+SNAPSHOT_SCHEMA = pa.schema([
+    ('equipment_name', pa.string()),
+    ('equipment_type', pa.dictionary(pa.int32(), pa.string())),
+    ('flowrate', pa.float64()),
+    ('pressure', pa.float64()),
+    ('temperature', pa.float64()),
+])
+
+# Mapping from cleaned CSV columns to snapshot columns
+CSV_TO_SNAPSHOT = {
+    'Equipment Name': 'equipment_name',
+    'Type': 'equipment_type',
+    'Flowrate': 'flowrate',
+    'Pressure': 'pressure',
+    'Temperature': 'temperature',
+}
+
+SNAPSHOT_COMPRESSION = 'zstd'
+PARQUET_CONTENT_TYPE = 'application/vnd.apache.parquet'
+
+
+def snapshot_name(upload):
+    """Storage name of an upload's snapshot, relative to MEDIA_ROOT."""
+    return f'snapshots/upload_{upload.id}.parquet'
+
+
+def snapshot_path(upload):
+    """Absolute path of an upload's snapshot, or None if it has not been written."""
+    if not upload.snapshot:
+        return None
+    path = os.path.join(settings.MEDIA_ROOT, upload.snapshot.name)
+    return path if os.path.exists(path) else None
+
+
+class SnapshotWriter:
+    """
+    Writes cleaned chunks to a Parquet file, one row group per chunk.
+    Data goes to a temporary file that is moved into place by commit(),
+    so a failed ingestion never leaves a partial snapshot behind.
+    """
+
+    def __init__(self, upload):
+        self.upload = upload
+        self.final_path = os.path.join(settings.MEDIA_ROOT, snapshot_name(upload))
+        os.makedirs(os.path.dirname(self.final_path), exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(suffix='.parquet.tmp', dir=os.path.dirname(self.final_path))
+        os.close(fd)
+        self._writer = pq.ParquetWriter(self.tmp_path, SNAPSHOT_SCHEMA, compression=SNAPSHOT_COMPRESSION)
+
+    def write_frame(self, chunk):
+        """Append a cleaned DataFrame chunk with CSV column names."""
+        frame = chunk[list(CSV_TO_SNAPSHOT)].rename(columns=CSV_TO_SNAPSHOT)
+        self._writer.write_table(pa.Table.from_pandas(frame, schema=SNAPSHOT_SCHEMA, preserve_index=False))
+
+    def write_rows(self, rows):
+        """Append (name, type, flowrate, pressure, temperature) tuples."""
+        columns = list(zip(*rows)) if rows else [[] for _ in SNAPSHOT_SCHEMA]
+        arrays = [
+            pa.array(column, type=field.type.value_type).dictionary_encode()
+            if pa.types.is_dictionary(field.type) else pa.array(column, type=field.type)
+            for column, field in zip(columns, SNAPSHOT_SCHEMA)
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=SNAPSHOT_SCHEMA))
+
+    def commit(self):
+        """Finish the file, move it into place and record it on the upload (unsaved)."""
+        self._writer.close()
+        os.replace(self.tmp_path, self.final_path)
+        self.upload.snapshot.name = snapshot_name(self.upload)
+
+    def abort(self):
+        """Discard the temporary file."""
+        try:
+            self._writer.close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+
+def build_snapshot_from_records(upload, chunk_size=50000):
+    """
+    Write a snapshot for an upload from its EquipmentData rows.
+    Used for uploads ingested before snapshots existed.
+
+    Returns:
+        str: absolute path of the snapshot
+    """
+    writer = SnapshotWriter(upload)
+    try:
+        rows = upload.snapshot_records().order_by('id').values_list(
+            'equipment_name', 'equipment_type__name', 'flowrate', 'pressure', 'temperature'
+        ).iterator(chunk_size=chunk_size)
+        while True:
+            batch = list(islice(rows, chunk_size))
+            if not batch:
+                break
+            writer.write_rows(batch)
+        writer.commit()
+    except Exception:
+        writer.abort()
+        raise
+
+    upload.save(update_fields=['snapshot'])
+    return snapshot_path(upload)
+
+
+def ensure_snapshot(upload):
+    """Return the snapshot path for an upload, building it from the database if missing."""
+    return snapshot_path(upload) or build_snapshot_from_records(upload)
+
+
+def iter_snapshot_frames(upload, columns=None, batch_size=65536):
+    """
+    Yield pandas DataFrames from an upload's snapshot, reading it memory-mapped.
+
+    Args:
+        upload: EquipmentUpload with a snapshot
+        columns: snapshot column names to read (all by default)
+        batch_size: rows per yielded frame
+    """
+    parquet_file = pq.ParquetFile(ensure_snapshot(upload), memory_map=True)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield batch.to_pandas()
+
+
+def read_snapshot_columns(upload, columns=None):
+    """Read whole snapshot columns into a pyarrow Table (memory-mapped)."""
+    return pq.read_table(ensure_snapshot(upload), columns=columns, memory_map=True)
@@ -13,12 +13,42 @@ urlpatterns = [
     # CSV upload and processing
     path('upload/', views.upload_csv, name='upload_csv'),
     
+    # Many CSV files or ZIP archives in one request, parsed in parallel
+    path('upload/batch/', views.upload_batch, name='upload_batch'),
+    
+    # Resumable uploads: start a session, PUT numbered chunks, then finalize
+    path('upload/chunked/', views.start_chunked_upload, name='chunked_upload_start'),
+    path('upload/chunked/<int:session_id>/', views.get_chunked_upload, name='chunked_upload'),
+    path('upload/chunked/<int:session_id>/chunks/<int:index>/', views.put_upload_chunk, name='chunked_upload_chunk'),
+    path('upload/chunked/<int:session_id>/complete/', views.complete_chunked_upload, name='chunked_upload_complete'),
+    
     # Upload history - returns last 5 uploads
     path('history/', views.get_upload_history, name='upload_history'),
     
     # Specific upload details
     path('upload/<int:upload_id>/', views.get_upload_detail, name='upload_detail'),
     
+    # Paginated, filterable records for a single upload
+    path('upload/<int:upload_id>/records/', views.get_upload_records, name='upload_records'),
+    
+    # Precomputed per-column and per-type statistics
+    path('upload/<int:upload_id>/stats/', views.get_upload_statistics, name='upload_statistics'),
+    
+    # Histograms, density grid and downsampled scatter points for charts
+    path('upload/<int:upload_id>/charts/', views.get_upload_charts, name='upload_charts'),
+    
+    # Columnar Parquet export of an upload's records
+    path('upload/<int:upload_id>/export.parquet', views.export_parquet, name='upload_export_parquet'),
+    
+    # Streaming CSV / NDJSON export of an upload's records
+    path('upload/<int:upload_id>/export', views.export_records, name='upload_export'),
+    
+    # Cross-upload trends from day × equipment type rollups
+    path('analytics/', views.get_analytics, name='analytics'),
+    
+    # Background ingestion job progress
+    path('jobs/<int:job_id>/', views.get_job_status, name='job_status'),
+    
     # PDF report generation
     path('report/<int:upload_id>/', views.generate_pdf, name='generate_pdf'),
 ]
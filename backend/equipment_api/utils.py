@@ -1,39 +1,243 @@
 """
 Utility functions for Chemical Equipment Parameter Visualizer
-Includes PDF report generation using ReportLab
+Includes PDF report generation using ReportLab and the on-disk report cache
 """
 
 import os
 import json
+import tempfile
+import time
 from datetime import datetime
+from itertools import islice
 from django.conf import settings
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Frame
+from reportlab.platypus.doctemplate import LayoutError
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
 
-def generate_pdf_report(upload):
+# Bump whenever the report layout changes so cached PDFs are regenerated
+REPORT_VERSION = 1
+
+# Default upper bound for the reports directory when REPORT_CACHE_MAX_SIZE is unset
+DEFAULT_REPORT_CACHE_MAX_SIZE = 200 * 1024 * 1024
+
+# Detail table layout
+DETAIL_HEADER = ['Name', 'Type', 'Flowrate', 'Pressure', 'Temp']
+DETAIL_COLUMN_WIDTHS = [1.5*inch, 1.3*inch, 1.1*inch, 1.1*inch, 1*inch]
+SUMMARY_DETAIL_ROWS = 20
+
+# Full reports: rows per detail page and rows fetched per database round trip
+FULL_REPORT_ROWS_PER_PAGE = 34
+FULL_REPORT_CHUNK_SIZE = 2000
+
+
+def get_reports_dir():
+    """Return the reports directory under MEDIA_ROOT, creating it if needed."""
+    reports_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
+    os.makedirs(reports_dir, exist_ok=True)
+    return reports_dir
+
+
+def get_report_path(upload, full=False):
+    """
+    Return the path of the cached PDF report for an upload, generating it if missing.
+    Uploads are immutable once ingested, so one file per upload and report version is reused.
+    
+    Args:
+        upload: completed EquipmentUpload model instance
+        full: list every record instead of the first 20
+        
+    Returns:
+        str: Path to the cached PDF file
+    """
+    reports_dir = get_reports_dir()
+    variant = '_full' if full else ''
+    pdf_path = os.path.join(reports_dir, f'equipment_report_{upload.id}_v{REPORT_VERSION}{variant}.pdf')
+    
+    if os.path.exists(pdf_path):
+        # Record the access time for LRU eviction without changing Last-Modified
+        os.utime(pdf_path, ns=(time.time_ns(), os.stat(pdf_path).st_mtime_ns))
+        return pdf_path
+    
+    # Build into a temporary file so concurrent readers never see a partial PDF
+    fd, tmp_path = tempfile.mkstemp(suffix='.pdf.tmp', dir=reports_dir)
+    os.close(fd)
+    try:
+        generate_pdf_report(upload, pdf_path=tmp_path, full=full)
+        os.replace(tmp_path, pdf_path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    
+    evict_reports(keep=pdf_path)
+    
+    return pdf_path
+
+
+def evict_reports(keep=None, max_size=None):
+    """
+    Delete least recently used report files until the reports directory fits max_size.
+    
+    Args:
+        keep: path that must not be evicted (the report being served)
+        max_size: size limit in bytes, defaults to settings.REPORT_CACHE_MAX_SIZE
+    """
+    if max_size is None:
+        max_size = getattr(settings, 'REPORT_CACHE_MAX_SIZE', DEFAULT_REPORT_CACHE_MAX_SIZE)
+    
+    reports_dir = get_reports_dir()
+    entries = []
+    total_size = 0
+    for entry in os.scandir(reports_dir):
+        if entry.is_file() and entry.name.endswith('.pdf'):
+            stat = entry.stat()
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total_size += stat.st_size
+    
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        if keep and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(path)
+            total_size -= size
+        except FileNotFoundError:
+            pass
+
+
+def _detail_table(rows, row_padding=6):
+    """Build the styled detail table for a list of rows (header included)."""
+    equipment_table = Table(rows, colWidths=DETAIL_COLUMN_WIDTHS, repeatRows=1)
+    equipment_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fadbd8')),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), row_padding),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), row_padding),
+    ]))
+    return equipment_table
+
+
+def _format_detail_row(name, equipment_type, flowrate, pressure, temperature):
+    """Format one equipment record as a detail table row."""
+    return [
+        name[:20],  # Truncate long names
+        equipment_type[:15],
+        f'{flowrate:.1f}',
+        f'{pressure:.1f}',
+        f'{temperature:.1f}'
+    ]
+
+
+def _iter_detail_rows(upload, chunk_size=FULL_REPORT_CHUNK_SIZE):
+    """Stream formatted detail rows for an upload with a server-side cursor."""
+    records = upload.snapshot_records().order_by('equipment_name', 'id').values_list(
+        'equipment_name', 'equipment_type__name', 'flowrate', 'pressure', 'temperature'
+    )
+    for record in records.iterator(chunk_size=chunk_size):
+        yield _format_detail_row(*record)
+
+
+class _PageWriter:
+    """
+    Flows flowables onto a canvas page by page, splitting them across pages as needed.
+    Unlike SimpleDocTemplate.build it never needs the whole story in memory.
+    """
+    
+    def __init__(self, pdf_path, pagesize=A4):
+        self.canv = canvas.Canvas(pdf_path, pagesize=pagesize)
+        self.pagesize = pagesize
+        self.frame = self._new_frame()
+    
+    def _new_frame(self):
+        # Same one inch margins as SimpleDocTemplate
+        width, height = self.pagesize
+        return Frame(inch, inch, width - 2*inch, height - 2*inch)
+    
+    def new_page(self):
+        self.canv.showPage()
+        self.frame = self._new_frame()
+    
+    def add(self, flowable):
+        pending = [flowable]
+        while pending:
+            current = pending.pop(0)
+            if self.frame.add(current, self.canv, trySplit=1):
+                continue
+            parts = self.frame.split(current, self.canv)
+            if parts:
+                pending[0:0] = parts
+            elif self.frame._atTop:
+                raise LayoutError(f'Flowable {current.identity()} does not fit on an empty page')
+            else:
+                self.new_page()
+                pending.insert(0, current)
+    
+    def save(self):
+        self.canv.save()
+
+
+def _build_full_report(pdf_path, story, upload, footer_text):
+    """
+    Write a report listing every record, one detail table per page.
+    The last story element must be the detail heading. Rows are streamed from the database, so memory stays bounded for any upload size.
+    """
+    writer = _PageWriter(pdf_path)
+    *summary, detail_heading = story
+    for flowable in summary:
+        writer.add(flowable)
+    
+    # The detail section starts on a fresh page
+    writer.new_page()
+    writer.add(detail_heading)
+    
+    rows = _iter_detail_rows(upload)
+    first_page = True
+    while True:
+        page_rows = list(islice(rows, FULL_REPORT_ROWS_PER_PAGE))
+        if not page_rows:
+            break
+        if not first_page:
+            writer.new_page()
+        writer.add(_detail_table([DETAIL_HEADER] + page_rows, row_padding=3))
+        first_page = False
+    
+    writer.add(Spacer(1, 0.3*inch))
+    writer.add(footer_text)
+    writer.save()
+
+
+def generate_pdf_report(upload, pdf_path=None, full=False):
     """
     Generate a comprehensive PDF report for an equipment upload.
     Includes summary statistics, equipment type distribution, and detailed data table.
     
     Args:
         upload: EquipmentUpload model instance
+        pdf_path: destination file, defaults to a timestamped file under MEDIA_ROOT/reports
+        full: list every record (paged through the database) instead of the first 20
         
     Returns:
         str: Path to generated PDF file
     """
     
-    # Create reports directory if it doesn't exist
-    reports_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    # Generate unique filename
-    pdf_filename = f'equipment_report_{upload.id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
-    pdf_path = os.path.join(reports_dir, pdf_filename)
+    if pdf_path is None:
+        # Generate unique filename
+        pdf_filename = f'equipment_report_{upload.id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
+        pdf_path = os.path.join(get_reports_dir(), pdf_filename)
     
     # Create PDF document
     doc = SimpleDocTemplate(pdf_path, pagesize=A4)
@@ -152,49 +356,35 @@ def generate_pdf_report(upload):
     detail_heading = Paragraph("Detailed Equipment Data", heading_style)
     story.append(detail_heading)
     
+    # Footer note
+    footer_text = Paragraph(
+        "This report was generated by the Chemical Equipment Parameter Visualizer system. "
+        "Data accuracy depends on the quality of the uploaded CSV file.",
+        styles['Normal']
+    )
+    
+    if full:
+        # Stream the detail section one table per page
+        _build_full_report(pdf_path, story, upload, footer_text)
+        return pdf_path
+    
     # Get equipment records
-    equipment_records = upload.equipment_records.all()
+    equipment_records = upload.snapshot_records().values_list(
+        'equipment_name', 'equipment_type__name', 'flowrate', 'pressure', 'temperature'
+    )
     
-    equipment_data = [['Name', 'Type', 'Flowrate', 'Pressure', 'Temp']]
+    equipment_data = [DETAIL_HEADER]
     
-    for record in equipment_records[:20]:  # Limit to first 20 records to avoid overly long PDFs
-        equipment_data.append([
-            record.equipment_name[:20],  # Truncate long names
-            record.equipment_type[:15],
-            f'{record.flowrate:.1f}',
-            f'{record.pressure:.1f}',
-            f'{record.temperature:.1f}'
-        ])
+    # Limit to the first records to keep the default report short; use full=True for every row
+    for record in equipment_records[:SUMMARY_DETAIL_ROWS]:
+        equipment_data.append(_format_detail_row(*record))
     
-    if upload.total_equipment_count > 20:
+    if upload.total_equipment_count > SUMMARY_DETAIL_ROWS:
         equipment_data.append(['...', '...', '...', '...', '...'])
-        equipment_data.append([f'Showing 20 of {upload.total_equipment_count} records', '', '', '', ''])
+        equipment_data.append([f'Showing {SUMMARY_DETAIL_ROWS} of {upload.total_equipment_count} records', '', '', '', ''])
     
-    equipment_table = Table(equipment_data, colWidths=[1.5*inch, 1.3*inch, 1.1*inch, 1.1*inch, 1*inch])
-    equipment_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fadbd8')),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-    ]))
-    
-    story.append(equipment_table)
+    story.append(_detail_table(equipment_data))
     story.append(Spacer(1, 0.3*inch))
-    
-    # Footer note
-    footer_text = Paragraph(
-        "This report was generated by the Chemical Equipment Parameter Visualizer system. "
-        "Data accuracy depends on the quality of the uploaded CSV file.",
-        styles['Normal']
-    )
     story.append(footer_text)
     
     # Build PDF
@@ -202,10 +392,3 @@ def generate_pdf_report(upload):
     
     return pdf_path
 
-
-def process_csv_file(csv_file):
-    """
-    Additional CSV processing utility if needed for complex operations.
-    Currently, processing is handled directly in views.py using Pandas.
-    """
-    pass
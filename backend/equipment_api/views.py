@@ -4,22 +4,149 @@ Handles CSV uploads, data processing, statistics calculation, and PDF generation
 """
 
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
-from django.http import FileResponse, HttpResponse
-from .models import EquipmentUpload, EquipmentData
-from .serializers import CSVUploadSerializer, EquipmentUploadSerializer
-from .utils import process_csv_file, generate_pdf_report
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from .models import (
+    ChunkedUpload,
+    DailyTypeRollup,
+    EquipmentUpload,
+    EquipmentStatistics,
+    EquipmentType,
+    IngestionJob,
+)
+from .serializers import (
+    CSVUploadSerializer,
+    EquipmentDataSerializer,
+    EquipmentStatisticsSerializer,
+    EquipmentUploadSerializer,
+    EquipmentUploadSummarySerializer,
+    IngestionJobSerializer,
+)
+from .aggregates import compute_upload_statistics
+from .batch import BatchError, process_batch
+from .caching import cache_response
+from .chunked import (
+    ChunkError,
+    assemble,
+    discard_chunks,
+    missing_chunks,
+    received_chunks,
+    start_session,
+    write_chunk,
+)
+from .charts import (
+    DEFAULT_BINS,
+    DEFAULT_GRID_SIZE,
+    DEFAULT_MAX_POINTS,
+    MAX_BINS,
+    MAX_GRID_SIZE,
+    MAX_MAX_POINTS,
+    SAMPLING_METHODS,
+    build_chart_data,
+)
+from .ingestion import IngestionError, create_upload, find_duplicate_upload, hash_file
+from .jobs import recover_stale_jobs, start_ingestion_job
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    paginate_keyset,
+)
+from .exports import iter_csv_export, iter_ndjson_export
+from .renderers import (
+    ArrowStreamRenderer,
+    CSVExportRenderer,
+    MessagePackRenderer,
+    NDJSONExportRenderer,
+    RECORD_COLUMNS,
+    RecordColumns,
+    wants_columnar,
+)
+from .snapshots import PARQUET_CONTENT_TYPE, ensure_snapshot
+from .utils import REPORT_VERSION, get_report_path
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import BytesIO
 import pandas as pd
-import json
+import os
 import traceback
 
 
+# Upload history paging
+HISTORY_DEFAULT_LIMIT = 5
+HISTORY_MAX_LIMIT = 100
+
+
+def _is_truthy(value):
+    """Interpret a query/form flag such as ?async=true."""
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+
+def _duplicate_upload_response(request, upload):
+    """
+    Describe an existing upload for a repeated file instead of ingesting it again.
+    Uploads still being ingested report their job, like an async upload would.
+    """
+    return _existing_upload_response(request, upload, {
+        'message': 'An identical CSV was already uploaded; returning the existing upload',
+        'duplicate': True,
+        'upload_id': upload.id,
+    })
+
+
+def _existing_upload_response(request, upload, payload):
+    """Add an existing upload (or its running job) to payload, shaped like an upload response."""
+    job = IngestionJob.objects.filter(upload=upload).first()
+    if upload.status != EquipmentUpload.STATUS_COMPLETED and job is not None:
+        payload.update({
+            'job_id': job.id,
+            'status_url': request.build_absolute_uri(reverse('job_status', args=[job.id])),
+            'job': IngestionJobSerializer(job).data
+        })
+        return Response(payload, status=status.HTTP_200_OK)
+    
+    records_included = upload.total_equipment_count <= settings.CSV_UPLOAD_RESPONSE_MAX_RECORDS
+    if records_included:
+        response_serializer = EquipmentUploadSerializer(upload)
+    else:
+        response_serializer = EquipmentUploadSummarySerializer(upload)
+    
+    payload.update({
+        'data': response_serializer.data,
+        'records_included': records_included,
+        'statistics': {
+            'total_equipment': upload.total_equipment_count,
+            'average_pressure': round(upload.average_pressure, 2),
+            'average_temperature': round(upload.average_temperature, 2),
+            'equipment_types': response_serializer.data['equipment_type_distribution_json']
+        }
+    })
+    return Response(payload, status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 def upload_csv(request):
     """
     Handle CSV file upload and process equipment data.
-    Extracts parameters, calculates statistics, and stores in database.
+    The file is read in fixed-size chunks; each chunk is validated, inserted
+    in batches and folded into the statistics, so memory stays flat.
+    
+    With ?async=true the file is stored and ingested by a background worker;
+    the response is 202 with a job id that can be polled at /api/jobs/<id>/.
+    
+    A file identical to an earlier upload (same SHA-256) is not parsed again:
+    the existing upload is returned with 200 and duplicate set. Pass
+    ?force=true to ingest it anyway.
+    
+    With ?delta=true only equipment rows added, changed or removed since the
+    latest upload are stored; reads still return the full set of records.
     
     Expected CSV columns: Equipment Name, Type, Flowrate, Pressure, Temperature
     """
@@ -31,78 +158,70 @@ def upload_csv(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    csv_file = serializer.validated_data['csv_file']
+    return _ingest_csv_file(request, serializer.validated_data['csv_file'])
+
+
+def _ingest_csv_file(request, csv_file, content_hash=None):
+    """
+    Store and ingest a validated CSV file, honouring the async, force and delta
+    options of the request. Shared by direct and chunked uploads; content_hash
+    is computed from the file when the caller does not already know it.
+    """
+    run_async = _is_truthy(request.query_params.get('async', request.data.get('async', '')))
+    force = _is_truthy(request.query_params.get('force', request.data.get('force', '')))
+    delta = _is_truthy(request.query_params.get('delta', request.data.get('delta', '')))
     
     try:
-        # Process CSV using Pandas
-        df = pd.read_csv(csv_file)
-        
-        # Validate required columns
-        required_columns = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            return Response(
-                {'error': f'Missing required columns: {", ".join(missing_columns)}'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Clean data - remove rows with missing values
-        df_clean = df.dropna(subset=required_columns)
-        
-        if len(df_clean) == 0:
+        content_hash = content_hash or hash_file(csv_file)
+        duplicate = None if force else find_duplicate_upload(content_hash)
+        if duplicate is not None:
+            return _duplicate_upload_response(request, duplicate)
+    except Exception as e:
+        print(f"Error checking for duplicate CSV: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Server error while processing CSV: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    if run_async:
+        try:
+            job = start_ingestion_job(csv_file, content_hash=content_hash, delta=delta)
+            return Response({
+                'message': 'CSV accepted for background processing',
+                'job_id': job.id,
+                'upload_id': job.upload_id,
+                'status_url': request.build_absolute_uri(reverse('job_status', args=[job.id])),
+                'job': IngestionJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
+        except Exception as e:
+            print(f"Error queueing CSV ingestion: {traceback.format_exc()}")
             return Response(
-                {'error': 'No valid data rows found in CSV after removing incomplete entries'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'error': f'Server error while queueing CSV: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    try:
+        # Stream the CSV in chunks: rows are inserted and statistics folded per chunk
+        upload, stats = create_upload(csv_file, content_hash=content_hash, delta=delta)
         
-        # Calculate statistics using Pandas
-        total_count = len(df_clean)
-        avg_pressure = float(df_clean['Pressure'].mean())
-        avg_temperature = float(df_clean['Temperature'].mean())
-        
-        # Calculate equipment type distribution
-        type_distribution = df_clean['Type'].value_counts().to_dict()
-        type_distribution_json = json.dumps(type_distribution)
-        
-        # Create EquipmentUpload record
-        upload = EquipmentUpload.objects.create(
-            csv_file=csv_file,
-            total_equipment_count=total_count,
-            average_pressure=avg_pressure,
-            average_temperature=avg_temperature,
-            equipment_type_distribution=type_distribution_json
-        )
-        
-        # Create individual EquipmentData records
-        equipment_records = []
-        for _, row in df_clean.iterrows():
-            equipment_records.append(
-                EquipmentData(
-                    upload=upload,
-                    equipment_name=str(row['Equipment Name']),
-                    equipment_type=str(row['Type']),
-                    flowrate=float(row['Flowrate']),
-                    pressure=float(row['Pressure']),
-                    temperature=float(row['Temperature'])
-                )
-            )
-        
-        # Bulk create for efficiency
-        EquipmentData.objects.bulk_create(equipment_records)
-        
-        # Serialize and return response
-        response_serializer = EquipmentUploadSerializer(upload)
+        # Very large uploads are returned without nested records to keep memory flat
+        records_included = stats.total_count <= settings.CSV_UPLOAD_RESPONSE_MAX_RECORDS
+        if records_included:
+            response_serializer = EquipmentUploadSerializer(upload)
+        else:
+            response_serializer = EquipmentUploadSummarySerializer(upload)
         
         return Response({
             'message': 'CSV processed successfully',
             'data': response_serializer.data,
+            'records_included': records_included,
             'statistics': {
-                'total_equipment': total_count,
-                'average_pressure': round(avg_pressure, 2),
-                'average_temperature': round(avg_temperature, 2),
-                'equipment_types': type_distribution
-            }
+                'total_equipment': stats.total_count,
+                'average_pressure': round(stats.average_pressure, 2),
+                'average_temperature': round(stats.average_temperature, 2),
+                'equipment_types': stats.type_distribution
+            },
+            'delta': stats.delta
         }, status=status.HTTP_201_CREATED)
         
     except pd.errors.EmptyDataError:
@@ -115,6 +234,11 @@ def upload_csv(request):
             {'error': 'Invalid CSV format. Please check the file structure'},
             status=status.HTTP_400_BAD_REQUEST
         )
+    except IngestionError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     except ValueError as e:
         return Response(
             {'error': f'Data validation error: {str(e)}'},
@@ -129,19 +253,277 @@ def upload_csv(request):
         )
 
 
+def _chunked_upload_data(session):
+    """Progress of a chunked upload, used to resume it."""
+    received = received_chunks(session)
+    return {
+        'id': session.id,
+        'filename': session.filename,
+        'size': session.total_size,
+        'chunk_size': session.chunk_size,
+        'total_chunks': session.total_chunks,
+        'received_chunks': len(received),
+        'missing_chunks': missing_chunks(session),
+        'status': session.status,
+        'upload_id': session.upload_id,
+    }
+
+
+@api_view(['POST'])
+def start_chunked_upload(request):
+    """
+    Start a resumable upload of a large CSV.
+    Send filename and size (bytes), optionally chunk_size and sha256 of the whole
+    file. The response gives the chunk size the server picked and the session id;
+    then PUT each chunk's raw bytes to /api/upload/chunked/<id>/chunks/<index>/
+    and POST /api/upload/chunked/<id>/complete/ once all chunks are stored.
+    """
+    filename = str(request.data.get('filename', ''))
+    sha256 = str(request.data.get('sha256', '') or '')
+    
+    try:
+        total_size = _parse_non_negative_int(request.data.get('size'), 'size', default=None)
+        chunk_size = _parse_non_negative_int(request.data.get('chunk_size'), 'chunk_size', default=None)
+        if total_size is None:
+            raise ValueError('size is required')
+        session = start_session(filename, total_size, chunk_size=chunk_size, content_hash=sha256)
+    except ValueError as e:
+        # ChunkError is a ValueError with a client-facing message
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        print(f"Error starting chunked upload: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Server error while starting upload: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    return Response(_chunked_upload_data(session), status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+def get_chunked_upload(request, session_id):
+    """Report which chunks of a chunked upload are stored, so an interrupted client can resume."""
+    try:
+        session = ChunkedUpload.objects.get(id=session_id)
+    except ChunkedUpload.DoesNotExist:
+        return Response(
+            {'error': f'Chunked upload with ID {session_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(_chunked_upload_data(session), status=status.HTTP_200_OK)
+
+
+@api_view(['PUT'])
+def put_upload_chunk(request, session_id, index):
+    """
+    Store one chunk of a chunked upload. The body is the chunk's raw bytes and
+    must be exactly chunk_size long (the last chunk holds the remainder).
+    Chunks can arrive in any order and sending one again replaces it.
+    """
+    try:
+        session = ChunkedUpload.objects.get(id=session_id)
+    except ChunkedUpload.DoesNotExist:
+        return Response(
+            {'error': f'Chunked upload with ID {session_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    if session.status != ChunkedUpload.STATUS_UPLOADING:
+        return Response(
+            {'error': 'This upload has already been finalized', 'upload_id': session.upload_id},
+            status=status.HTTP_409_CONFLICT
+        )
+    
+    try:
+        length = request.META.get('CONTENT_LENGTH')
+        # The body is streamed to disk, never read into memory as a whole
+        written = write_chunk(session, index, request.stream or BytesIO(), int(length) if length else None)
+    except ChunkError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        print(f"Error storing upload chunk: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Server error while storing chunk: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    return Response({'index': index, 'size': written}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def complete_chunked_upload(request, session_id):
+    """
+    Assemble the chunks of a chunked upload into csvs/ and ingest the file.
+    Accepts the async, force and delta options of /api/upload/ and answers like it.
+    Missing chunks are listed with 409; finalizing again after success returns the same upload.
+    """
+    try:
+        session = ChunkedUpload.objects.select_related('upload').get(id=session_id)
+    except ChunkedUpload.DoesNotExist:
+        return Response(
+            {'error': f'Chunked upload with ID {session_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    # A retry after a lost response must not ingest the file twice
+    if session.status == ChunkedUpload.STATUS_COMPLETED and session.upload is not None:
+        return _existing_upload_response(request, session.upload, {
+            'message': 'Chunked upload was already finalized',
+            'upload_id': session.upload_id,
+        })
+    
+    missing = missing_chunks(session)
+    if missing:
+        return Response(
+            {'error': f'{len(missing)} chunks have not been received', 'missing_chunks': missing},
+            status=status.HTTP_409_CONFLICT
+        )
+    
+    # Claim the session so concurrent finalize calls cannot both ingest it
+    claimed = ChunkedUpload.objects.filter(
+        pk=session.pk, status=ChunkedUpload.STATUS_UPLOADING
+    ).update(status=ChunkedUpload.STATUS_ASSEMBLING)
+    if not claimed:
+        return Response(
+            {'error': 'This upload is already being finalized'},
+            status=status.HTTP_409_CONFLICT
+        )
+    
+    response = None
+    try:
+        csv_file, content_hash = assemble(session)
+        try:
+            response = _ingest_csv_file(request, csv_file, content_hash=content_hash)
+        finally:
+            csv_file.close()
+    except ChunkError as e:
+        response = Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        print(f"Error assembling chunked upload: {traceback.format_exc()}")
+        response = Response(
+            {'error': f'Server error while assembling upload: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    if response.status_code >= 400:
+        # Keep the chunks so the client can fix the cause and finalize again
+        ChunkedUpload.objects.filter(pk=session.pk).update(status=ChunkedUpload.STATUS_UPLOADING)
+        return response
+    
+    upload_id = response.data.get('upload_id') or response.data['data']['id']
+    ChunkedUpload.objects.filter(pk=session.pk).update(status=ChunkedUpload.STATUS_COMPLETED, upload_id=upload_id)
+    discard_chunks(session)
+    return response
+
+
+@api_view(['POST'])
+def upload_batch(request):
+    """
+    Upload many CSV files in one request.
+    Send files as repeated 'files' form fields; ZIP archives are expanded into
+    their member files. Files are parsed in parallel on a process pool and each
+    is ingested in its own transaction, so the response reports a result per file:
+    created (with the new upload id), duplicate or failed (with an error).
+    
+    Identical files are deduplicated as in upload_csv unless ?force=true.
+    """
+    uploaded_files = request.FILES.getlist('files') + request.FILES.getlist('csv_file')
+    if not uploaded_files:
+        return Response(
+            {'error': "No files provided. Send CSV or ZIP files in the 'files' field"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    force = _is_truthy(request.query_params.get('force', request.data.get('force', '')))
+    
+    try:
+        results = process_batch(uploaded_files, force=force)
+    except BatchError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        print(f"Error processing CSV batch: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Server error while processing CSV batch: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    summary = {outcome: 0 for outcome in ('created', 'duplicate', 'failed')}
+    for result in results:
+        summary[result['status']] += 1
+    
+    return Response({
+        'message': f"{summary['created']} of {len(results)} files processed",
+        'summary': summary,
+        'results': results
+    }, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+
+
+def _parse_non_negative_int(value, name, default, maximum=None):
+    """
+    Parse an integer query parameter, clamping it to an optional maximum.
+    Raises ValueError with a client-facing message for invalid input.
+    """
+    if value in (None, ''):
+        return default
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+    if parsed < 0:
+        raise ValueError(f'{name} must not be negative')
+    if maximum is not None:
+        parsed = min(parsed, maximum)
+    return parsed
+
+
+@cache_response()
 @api_view(['GET'])
 def get_upload_history(request):
     """
-    Retrieve the last 5 CSV uploads with their metadata and statistics.
-    Returns upload history in reverse chronological order.
+    Retrieve recent CSV uploads with their metadata and statistics.
+    Returns upload history in reverse chronological order. Rendered responses are
+    cached until an upload changes and carry an ETag, so unchanged polls receive 304.
+    
+    Query parameters:
+        limit: number of uploads to return (default 5, max HISTORY_MAX_LIMIT)
+        offset: number of uploads to skip (default 0)
+        include=records: nest every equipment record (prefetched in one query)
+        fields: comma-separated list of upload fields to return
     """
     try:
-        # Get last 5 uploads (already ordered by -uploaded_at in model Meta)
-        recent_uploads = EquipmentUpload.objects.all()[:5]
-        serializer = EquipmentUploadSerializer(recent_uploads, many=True)
+        limit = _parse_non_negative_int(
+            request.query_params.get('limit'), 'limit',
+            default=HISTORY_DEFAULT_LIMIT, maximum=HISTORY_MAX_LIMIT
+        )
+        offset = _parse_non_negative_int(request.query_params.get('offset'), 'offset', default=0)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        include = {item.strip() for item in request.query_params.get('include', '').split(',') if item.strip()}
+        fields = request.query_params.get('fields')
+        fields = [item.strip() for item in fields.split(',') if item.strip()] if fields else None
+        
+        include_records = 'records' in include or (fields is not None and 'equipment_records' in fields)
+        
+        # Already ordered by -uploaded_at in model Meta
+        queryset = EquipmentUpload.objects.all()
+        if include_records:
+            # One extra query for all records instead of one per upload
+            queryset = queryset.prefetch_related('equipment_records')
+            serializer_class = EquipmentUploadSerializer
+        else:
+            serializer_class = EquipmentUploadSummarySerializer
+        
+        recent_uploads = queryset[offset:offset + limit]
+        serializer = serializer_class(recent_uploads, many=True, fields=fields)
         
         return Response({
             'count': len(serializer.data),
+            'total': EquipmentUpload.objects.count(),
+            'limit': limit,
+            'offset': offset,
             'history': serializer.data
         }, status=status.HTTP_200_OK)
         
@@ -153,13 +535,33 @@ def get_upload_history(request):
         )
 
 
+# JSON stays the default; Arrow and MessagePack are chosen through the Accept header or ?format=
+RECORD_RENDERERS = [JSONRenderer, BrowsableAPIRenderer, ArrowStreamRenderer, MessagePackRenderer]
+
+
+def _is_completed_upload(response):
+    """Pending and processing uploads still change, so only completed ones are cached."""
+    return response.data.get('status') == EquipmentUpload.STATUS_COMPLETED
+
+
+@cache_response(per_upload=True, cacheable=_is_completed_upload)
 @api_view(['GET'])
+@renderer_classes(RECORD_RENDERERS)
 def get_upload_detail(request, upload_id):
     """
     Retrieve detailed information for a specific upload including all equipment records.
+    Arrow and MessagePack responses carry the records column-wise, read with values_list.
     """
     try:
         upload = EquipmentUpload.objects.get(id=upload_id)
+        
+        if wants_columnar(request):
+            data = EquipmentUploadSummarySerializer(upload).data
+            data['equipment_records'] = RecordColumns(
+                upload.snapshot_records().order_by('equipment_name').values_list(*RECORD_COLUMNS)
+            )
+            return Response(data, status=status.HTTP_200_OK)
+        
         serializer = EquipmentUploadSerializer(upload)
         
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -177,25 +579,478 @@ def get_upload_detail(request, upload_id):
         )
 
 
+# Numeric columns that accept <column>_min / <column>_max range filters
+RANGE_FILTER_FIELDS = ['flowrate', 'pressure', 'temperature']
+
+
+def _filter_records(queryset, params):
+    """
+    Apply equipment_type and numeric range filters from query parameters.
+    Raises ValueError with a client-facing message for invalid values.
+    """
+    equipment_types = [item.strip() for item in params.get('equipment_type', '').split(',') if item.strip()]
+    if equipment_types:
+        # Filter on type ids so the (upload, equipment_type) index is used
+        queryset = queryset.filter(equipment_type__in=EquipmentType.objects.filter(name__in=equipment_types))
+    
+    for field in RANGE_FILTER_FIELDS:
+        for suffix, lookup in (('min', 'gte'), ('max', 'lte')):
+            param = f'{field}_{suffix}'
+            value = params.get(param)
+            if value in (None, ''):
+                continue
+            try:
+                queryset = queryset.filter(**{f'{field}__{lookup}': float(value)})
+            except ValueError:
+                raise ValueError(f'{param} must be a number')
+    
+    return queryset
+
+
+@api_view(['GET'])
+@renderer_classes(RECORD_RENDERERS)
+def get_upload_records(request, upload_id):
+    """
+    Retrieve one page of equipment records for an upload using keyset pagination.
+    
+    Query parameters:
+        page_size: records per page (default 100, max 1000)
+        cursor: next_cursor value from the previous page
+        ordering: equipment_name, flowrate, pressure, temperature or id (prefix - for descending)
+        equipment_type: exact type, or a comma-separated list of types
+        flowrate_min/max, pressure_min/max, temperature_min/max: inclusive ranges
+    """
+    upload = EquipmentUpload.objects.filter(id=upload_id).first()
+    if upload is None:
+        return Response(
+            {'error': f'Upload with ID {upload_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    try:
+        page_size = _parse_non_negative_int(
+            request.query_params.get('page_size'), 'page_size',
+            default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE
+        ) or DEFAULT_PAGE_SIZE
+        ordering = request.query_params.get('ordering')
+        queryset = _filter_records(upload.snapshot_records(), request.query_params)
+        records, next_cursor = paginate_keyset(
+            queryset,
+            ordering=ordering,
+            cursor=request.query_params.get('cursor'),
+            page_size=page_size,
+            values=list(RECORD_COLUMNS) if wants_columnar(request) else None
+        )
+    except ValueError as e:
+        # InvalidCursor is a ValueError as well
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        next_url = None
+        if next_cursor:
+            params = request.query_params.copy()
+            params['cursor'] = next_cursor
+            next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+        
+        if wants_columnar(request):
+            results = RecordColumns(records)
+        else:
+            results = EquipmentDataSerializer(records, many=True).data
+        
+        return Response({
+            'upload_id': upload_id,
+            'ordering': ordering or 'equipment_name',
+            'page_size': page_size,
+            'count': len(results),
+            'next_cursor': next_cursor,
+            'next': next_url,
+            'results': results
+        }, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        print(f"Error fetching upload records: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Error retrieving upload records: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@cache_response(per_upload=True)
 @api_view(['GET'])
+def get_upload_statistics(request, upload_id):
+    """
+    Retrieve precomputed statistics for an upload.
+    Per-column and per-type count, mean, std, min, max and p50/p95/p99 are read
+    from a single row; uploads ingested before statistics existed are backfilled once.
+    """
+    try:
+        try:
+            statistics = EquipmentStatistics.objects.get(upload_id=upload_id)
+        except EquipmentStatistics.DoesNotExist:
+            upload = EquipmentUpload.objects.get(id=upload_id)
+            if upload.status != EquipmentUpload.STATUS_COMPLETED:
+                return Response(
+                    {'error': f'Upload with ID {upload_id} is {upload.status}; statistics are available once ingestion completes'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            statistics = compute_upload_statistics(upload)
+        
+        serializer = EquipmentStatisticsSerializer(statistics)
+        
+        return Response(serializer.data, status=status.HTTP_200_OK)
+        
+    except EquipmentUpload.DoesNotExist:
+        return Response(
+            {'error': f'Upload with ID {upload_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        print(f"Error fetching upload statistics: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Error retrieving upload statistics: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@cache_response(per_upload=True)
+@api_view(['GET'])
+def get_upload_charts(request, upload_id):
+    """
+    Retrieve fixed-size chart data for an upload, computed from its snapshot:
+    flowrate/pressure/temperature histograms, a pressure x temperature density
+    grid and downsampled pressure/temperature scatter points.
+    
+    Query parameters:
+        bins: histogram bins per column (default 30, max 500)
+        grid_size: density grid bins per axis (default 50, max 200)
+        max_points: scatter points returned (default 2000, max 50000)
+        sampling: lttb (default) or stratified (proportional per equipment type)
+    """
+    try:
+        bins = _parse_non_negative_int(
+            request.query_params.get('bins'), 'bins', default=DEFAULT_BINS, maximum=MAX_BINS
+        ) or DEFAULT_BINS
+        grid_size = _parse_non_negative_int(
+            request.query_params.get('grid_size'), 'grid_size', default=DEFAULT_GRID_SIZE, maximum=MAX_GRID_SIZE
+        ) or DEFAULT_GRID_SIZE
+        max_points = _parse_non_negative_int(
+            request.query_params.get('max_points'), 'max_points', default=DEFAULT_MAX_POINTS, maximum=MAX_MAX_POINTS
+        ) or DEFAULT_MAX_POINTS
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    sampling = request.query_params.get('sampling', 'lttb')
+    if sampling not in SAMPLING_METHODS:
+        return Response(
+            {'error': f"sampling must be one of: {', '.join(SAMPLING_METHODS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        upload = EquipmentUpload.objects.get(id=upload_id)
+        if upload.status != EquipmentUpload.STATUS_COMPLETED:
+            return Response(
+                {'error': f'Upload with ID {upload_id} is {upload.status}; charts are available once ingestion completes'},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        data = build_chart_data(upload, bins=bins, grid_size=grid_size, max_points=max_points, method=sampling)
+        
+        return Response(data, status=status.HTTP_200_OK)
+        
+    except EquipmentUpload.DoesNotExist:
+        return Response(
+            {'error': f'Upload with ID {upload_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        print(f"Error computing chart data: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Error computing chart data: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+def export_parquet(request, upload_id):
+    """
+    Download an upload's records as a Parquet file.
+    The snapshot written at ingestion is streamed from disk; uploads ingested
+    before snapshots existed get one built from their records on first request.
+    """
+    try:
+        upload = EquipmentUpload.objects.get(id=upload_id)
+        if upload.status != EquipmentUpload.STATUS_COMPLETED:
+            return Response(
+                {'error': f'Upload with ID {upload_id} is {upload.status}; the export is available once ingestion completes'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return FileResponse(
+            open(ensure_snapshot(upload), 'rb'),
+            as_attachment=True,
+            filename=f'equipment_upload_{upload_id}.parquet',
+            content_type=PARQUET_CONTENT_TYPE
+        )
+
+    except EquipmentUpload.DoesNotExist:
+        return Response(
+            {'error': f'Upload with ID {upload_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        print(f"Error exporting upload: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Error exporting upload: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+# Streaming export formats: (row generator, file extension); CSV is the default
+EXPORT_FORMATS = {
+    'csv': (iter_csv_export, 'csv'),
+    'ndjson': (iter_ndjson_export, 'ndjson'),
+}
+
+
+@api_view(['GET'])
+@renderer_classes([CSVExportRenderer, NDJSONExportRenderer])
+def export_records(request, upload_id):
+    """
+    Stream every record of an upload as CSV or newline-delimited JSON.
+    Rows are read with a server-side cursor and sent in small encoded batches,
+    so the first bytes go out immediately and memory does not grow with the upload.
+    
+    Query parameters:
+        format: csv (default) or ndjson; the Accept header is honoured as well
+    """
+    try:
+        upload = EquipmentUpload.objects.get(id=upload_id)
+        if upload.status != EquipmentUpload.STATUS_COMPLETED:
+            return Response(
+                {'error': f'Upload with ID {upload_id} is {upload.status}; the export is available once ingestion completes'},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        renderer = request.accepted_renderer
+        iter_export, extension = EXPORT_FORMATS[renderer.format]
+        response = StreamingHttpResponse(
+            iter_export(upload.snapshot_records()),
+            content_type=renderer.media_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="equipment_upload_{upload_id}.{extension}"'
+        return response
+        
+    except EquipmentUpload.DoesNotExist:
+        return Response(
+            {'error': f'Upload with ID {upload_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        print(f"Error exporting upload: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Error exporting upload: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+# Default analytics window when no start date is given
+ANALYTICS_DEFAULT_DAYS = 365
+
+
+def _parse_date(value, name, default):
+    """Parse a YYYY-MM-DD query parameter."""
+    if value in (None, ''):
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a date in YYYY-MM-DD format')
+
+
+def _average(total, count):
+    return total / count if count else None
+
+
+@api_view(['GET'])
+def get_analytics(request):
+    """
+    Fleet-wide trends across uploads, read from the day × equipment type rollups.
+    
+    Query parameters:
+        start, end: inclusive date range in YYYY-MM-DD (default: the last 365 days)
+        equipment_type: limit to one type, or a comma-separated list of types
+    """
+    try:
+        end = _parse_date(request.query_params.get('end'), 'end', default=timezone.localdate())
+        start = _parse_date(
+            request.query_params.get('start'), 'start',
+            default=end - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
+        )
+        if start > end:
+            raise ValueError('start must not be after end')
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        rollups = DailyTypeRollup.objects.filter(date__range=(start, end))
+        equipment_types = [
+            item.strip() for item in request.query_params.get('equipment_type', '').split(',') if item.strip()
+        ]
+        if equipment_types:
+            rollups = rollups.filter(equipment_type__in=equipment_types)
+        
+        by_type = []
+        type_totals = {}
+        daily_totals = {}
+        for rollup in rollups.order_by('date', 'equipment_type'):
+            by_type.append({
+                'date': rollup.date,
+                'equipment_type': rollup.equipment_type,
+                'upload_count': rollup.upload_count,
+                'record_count': rollup.record_count,
+                'average_flowrate': _average(rollup.flowrate_sum, rollup.record_count),
+                'average_pressure': _average(rollup.pressure_sum, rollup.record_count),
+                'average_temperature': _average(rollup.temperature_sum, rollup.record_count),
+            })
+            for totals, key in ((type_totals, rollup.equipment_type), (daily_totals, rollup.date)):
+                entry = totals.setdefault(key, {'record_count': 0, 'flowrate_sum': 0.0, 'pressure_sum': 0.0, 'temperature_sum': 0.0})
+                entry['record_count'] += rollup.record_count
+                entry['flowrate_sum'] += rollup.flowrate_sum
+                entry['pressure_sum'] += rollup.pressure_sum
+                entry['temperature_sum'] += rollup.temperature_sum
+        
+        # Upload counts per day come from the (small) upload table itself
+        uploads_per_day = dict(
+            EquipmentUpload.objects
+            .filter(status=EquipmentUpload.STATUS_COMPLETED, uploaded_at__date__range=(start, end))
+            .annotate(day=TruncDate('uploaded_at'))
+            .values('day')
+            .annotate(count=Count('id'))
+            .order_by()
+            .values_list('day', 'count')
+        )
+        
+        def summarize(entry):
+            return {
+                'record_count': entry['record_count'],
+                'average_flowrate': _average(entry['flowrate_sum'], entry['record_count']),
+                'average_pressure': _average(entry['pressure_sum'], entry['record_count']),
+                'average_temperature': _average(entry['temperature_sum'], entry['record_count']),
+            }
+        
+        return Response({
+            'start': start,
+            'end': end,
+            'daily': [
+                {'date': day, 'upload_count': uploads_per_day.get(day, 0), **summarize(entry)}
+                for day, entry in sorted(daily_totals.items())
+            ],
+            'by_type': by_type,
+            'types': [
+                {'equipment_type': equipment_type, **summarize(entry)}
+                for equipment_type, entry in sorted(type_totals.items(), key=lambda item: -item[1]['record_count'])
+            ]
+        }, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        print(f"Error fetching analytics: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Error retrieving analytics: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+def get_job_status(request, job_id):
+    """
+    Report progress of a background ingestion job.
+    Includes the current phase, rows processed so far and any error.
+    A job orphaned by a server restart is requeued (or failed) before it is reported.
+    """
+    try:
+        recover_stale_jobs(job_ids=[job_id])
+        job = IngestionJob.objects.select_related('upload').get(id=job_id)
+        serializer = IngestionJobSerializer(job)
+        
+        return Response(serializer.data, status=status.HTTP_200_OK)
+        
+    except IngestionJob.DoesNotExist:
+        return Response(
+            {'error': f'Job with ID {job_id} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        print(f"Error fetching job status: {traceback.format_exc()}")
+        return Response(
+            {'error': f'Error retrieving job status: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _wants_full_report(request):
+    return _is_truthy(request.GET.get('full', ''))
+
+
+def _report_stat(request, upload_id):
+    """
+    Stat the cached PDF report for a completed upload, generating it if needed.
+    Returns None when no report can be served so the view reports the error.
+    """
+    try:
+        upload = EquipmentUpload.objects.get(id=upload_id, status=EquipmentUpload.STATUS_COMPLETED)
+        return os.stat(get_report_path(upload, full=_wants_full_report(request)))
+    except Exception:
+        return None
+
+
+def _report_etag(request, upload_id):
+    report_stat = _report_stat(request, upload_id)
+    if report_stat is None:
+        return None
+    variant = 'full' if _wants_full_report(request) else 'summary'
+    return f'report-{upload_id}-v{REPORT_VERSION}-{variant}-{report_stat.st_mtime_ns:x}'
+
+
+def _report_last_modified(request, upload_id):
+    report_stat = _report_stat(request, upload_id)
+    if report_stat is None:
+        return None
+    return datetime.fromtimestamp(report_stat.st_mtime, tz=dt_timezone.utc)
+
+
+@api_view(['GET'])
+@condition(etag_func=_report_etag, last_modified_func=_report_last_modified)
 def generate_pdf(request, upload_id):
     """
-    Generate and return a PDF report for a specific equipment upload.
-    Report includes summary statistics and equipment data visualization.
+    Return the PDF report for a specific equipment upload.
+    Reports are generated once per upload and report version, then served from
+    the on-disk cache with ETag/Last-Modified so conditional GETs receive 304.
+    
+    With ?full=true the report lists every record instead of the first 20.
     """
     try:
         upload = EquipmentUpload.objects.get(id=upload_id)
         
-        # Generate PDF using utility function
-        pdf_path = generate_pdf_report(upload)
+        if upload.status != EquipmentUpload.STATUS_COMPLETED:
+            return Response(
+                {'error': f'Upload with ID {upload_id} is {upload.status}; reports are available once ingestion completes'},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        # Reuse the cached report, generating it on first request
+        pdf_path = get_report_path(upload, full=_wants_full_report(request))
         
         # Return PDF file as response
-        return FileResponse(
+        response = FileResponse(
             open(pdf_path, 'rb'),
             content_type='application/pdf',
             as_attachment=True,
             filename=f'equipment_report_{upload_id}.pdf'
         )
+        # Clients may keep the file but must revalidate with the ETag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
         
     except EquipmentUpload.DoesNotExist:
         return Response(
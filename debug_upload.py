@@ -1,10 +1,46 @@
+import hashlib
+import os
+import sys
 import requests
 
-url = 'http://localhost:8000/api/upload/'
-files = {'csv_file': open('test_upload.csv', 'rb')}
+base_url = 'http://localhost:8000/api'
+file_path = sys.argv[1] if len(sys.argv) > 1 else 'test_upload.csv'
+# Pass the session id printed by an interrupted run to resume it
+session_id = sys.argv[2] if len(sys.argv) > 2 else None
+chunk_size = 1024 * 1024
 
 try:
-    response = requests.post(url, files=files)
+    size = os.path.getsize(file_path)
+    session = requests.Session()
+
+    if session_id:
+        state = session.get(f'{base_url}/upload/chunked/{session_id}/').json()
+    else:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(chunk_size), b''):
+                digest.update(block)
+        state = session.post(f'{base_url}/upload/chunked/', json={
+            'filename': os.path.basename(file_path),
+            'size': size,
+            'chunk_size': chunk_size,
+            'sha256': digest.hexdigest()
+        }).json()
+    print(f"Upload session: {state}")
+
+    session_id, chunk_size = state['id'], state['chunk_size']
+    with open(file_path, 'rb') as f:
+        for index in state['missing_chunks']:
+            f.seek(index * chunk_size)
+            response = session.put(
+                f'{base_url}/upload/chunked/{session_id}/chunks/{index}/',
+                data=f.read(chunk_size),
+                headers={'Content-Type': 'application/octet-stream'}
+            )
+            response.raise_for_status()
+            print(f"Chunk {index + 1}/{state['total_chunks']} sent")
+
+    response = session.post(f'{base_url}/upload/chunked/{session_id}/complete/')
     print(f"Status Code: {response.status_code}")
     print("Response Body:")
     print(response.text)
@@ -0,0 +1,415 @@
+"""
+API client for the Chemical Equipment Parameter Visualizer desktop app
+Runs HTTP requests on a worker pool with keep-alive sessions, retries and timeouts, reporting progress and honouring cancellation
+"""
+
+import hashlib
+import json
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
+
+
+# Seconds to wait for a connection and between bytes of a response
+DEFAULT_TIMEOUT = (5, 60)
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 3
+# Bytes read per iteration; progress and cancellation are checked between chunks
+CHUNK_SIZE = 64 * 1024
+# Chunk size asked for in resumable uploads; an interrupted upload loses at most one chunk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class RequestCancelled(Exception):
+    """Raised inside a worker when its task has been cancelled."""
+
+
+class ApiResult:
+    """Status, headers and body of a completed response."""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self._json = None
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        if self._json is None:
+            self._json = json.loads(self.content)
+        return self._json
+
+    def error_message(self, default):
+        """The API's {'error': ...} message, or default when the body has none."""
+        try:
+            return self.json().get('error', default)
+        except (ValueError, AttributeError):
+            return default
+
+
+class ApiTaskSignals(QObject):
+    """
+    Signals of an ApiTask. They are emitted from a worker thread and delivered
+    on the GUI thread, because this object is created there.
+    """
+    progress = pyqtSignal(int, int)   # bytes transferred, total bytes (0 when unknown)
+    finished = pyqtSignal(object)     # ApiResult, also for HTTP error statuses
+    failed = pyqtSignal(str)          # network error or timeout after retries
+    cancelled = pyqtSignal()
+    done = pyqtSignal()               # after any of the above
+
+
+class ApiTask(QRunnable):
+    """One HTTP request executed on the client's thread pool."""
+
+    def __init__(self, client, method, path, params=None, headers=None,
+                 destination=None, upload=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ApiTaskSignals()
+        self._client = client
+        self._method = method
+        self._path = path
+        self._params = params
+        self._headers = headers or {}
+        self._destination = destination
+        self._upload = upload
+        self._cancel_event = threading.Event()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Stop the task at the next chunk boundary; queued tasks never start."""
+        self._cancel_event.set()
+
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise RequestCancelled()
+
+    def run(self):
+        try:
+            self._check_cancelled()
+            if self._upload is not None:
+                result = self._send_file()
+            else:
+                result = self._receive()
+        except RequestCancelled:
+            self.signals.cancelled.emit()
+        except requests.RequestException as e:
+            self.signals.failed.emit(f'Could not reach the server: {e}')
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+    def _receive(self):
+        """Stream the response body into memory or into the destination file."""
+        response = self._client.session().request(
+            self._method,
+            self._client.url(self._path),
+            params=self._params,
+            headers=self._headers,
+            timeout=self._client.timeout,
+            stream=True
+        )
+        with response:
+            total = int(response.headers.get('Content-Length') or 0)
+            # Error bodies are small JSON messages; only successful bodies go to disk
+            to_file = self._destination is not None and response.status_code == 200
+            partial_path = f'{self._destination}.part' if to_file else None
+            chunks = []
+            received = 0
+
+            try:
+                target = open(partial_path, 'wb') if to_file else None
+                try:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        self._check_cancelled()
+                        if target is not None:
+                            target.write(chunk)
+                        else:
+                            chunks.append(chunk)
+                        received += len(chunk)
+                        self.signals.progress.emit(received, total)
+                finally:
+                    if target is not None:
+                        target.close()
+            except BaseException:
+                if partial_path and os.path.exists(partial_path):
+                    os.remove(partial_path)
+                raise
+
+            if to_file:
+                # Only a complete download replaces the destination
+                os.replace(partial_path, self._destination)
+            result = ApiResult(response.status_code, dict(response.headers), b''.join(chunks))
+
+        # Decode JSON here so multi-MB payloads are not parsed on the GUI thread
+        if result.content and 'json' in result.headers.get('Content-Type', ''):
+            try:
+                result.json()
+            except ValueError:
+                pass
+        return result
+
+    def _send_file(self):
+        """Post a file as multipart form data."""
+        field, file_path = self._upload
+        total = os.path.getsize(file_path)
+        self.signals.progress.emit(0, total)
+        with open(file_path, 'rb') as f:
+            response = self._client.session().request(
+                self._method,
+                self._client.url(self._path),
+                params=self._params,
+                headers=self._headers,
+                files={field: f},
+                timeout=self._client.timeout
+            )
+        self._check_cancelled()
+        self.signals.progress.emit(total, total)
+        return ApiResult(response.status_code, dict(response.headers), response.content)
+
+
+class ChunkedUploadTask(ApiTask):
+    """
+    Resumable upload of a file through /upload/chunked/.
+
+    The file is read from disk one chunk at a time and each chunk is PUT on its
+    own, so progress is reported per chunk and a dropped connection only repeats
+    the chunk in flight. The server's session id is remembered in sessions
+    (see LocalCache), keyed by server, path, size and modification time; uploading
+    the same file again asks the server which chunks are missing and sends only those.
+    """
+
+    def __init__(self, client, file_path, params=None, sessions=None):
+        super().__init__(client, 'POST', '/upload/chunked/', params=params)
+        self._file_path = file_path
+        self._sessions = sessions
+
+    def run(self):
+        try:
+            self._check_cancelled()
+            result = self._upload_chunks()
+        except RequestCancelled:
+            self.signals.cancelled.emit()
+        except requests.RequestException as e:
+            self.signals.failed.emit(f'Could not reach the server (the upload can be resumed): {e}')
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+    def _request(self, method, path, **kwargs):
+        return self._client.session().request(
+            method, self._client.url(path), timeout=self._client.timeout, **kwargs
+        )
+
+    def _file_key(self, size):
+        stat = os.stat(self._file_path)
+        return f'{self._client.base_url}|{os.path.abspath(self._file_path)}|{size}|{stat.st_mtime_ns}'
+
+    def _sha256(self):
+        digest = hashlib.sha256()
+        with open(self._file_path, 'rb') as f:
+            for block in iter(lambda: f.read(CHUNK_SIZE * 16), b''):
+                self._check_cancelled()
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _resume_state(self, key):
+        """Progress of a remembered session, or None when it cannot be resumed."""
+        session_id = self._sessions.upload_session(key) if self._sessions else None
+        if session_id is None:
+            return None
+        response = self._request('GET', f'/upload/chunked/{session_id}/')
+        if response.status_code == 200:
+            return response.json()
+        # Expired or unknown on the server: start over
+        self._sessions.forget_upload_session(key)
+        return None
+
+    def _upload_chunks(self):
+        total = os.path.getsize(self._file_path)
+        key = self._file_key(total)
+        # Busy indicator while the session is looked up or the file is hashed
+        self.signals.progress.emit(0, 0)
+
+        state = self._resume_state(key)
+        if state is None:
+            response = self._request('POST', '/upload/chunked/', json={
+                'filename': os.path.basename(self._file_path),
+                'size': total,
+                'chunk_size': UPLOAD_CHUNK_SIZE,
+                'sha256': self._sha256(),
+            })
+            if response.status_code != 201:
+                return ApiResult(response.status_code, dict(response.headers), response.content)
+            state = response.json()
+            if self._sessions:
+                self._sessions.remember_upload_session(key, state['id'])
+
+        session_id, chunk_size = state['id'], state['chunk_size']
+        missing = state['missing_chunks']
+        sent = total - sum(min(chunk_size, total - index * chunk_size) for index in missing)
+        self.signals.progress.emit(sent, total)
+
+        with open(self._file_path, 'rb') as f:
+            for index in missing:
+                self._check_cancelled()
+                f.seek(index * chunk_size)
+                data = f.read(chunk_size)
+                response = self._request(
+                    'PUT', f'/upload/chunked/{session_id}/chunks/{index}/',
+                    data=data, headers={'Content-Type': 'application/octet-stream'}
+                )
+                if response.status_code != 200:
+                    return ApiResult(response.status_code, dict(response.headers), response.content)
+                sent += len(data)
+                self.signals.progress.emit(sent, total)
+
+        self._check_cancelled()
+        response = self._request('POST', f'/upload/chunked/{session_id}/complete/', params=self._params)
+        if response.status_code < 400 and self._sessions:
+            self._sessions.forget_upload_session(key)
+        return ApiResult(response.status_code, dict(response.headers), response.content)
+
+
+class CallTask(QRunnable):
+    """A plain function call on the client's thread pool, e.g. disk I/O for a response."""
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ApiTaskSignals()
+        self._func = func
+        self._args = args
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Skip the call if it has not started yet."""
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            if self._cancel_event.is_set():
+                self.signals.cancelled.emit()
+                return
+            result = self._func(*self._args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class ApiClient(QObject):
+    """
+    Shared entry point for every request the desktop app makes.
+
+    Requests run on a QThreadPool so the GUI thread never blocks. Each worker
+    thread keeps its own requests.Session (sessions are not thread-safe), so
+    connections stay alive between requests. Idempotent requests are retried
+    with backoff on connection errors and 502/503/504 responses.
+    """
+
+    def __init__(self, base_url, max_workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, parent=None):
+        super().__init__(parent)
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._retries = retries
+        self._local = threading.local()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers)
+        # Tasks are referenced until their last signal has been delivered
+        self._tasks = set()
+
+    def url(self, path):
+        return f'{self.base_url}/{path.lstrip("/")}'
+
+    def session(self):
+        """The calling worker thread's session, created on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            retry = Retry(
+                total=self._retries,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                # POST is not retried: a lost response may still have created an upload
+                allowed_methods=frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS']),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _submit(self, task):
+        self._tasks.add(task)
+        task.signals.done.connect(self._on_task_done)
+        self._pool.start(task)
+        return task
+
+    @pyqtSlot()
+    def _on_task_done(self):
+        signals = self.sender()
+        for task in [task for task in self._tasks if task.signals is signals]:
+            # Release on the next event loop pass, not while its signal is being delivered
+            QTimer.singleShot(0, lambda task=task: self._tasks.discard(task))
+
+    def get(self, path, params=None, headers=None):
+        """GET a resource into memory. Returns the running ApiTask."""
+        return self._submit(ApiTask(self, 'GET', path, params=params, headers=headers))
+
+    def download(self, path, destination, params=None, headers=None):
+        """
+        GET a resource straight into a file. The body is written to
+        destination + '.part' and renamed once complete.
+        """
+        return self._submit(
+            ApiTask(self, 'GET', path, params=params, headers=headers, destination=destination)
+        )
+
+    def upload_file(self, path, file_path, field='csv_file', params=None):
+        """POST a file as multipart form data."""
+        return self._submit(
+            ApiTask(self, 'POST', path, params=params, upload=(field, file_path))
+        )
+
+    def upload_chunked(self, file_path, params=None, sessions=None):
+        """
+        Upload a file in resumable chunks. sessions remembers unfinished uploads
+        so a later call for the same file continues where this one stopped.
+        """
+        return self._submit(ChunkedUploadTask(self, file_path, params=params, sessions=sessions))
+
+    def call(self, func, *args):
+        """Run func(*args) on the pool; finished carries its return value."""
+        return self._submit(CallTask(func, *args))
+
+    def cancel_all(self):
+        """Cancel every queued and running task."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def shutdown(self, wait_ms=5000):
+        """Cancel outstanding work and wait for the workers to finish."""
+        self.cancel_all()
+        self._pool.clear()
+        self._pool.waitForDone(wait_ms)
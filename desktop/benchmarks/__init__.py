@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks for the Chemical Equipment Parameter Visualizer desktop app
+Run from the desktop directory, e.g. python -m benchmarks.bench_table_model
+"""
@@ -0,0 +1,97 @@
+"""
+Benchmark the pressure vs temperature scatter plot
+Compares clearing the axes and drawing a new scatter with ScatterChartEngine updates (full redraw and blit)
+and with repainting unchanged data, which is what has to fit in one frame
+
+Usage: python -m benchmarks.bench_chart_render [points ...]
+Set QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+# One frame at 60 Hz
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def make_points(count, seed):
+    rng = np.random.default_rng(seed)
+    return rng.normal(8, 2, count), rng.normal(140, 25, count)
+
+
+def best_of(func, repeat=3):
+    """Fastest of repeat calls in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main(point_counts):
+    from PyQt5.QtWidgets import QApplication
+    from chart_engine import DEFAULT_DENSITY_THRESHOLD, MatplotlibCanvas, ScatterChartEngine
+
+    app = QApplication([])
+    print(f'density image above {DEFAULT_DENSITY_THRESHOLD:,} points; frame budget {FRAME_BUDGET_MS:.1f} ms')
+    print(f'{"points":>10} {"clear+draw ms":>14} {"full update ms":>15} {"blit update ms":>15} '
+          f'{"redraw ms":>10} {"in budget":>10}')
+
+    for count in point_counts:
+        x, y = make_points(count, seed=0)
+        x2, y2 = make_points(count, seed=1)
+
+        # The previous update_charts: clear, scatter from lists, tight_layout, full draw
+        old_canvas = MatplotlibCanvas(width=5, height=4)
+        old_canvas.show()
+
+        def redraw_all():
+            axes = old_canvas.axes
+            axes.clear()
+            axes.scatter(x.tolist(), y.tolist(), alpha=0.6, c='#2ecc71', s=50)
+            axes.set_xlabel('Pressure (bar)')
+            axes.set_ylabel('Temperature (°C)')
+            axes.set_title('Pressure vs Temperature Analysis')
+            axes.grid(True, alpha=0.3)
+            old_canvas.figure.tight_layout()
+            old_canvas.draw()
+
+        old_ms = best_of(redraw_all, repeat=1 if count > 100000 else 3)
+
+        canvas = MatplotlibCanvas(width=5, height=4)
+        canvas.show()
+        engine = ScatterChartEngine(canvas)
+        engine.set_labels('Pressure vs Temperature Analysis', 'Pressure (bar)', 'Temperature (°C)')
+        app.processEvents()
+
+        def full_update():
+            # Force new limits so the update takes the full-redraw path
+            engine.axes.set_xlim(0, 1)
+            engine.update(x, y)
+            app.processEvents()
+
+        def blit_update():
+            engine.update(x2, y2)
+            app.processEvents()
+
+        def redraw():
+            engine.refresh()
+            app.processEvents()
+
+        full_ms = best_of(full_update)
+        blit_update()
+        blit_ms = best_of(blit_update)
+        redraw_ms = best_of(redraw)
+
+        print(f'{count:>10} {old_ms:>14.1f} {full_ms:>15.1f} {blit_ms:>15.1f} {redraw_ms:>10.1f} '
+              f'{"yes" if redraw_ms <= FRAME_BUDGET_MS else "no":>10}')
+        sys.stdout.flush()
+        old_canvas.close()
+        canvas.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [2000, 10000, 100000, 1000000])
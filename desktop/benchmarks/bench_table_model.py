@@ -0,0 +1,124 @@
+"""
+Benchmark the equipment data table
+Compares filling a QTableWidget item by item with loading RecordTableModel behind a QTableView
+
+Usage: python -m benchmarks.bench_table_model [rows ...]
+Each measurement runs in its own subprocess so peak RSS reflects one table only.
+Set QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# QTableWidget needs minutes and gigabytes beyond this size, so larger runs skip it
+WIDGET_MAX_ROWS = 100000
+
+EQUIPMENT_TYPES = ['Pump', 'Compressor', 'Valve', 'HeatExchanger', 'Reactor', 'Condenser']
+
+
+def make_records(rows, seed=0):
+    """Record dicts shaped like the API's equipment_records."""
+    rng = np.random.default_rng(seed)
+    types = rng.choice(EQUIPMENT_TYPES, rows).tolist()
+    values = rng.uniform([50, 2, 80], [300, 15, 200], size=(rows, 3)).tolist()
+    return [
+        {
+            'equipment_name': f'{equipment_type}-{index}',
+            'equipment_type': equipment_type,
+            'flowrate': flowrate,
+            'pressure': pressure,
+            'temperature': temperature,
+        }
+        for index, (equipment_type, (flowrate, pressure, temperature)) in enumerate(zip(types, values))
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def fill_widget(app, records):
+    """The previous populate_table: five QTableWidgetItems per record."""
+    from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem
+
+    table = QTableWidget()
+    table.setColumnCount(5)
+    table.setRowCount(len(records))
+    for row, record in enumerate(records):
+        table.setItem(row, 0, QTableWidgetItem(record.get('equipment_name', '')))
+        table.setItem(row, 1, QTableWidgetItem(record.get('equipment_type', '')))
+        table.setItem(row, 2, QTableWidgetItem(f"{record.get('flowrate', 0):.2f}"))
+        table.setItem(row, 3, QTableWidgetItem(f"{record.get('pressure', 0):.2f}"))
+        table.setItem(row, 4, QTableWidgetItem(f"{record.get('temperature', 0):.2f}"))
+    table.show()
+    app.processEvents()
+    return table
+
+
+def fill_model(app, records):
+    """RecordStore + RecordTableModel behind a QTableView."""
+    from PyQt5.QtWidgets import QHeaderView, QTableView
+    from record_table import RecordStore, RecordTableModel
+
+    model = RecordTableModel(RecordStore.from_records(records))
+    view = QTableView()
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.setModel(model)
+    view.show()
+    app.processEvents()
+    return view
+
+
+def run(mode, rows):
+    """Measure one table in this process and print a result line."""
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication([])
+    records = make_records(rows)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    table, elapsed = timed(fill_widget if mode == 'widget' else fill_model, app, records)
+    # ru_maxrss is reported in kilobytes on Linux
+    table_rss = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss) / 1024
+
+    extra = ''
+    if mode == 'model':
+        model = table.model()
+        _, sort_name = timed(model.sort, 0, Qt.AscendingOrder)
+        _, sort_pressure = timed(model.sort, 3, Qt.DescendingOrder)
+        _, filter_type = timed(model.set_filter, '', 'Pump')
+        _, filter_name = timed(model.set_filter, '-12', None)
+        extra = (f'{sort_name * 1000:>10.0f} {sort_pressure * 1000:>10.0f} '
+                 f'{filter_type * 1000:>10.0f} {filter_name * 1000:>10.0f}')
+
+    print(f'{rows:>10} {mode:>7} {elapsed:>9.2f} {table_rss:>11.1f} {extra}')
+
+
+def main(row_counts):
+    print(f'{"rows":>10} {"table":>7} {"load s":>9} {"RSS MB":>11} '
+          f'{"sort name":>10} {"sort num":>10} {"type ms":>10} {"name ms":>10}')
+    sys.stdout.flush()
+    for rows in row_counts:
+        for mode in ('widget', 'model'):
+            if mode == 'widget' and rows > WIDGET_MAX_ROWS:
+                print(f'{rows:>10} {mode:>7}   skipped (above {WIDGET_MAX_ROWS} rows)')
+                sys.stdout.flush()
+                continue
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_table_model', '--run', mode, str(rows)],
+                check=True
+            )
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--run']:
+        run(sys.argv[2], int(sys.argv[3]))
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
@@ -0,0 +1,235 @@
+"""
+Chart engine for the Chemical Equipment Parameter Visualizer desktop app
+Updates long-lived Matplotlib artists in place and redraws them with blitting; large scatter plots switch to a density image
+"""
+
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+
+# Scatter plots with more points than this are drawn as a density image (or decimated)
+DEFAULT_DENSITY_THRESHOLD = 5000
+# Bins per axis of the density image
+DENSITY_GRID_SIZE = 200
+# Fraction of the data range added around it when axis limits are reset
+LIMIT_MARGIN = 0.05
+
+DEFAULT_BAR_COLORS = ['#3498db', '#e74c3c', '#f39c12', '#2ecc71', '#9b59b6', '#1abc9c']
+
+
+class MatplotlibCanvas(FigureCanvas):
+    """
+    Canvas for embedding Matplotlib figures in PyQt5
+    """
+    def __init__(self, parent=None, width=6, height=4, dpi=100):
+        self.figure = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = self.figure.add_subplot(111)
+        super().__init__(self.figure)
+        self.setParent(parent)
+
+
+class ChartEngine:
+    """
+    Blitting base for one axes.
+
+    Data artists are marked animated, so full draws (first show, resize, new
+    axis limits or tick labels) paint only the static parts. The draw_event
+    handler caches that background and paints the animated artists over it;
+    later updates restore the cached background and repaint just those
+    artists, which costs the same whatever the axes decorations are.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.axes = canvas.axes
+        self._background = None
+        self._artists = []
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _animate(self, artist):
+        artist.set_animated(True)
+        self._artists.append(artist)
+        return artist
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self._artists:
+            if artist.get_visible():
+                self.axes.draw_artist(artist)
+
+    def refresh(self, full=False):
+        """
+        Show the current artist state. A full redraw is scheduled when the static
+        parts changed (or nothing has been drawn yet); otherwise the artists are blitted.
+        """
+        if full or self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.figure.bbox)
+
+
+def _padded_range(values):
+    """(low, high) of finite values with a margin; a unit range around single values."""
+    if len(values) == 0:
+        return 0.0, 1.0
+    low, high = float(values.min()), float(values.max())
+    if high == low:
+        return low - 0.5, high + 0.5
+    margin = (high - low) * LIMIT_MARGIN
+    return low - margin, high + margin
+
+
+def _fits(current, wanted):
+    """
+    Whether the current axis range can stay: it contains the wanted range and the
+    data still spans at least half of it.
+    """
+    (low, high), (wanted_low, wanted_high) = current, wanted
+    return low <= wanted_low and wanted_high <= high and (wanted_high - wanted_low) >= 0.5 * (high - low)
+
+
+def density_counts(x, y, extent, size=DENSITY_GRID_SIZE):
+    """
+    Count points per cell of a size x size grid over extent (x0, x1, y0, y1).
+    Rows are y bins, as imshow(origin='lower') expects. Bin indices are computed
+    arithmetically and counted with bincount, which is much faster than histogram2d.
+    """
+    x0, x1, y0, y1 = extent
+    ix = ((x - x0) * (size / (x1 - x0))).astype(np.intp)
+    iy = ((y - y0) * (size / (y1 - y0))).astype(np.intp)
+    np.clip(ix, 0, size - 1, out=ix)
+    np.clip(iy, 0, size - 1, out=iy)
+    return np.bincount(iy * size + ix, minlength=size * size).reshape(size, size)
+
+
+class ScatterChartEngine(ChartEngine):
+    """
+    Scatter plot that keeps one PathCollection and one density image.
+
+    Up to density_threshold points are drawn as markers through set_offsets.
+    Above it, mode='density' bins the points into a DENSITY_GRID_SIZE grid shown
+    with imshow (drawing cost no longer depends on the number of points), and
+    mode='decimate' draws an evenly strided subset of density_threshold points.
+    """
+
+    def __init__(self, canvas, density_threshold=DEFAULT_DENSITY_THRESHOLD, mode='density',
+                 color='#2ecc71', marker_size=50):
+        super().__init__(canvas)
+        self.density_threshold = density_threshold
+        self.mode = mode
+
+        self.points = self._animate(self.axes.scatter([], [], s=marker_size, c=color, alpha=0.6))
+        self.density = self._animate(self.axes.imshow(
+            np.ma.masked_all((1, 1)), origin='lower', aspect='auto', cmap='viridis',
+            interpolation='nearest', extent=(0, 1, 0, 1), visible=False
+        ))
+        self.caption = self._animate(self.axes.text(
+            0.99, 0.01, '', transform=self.axes.transAxes, ha='right', va='bottom', fontsize=8, color='#555555'
+        ))
+        # imshow switches autoscaling off; limits are managed in update()
+        self.axes.set_xlim(0, 1)
+        self.axes.set_ylim(0, 1)
+
+    def set_labels(self, title, xlabel, ylabel):
+        self.axes.set_title(title)
+        self.axes.set_xlabel(xlabel)
+        self.axes.set_ylabel(ylabel)
+        self.axes.grid(True, alpha=0.3)
+        self.figure.tight_layout()
+        self.refresh(full=True)
+
+    def update(self, x, y):
+        """Show new points, redrawing fully only when the axis limits have to change."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            x, y = x[finite], y[finite]
+
+        x_range, y_range = _padded_range(x), _padded_range(y)
+        full = not (_fits(self.axes.get_xlim(), x_range) and _fits(self.axes.get_ylim(), y_range))
+        if full:
+            self.axes.set_xlim(*x_range)
+            self.axes.set_ylim(*y_range)
+
+        count = len(x)
+        if count > self.density_threshold and self.mode == 'density':
+            extent = (*self.axes.get_xlim(), *self.axes.get_ylim())
+            counts = density_counts(x, y, extent)
+            self.density.set_data(np.ma.masked_equal(counts, 0))
+            self.density.set_extent(extent)
+            self.density.set_clim(1, max(int(counts.max()), 1))
+            self.density.set_visible(True)
+            self.points.set_visible(False)
+            self.caption.set_text(f'density of {count:,} points')
+        else:
+            if count > self.density_threshold:
+                step = int(np.ceil(count / self.density_threshold))
+                x, y = x[::step], y[::step]
+                self.caption.set_text(f'{len(x):,} of {count:,} points')
+            else:
+                self.caption.set_text('')
+            self.points.set_offsets(np.column_stack([x, y]))
+            self.points.set_visible(True)
+            self.density.set_visible(False)
+
+        self.refresh(full=full)
+
+
+class BarChartEngine(ChartEngine):
+    """
+    Bar chart that updates rectangle heights in place. Bars are rebuilt (with a
+    full redraw for the new tick labels) only when the categories change.
+    """
+
+    def __init__(self, canvas, colors=DEFAULT_BAR_COLORS):
+        super().__init__(canvas)
+        self.colors = colors
+        self._labels = None
+        self._bars = None
+
+    def set_labels(self, title, xlabel, ylabel):
+        self.axes.set_title(title)
+        self.axes.set_xlabel(xlabel)
+        self.axes.set_ylabel(ylabel)
+        self.refresh(full=True)
+
+    def update(self, labels, counts):
+        labels = [str(label) for label in labels]
+        counts = np.asarray(counts, dtype=np.float64)
+        top = max(float(counts.max()) if len(counts) else 0.0, 1.0) * 1.1
+
+        if labels != self._labels:
+            if self._bars is not None:
+                self._bars.remove()
+            self._artists = []
+            colors = [self.colors[index % len(self.colors)] for index in range(len(labels))]
+            # Numeric positions: a categorical axis would keep the categories of earlier uploads
+            positions = np.arange(len(labels))
+            self._bars = self.axes.bar(positions, counts, color=colors)
+            for bar in self._bars:
+                self._animate(bar)
+            self._labels = labels
+            self.axes.set_xticks(positions)
+            self.axes.set_xticklabels(labels, rotation=45)
+            self.axes.set_xlim(-0.5, max(len(labels), 1) - 0.5)
+            self.axes.set_ylim(0, top)
+            # Layout only has to change with the tick labels
+            self.figure.tight_layout()
+            self.refresh(full=True)
+            return
+
+        for bar, count in zip(self._bars, counts):
+            bar.set_height(count)
+        low, high = self.axes.get_ylim()
+        full = not _fits((low, high), (0.0, top / 1.1))
+        if full:
+            self.axes.set_ylim(0, top)
+        self.refresh(full=full)
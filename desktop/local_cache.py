@@ -0,0 +1,196 @@
+"""
+Local upload cache for the Chemical Equipment Parameter Visualizer desktop app
+Keeps viewed uploads on disk (an .npz of record columns per upload, indexed in SQLite) for instant reopening and offline use, plus the sessions of unfinished chunked uploads
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import numpy as np
+from record_table import NUMERIC_COLUMNS, RecordStore
+
+
+# EQUIPMENT_CACHE_DIR overrides the location
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.chemical_equipment_visualizer', 'cache')
+# Least recently viewed uploads are evicted above this total size
+DEFAULT_MAX_SIZE = 500 * 1024 * 1024
+
+def _pack_strings(values):
+    """
+    One UTF-8 blob of the concatenated strings plus the end offset (in characters)
+    of each string, so any character, separators included, survives the round trip.
+    """
+    ends = np.cumsum(np.fromiter((len(value) for value in values), dtype=np.int64, count=len(values)))
+    return np.frombuffer(''.join(values).encode('utf-8'), dtype=np.uint8), ends
+
+
+def _unpack_strings(blob, ends):
+    text = blob.tobytes().decode('utf-8')
+    starts = np.concatenate([[0], ends[:-1]]).tolist()
+    return [text[start:end] for start, end in zip(starts, ends.tolist())]
+
+
+class LocalCache:
+    """
+    On-disk cache of uploads keyed by upload id, remembering the server's ETag.
+
+    Each upload is one uncompressed .npz holding its record columns, so reopening
+    needs no parsing; the SQLite index keeps the upload summary, ETag, file size
+    and last access time used for LRU eviction. Methods may be called from
+    worker threads: each opens its own SQLite connection and writes are serialized.
+    """
+
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory or os.environ.get('EQUIPMENT_CACHE_DIR') or DEFAULT_CACHE_DIR
+        self.max_size = max_size
+        self._write_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        with self._database() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS uploads ('
+                'upload_id INTEGER PRIMARY KEY, etag TEXT, summary TEXT NOT NULL, '
+                'size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            # Server sessions of unfinished chunked uploads, so they can be resumed
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS upload_sessions ('
+                'file_key TEXT PRIMARY KEY, session_id INTEGER NOT NULL, created REAL NOT NULL)'
+            )
+
+    @contextmanager
+    def _database(self):
+        """A short-lived connection, committed and closed on exit."""
+        db = sqlite3.connect(os.path.join(self.directory, 'index.sqlite3'), timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _data_path(self, upload_id):
+        return os.path.join(self.directory, f'upload_{upload_id}.npz')
+
+    def etag(self, upload_id):
+        """ETag the cached copy was fetched with, or None."""
+        with self._database() as db:
+            row = db.execute('SELECT etag FROM uploads WHERE upload_id = ?', (upload_id,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, upload_id):
+        """
+        Load a cached upload and mark it as recently used.
+
+        Returns:
+            tuple: (summary dict, RecordStore, etag), or None when not cached
+        """
+        with self._database() as db:
+            row = db.execute('SELECT summary, etag FROM uploads WHERE upload_id = ?', (upload_id,)).fetchone()
+            if row is None:
+                return None
+            db.execute('UPDATE uploads SET last_access = ? WHERE upload_id = ?', (time.time(), upload_id))
+
+        try:
+            with np.load(self._data_path(upload_id)) as arrays:
+                store = RecordStore(
+                    np.array(_unpack_strings(arrays['names'], arrays['name_ends']), dtype=object),
+                    arrays['type_codes'],
+                    _unpack_strings(arrays['types'], arrays['type_ends']),
+                    {key: arrays[key] for key in NUMERIC_COLUMNS}
+                )
+        except (OSError, KeyError, ValueError):
+            # The data file is gone or damaged; forget the entry
+            self.discard(upload_id)
+            return None
+        return json.loads(row[0]), store, row[1]
+
+    def latest(self):
+        """The most recently viewed upload, as returned by get(), or None."""
+        with self._database() as db:
+            row = db.execute('SELECT upload_id FROM uploads ORDER BY last_access DESC LIMIT 1').fetchone()
+        return self.get(row[0]) if row else None
+
+    def put(self, summary, store, etag=None):
+        """
+        Store an upload (summary without records, plus its RecordStore) and
+        evict least recently used uploads beyond max_size.
+        """
+        upload_id = summary['id']
+        path = self._data_path(upload_id)
+        names, name_ends = _pack_strings(store.names.tolist())
+        types, type_ends = _pack_strings(list(store.types))
+        # A unique temporary file per writer, so concurrent puts of one upload cannot interleave
+        fd, partial_path = tempfile.mkstemp(prefix=f'upload_{upload_id}.', suffix='.part', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    names=names,
+                    name_ends=name_ends,
+                    types=types,
+                    type_ends=type_ends,
+                    type_codes=np.asarray(store.type_codes, dtype=np.int32),
+                    **store.numeric
+                )
+            os.replace(partial_path, path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        with self._write_lock, self._database() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO uploads (upload_id, etag, summary, size, last_access) VALUES (?, ?, ?, ?, ?)',
+                (upload_id, etag, json.dumps(summary), os.path.getsize(path), time.time())
+            )
+            self._evict(db, keep=upload_id)
+
+    def _evict(self, db, keep):
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM uploads').fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = db.execute(
+            'SELECT upload_id, size FROM uploads WHERE upload_id != ? ORDER BY last_access', (keep,)
+        ).fetchall()
+        for upload_id, size in rows:
+            if total <= self.max_size:
+                break
+            db.execute('DELETE FROM uploads WHERE upload_id = ?', (upload_id,))
+            self._remove_file(upload_id)
+            total -= size
+
+    def _remove_file(self, upload_id):
+        try:
+            os.remove(self._data_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def discard(self, upload_id):
+        """Drop one upload from the cache."""
+        with self._write_lock, self._database() as db:
+            db.execute('DELETE FROM uploads WHERE upload_id = ?', (upload_id,))
+        self._remove_file(upload_id)
+
+    def total_size(self):
+        with self._database() as db:
+            return db.execute('SELECT COALESCE(SUM(size), 0) FROM uploads').fetchone()[0]
+
+    def upload_session(self, file_key):
+        """Server session id of an unfinished chunked upload of this file, or None."""
+        with self._database() as db:
+            row = db.execute('SELECT session_id FROM upload_sessions WHERE file_key = ?', (file_key,)).fetchone()
+        return row[0] if row else None
+
+    def remember_upload_session(self, file_key, session_id):
+        with self._write_lock, self._database() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO upload_sessions (file_key, session_id, created) VALUES (?, ?, ?)',
+                (file_key, session_id, time.time())
+            )
+
+    def forget_upload_session(self, file_key):
+        with self._write_lock, self._database() as db:
+            db.execute('DELETE FROM upload_sessions WHERE file_key = ?', (file_key,))
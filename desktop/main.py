@@ -6,60 +6,30 @@ FOSSEE Internship Technical Screening Project
 """
 
 import sys
-import requests
 import json
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTableWidget, QTableWidgetItem, QLabel, QFileDialog,
-    QMessageBox, QTabWidget, QGroupBox, QGridLayout
+    QPushButton, QTableView, QLabel, QFileDialog, QLineEdit, QComboBox,
+    QMessageBox, QTabWidget, QGroupBox, QGridLayout, QProgressBar, QHeaderView
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
+from api_client import ApiClient
+from chart_engine import BarChartEngine, MatplotlibCanvas, ScatterChartEngine
+from local_cache import LocalCache
+from record_table import RecordStore, RecordTableModel
 
 # Backend API configuration
 API_BASE_URL = 'http://localhost:8000/api'
-
-
-class UploadThread(QThread):
-    """
-    Background thread for CSV upload to prevent UI freezing
-    Emits signals for success and failure
-    """
-    upload_success = pyqtSignal(dict)
-    upload_error = pyqtSignal(str)
-    
-    def __init__(self, file_path):
-        super().__init__()
-        self.file_path = file_path
-    
-    def run(self):
-        """Execute file upload in background"""
-        try:
-            with open(self.file_path, 'rb') as f:
-                files = {'csv_file': f}
-                response = requests.post(f'{API_BASE_URL}/upload/', files=files)
-                
-                if response.status_code == 201:
-                    self.upload_success.emit(response.json())
-                else:
-                    error_msg = response.json().get('error', 'Upload failed')
-                    self.upload_error.emit(error_msg)
-        except Exception as e:
-            self.upload_error.emit(f'Error uploading file: {str(e)}')
-
-
-class MatplotlibCanvas(FigureCanvas):
-    """
-    Canvas for embedding Matplotlib figures in PyQt5
-    """
-    def __init__(self, parent=None, width=6, height=4, dpi=100):
-        self.figure = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = self.figure.add_subplot(111)
-        super().__init__(self.figure)
-        self.setParent(parent)
+# Scatter points requested from the server's downsampled chart data
+MAX_SCATTER_POINTS = 2000
+# Scatter plots with more points (e.g. local records) are drawn as a density image
+SCATTER_DENSITY_THRESHOLD = 5000
+# Only completed uploads are final and worth keeping in the local cache
+STATUS_COMPLETED = 'completed'
+# Delay between polls of a server-side ingestion job
+JOB_POLL_INTERVAL_MS = 1000
 
 
 class ChemicalEquipmentVisualizer(QMainWindow):
@@ -71,7 +41,19 @@ class ChemicalEquipmentVisualizer(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_data = None
+        # ETag of the last history response, so unchanged syncs transfer nothing
+        self.sync_etag = None
+        # Every request runs on the client's worker pool, off the GUI thread
+        self.api = ApiClient(API_BASE_URL, parent=self)
+        # Requests shown in the status bar progress indicator
+        self.active_tasks = []
+        self.scatter_task = None
+        # Ingestion job being polled after an upload, None when there is none
+        self.polled_job_id = None
+        # Viewed uploads kept on disk, for instant reopening and offline use
+        self.cache = LocalCache()
         self.init_ui()
+        self.load_cached_upload()
         
     def init_ui(self):
         """Initialize the user interface"""
@@ -136,14 +118,35 @@ class ChemicalEquipmentVisualizer(QMainWindow):
         # Tab widget for data and charts
         self.tab_widget = QTabWidget()
         
-        # Data table tab
-        self.data_table = QTableWidget()
-        self.data_table.setColumnCount(5)
-        self.data_table.setHorizontalHeaderLabels([
-            'Equipment Name', 'Type', 'Flowrate', 'Pressure (bar)', 'Temperature (°C)'
-        ])
+        # Data table tab - a model/view table that only formats visible rows
+        data_widget = QWidget()
+        data_layout = QVBoxLayout(data_widget)
+        
+        filter_layout = QHBoxLayout()
+        self.name_filter_edit = QLineEdit()
+        self.name_filter_edit.setPlaceholderText('Filter by equipment name...')
+        self.name_filter_edit.textChanged.connect(self.apply_table_filter)
+        filter_layout.addWidget(self.name_filter_edit)
+        
+        self.type_filter_combo = QComboBox()
+        self.type_filter_combo.addItem('All types')
+        self.type_filter_combo.currentIndexChanged.connect(self.apply_table_filter)
+        filter_layout.addWidget(self.type_filter_combo)
+        
+        self.row_count_label = QLabel('')
+        filter_layout.addWidget(self.row_count_label)
+        data_layout.addLayout(filter_layout)
+        
+        self.table_model = RecordTableModel(parent=self)
+        self.data_table = QTableView()
+        self.data_table.setModel(self.table_model)
+        self.data_table.setSortingEnabled(True)
         self.data_table.horizontalHeader().setStretchLastSection(True)
-        self.tab_widget.addTab(self.data_table, 'Equipment Data')
+        # Fixed row heights keep Qt from measuring every row
+        self.data_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        data_layout.addWidget(self.data_table)
+        
+        self.tab_widget.addTab(data_widget, 'Equipment Data')
         
         # Charts tab
         charts_widget = QWidget()
@@ -151,18 +154,76 @@ class ChemicalEquipmentVisualizer(QMainWindow):
         
         # Bar chart for equipment types
         self.bar_chart_canvas = MatplotlibCanvas(self, width=5, height=4)
+        self.bar_chart = BarChartEngine(self.bar_chart_canvas)
+        self.bar_chart.set_labels('Equipment Type Distribution', 'Equipment Type', 'Count')
         charts_layout.addWidget(self.bar_chart_canvas)
         
         # Scatter plot for pressure vs temperature
         self.scatter_chart_canvas = MatplotlibCanvas(self, width=5, height=4)
+        self.scatter_chart = ScatterChartEngine(self.scatter_chart_canvas, density_threshold=SCATTER_DENSITY_THRESHOLD)
+        self.scatter_chart.set_labels('Pressure vs Temperature Analysis', 'Pressure (bar)', 'Temperature (°C)')
         charts_layout.addWidget(self.scatter_chart_canvas)
         
         self.tab_widget.addTab(charts_widget, 'Visualizations')
         
         main_layout.addWidget(self.tab_widget)
         
-        # Status bar
+        # Status bar with progress of running requests
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        
+        self.cancel_btn = QPushButton('Cancel')
+        self.cancel_btn.clicked.connect(self.cancel_requests)
+        self.cancel_btn.setVisible(False)
+        self.statusBar().addPermanentWidget(self.cancel_btn)
+        
         self.statusBar().showMessage('Ready')
+    
+    def track_task(self, task, message):
+        """Show a request's progress in the status bar until it completes"""
+        self.statusBar().showMessage(message)
+        self.active_tasks.append(task)
+        task.signals.progress.connect(self.on_task_progress)
+        task.signals.done.connect(lambda: self.on_task_done(task))
+        
+        # Busy indicator until the first progress report arrives
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        return task
+    
+    def on_task_progress(self, transferred, total):
+        """Update the progress bar; totals are unknown for chunked responses"""
+        if total > 0:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(int(transferred * 100 / total))
+        else:
+            self.progress_bar.setRange(0, 0)
+    
+    def on_task_done(self, task):
+        """Hide the progress indicator once no tracked request is running"""
+        if task in self.active_tasks:
+            self.active_tasks.remove(task)
+        if not self.active_tasks:
+            self.progress_bar.setVisible(False)
+            self.cancel_btn.setVisible(False)
+    
+    def cancel_requests(self):
+        """Cancel every running upload, sync or download"""
+        for task in self.active_tasks:
+            task.cancel()
+        if self.polled_job_id is not None:
+            # The server keeps ingesting; the app just stops waiting for it
+            self.polled_job_id = None
+            self.upload_btn.setEnabled(True)
+        self.statusBar().showMessage('Cancelling...')
+    
+    def on_task_cancelled(self, button):
+        """Re-enable the button of a cancelled request"""
+        button.setEnabled(True)
+        self.statusBar().showMessage('Cancelled')
         
     def upload_csv(self):
         """Handle CSV file selection and upload"""
@@ -174,14 +235,72 @@ class ChemicalEquipmentVisualizer(QMainWindow):
         )
         
         if file_path:
-            self.statusBar().showMessage('Uploading file...')
             self.upload_btn.setEnabled(False)
             
-            # Create and start upload thread
-            self.upload_thread = UploadThread(file_path)
-            self.upload_thread.upload_success.connect(self.on_upload_success)
-            self.upload_thread.upload_error.connect(self.on_upload_error)
-            self.upload_thread.start()
+            # Resumable chunked upload on the worker pool, streamed from disk
+            task = self.track_task(self.api.upload_chunked(file_path, sessions=self.cache), 'Uploading file...')
+            task.signals.finished.connect(self.on_upload_finished)
+            task.signals.failed.connect(lambda error: self.on_upload_error(f'Error uploading file: {error}'))
+            task.signals.cancelled.connect(lambda: self.on_task_cancelled(self.upload_btn))
+    
+    def on_upload_finished(self, result):
+        """Handle the server's answer to an upload"""
+        try:
+            payload = result.json()
+        except ValueError:
+            payload = {}
+        
+        # 201 for a new upload, 200 when the server already had an identical file
+        if result.status_code in (200, 201) and 'data' in payload:
+            self.on_upload_success(payload)
+        elif result.status_code in (200, 202) and 'job_id' in payload:
+            # The identical file is still being ingested (or was queued): wait for its job
+            self.poll_ingestion_job(payload['job_id'], payload['upload_id'])
+        else:
+            self.on_upload_error(result.error_message('Upload failed'))
+    
+    def poll_ingestion_job(self, job_id, upload_id):
+        """Ask the server how far a background ingestion job has got"""
+        self.polled_job_id = job_id
+        task = self.track_task(self.api.get(f'/jobs/{job_id}/'), 'Processing upload on server...')
+        task.signals.finished.connect(lambda result: self.on_job_status(job_id, upload_id, result))
+        task.signals.failed.connect(lambda error: self.on_upload_error(f'Error checking upload progress: {error}'))
+        task.signals.cancelled.connect(lambda: self.on_task_cancelled(self.upload_btn))
+    
+    def on_job_status(self, job_id, upload_id, result):
+        """Poll again while the job runs; load the upload once it has completed"""
+        if self.polled_job_id != job_id:
+            return
+        if result.status_code != 200:
+            self.polled_job_id = None
+            self.on_upload_error(result.error_message('Error checking upload progress'))
+            return
+        
+        job = result.json()
+        if job['phase'] == 'completed':
+            self.polled_job_id = None
+            task = self.track_task(self.api.get(f'/upload/{upload_id}/'), 'Loading processed upload...')
+            task.signals.finished.connect(self.on_processed_upload_loaded)
+            task.signals.failed.connect(lambda error: self.on_upload_error(f'Error loading upload: {error}'))
+            task.signals.cancelled.connect(lambda: self.on_task_cancelled(self.upload_btn))
+        elif job['phase'] == 'failed':
+            self.polled_job_id = None
+            self.on_upload_error(job.get('error') or 'Processing failed on the server')
+        else:
+            self.statusBar().showMessage(f'Processing upload on server... {job.get("rows_processed", 0):,} rows')
+            QTimer.singleShot(JOB_POLL_INTERVAL_MS, lambda: self.on_job_poll_due(job_id, upload_id))
+    
+    def on_job_poll_due(self, job_id, upload_id):
+        """Poll a job again unless waiting for it was cancelled meanwhile"""
+        if self.polled_job_id == job_id:
+            self.poll_ingestion_job(job_id, upload_id)
+    
+    def on_processed_upload_loaded(self, result):
+        """Show an upload whose background ingestion has completed"""
+        if result.status_code == 200:
+            self.on_upload_success({'data': result.json()})
+        else:
+            self.on_upload_error(result.error_message('Error loading upload'))
     
     def on_upload_success(self, response):
         """Handle successful upload"""
@@ -192,6 +311,10 @@ class ChemicalEquipmentVisualizer(QMainWindow):
         self.current_data = response.get('data', {})
         self.update_display()
         
+        # Large uploads come back without their records, so only complete responses are cached
+        if response.get('records_included', 'equipment_records' in self.current_data):
+            self.cache_upload(self.current_data, self.table_model.store)
+        
         QMessageBox.information(self, 'Success', 'CSV file processed successfully!')
     
     def on_upload_error(self, error_msg):
@@ -200,35 +323,132 @@ class ChemicalEquipmentVisualizer(QMainWindow):
         self.upload_btn.setEnabled(True)
         QMessageBox.critical(self, 'Upload Error', error_msg)
     
-    def sync_from_server(self):
-        """Fetch latest upload history from server"""
-        self.statusBar().showMessage('Syncing from server...')
-        
-        try:
-            response = requests.get(f'{API_BASE_URL}/history/')
+    def load_cached_upload(self):
+        """Show the last viewed upload from the local cache, then check the server for newer data"""
+        task = self.api.call(self.cache.latest)
+        task.signals.finished.connect(self.on_cached_upload_loaded)
+        task.signals.failed.connect(lambda error: self.sync_from_server(quiet=True))
+    
+    def on_cached_upload_loaded(self, cached):
+        """Display the cached upload (if any) before the first network round trip"""
+        if cached is not None and not self.current_data:
+            summary, store, _ = cached
+            self.current_data = summary
+            self.update_display(store)
+            self.statusBar().showMessage(f'Showing cached upload (ID: {summary["id"]}) - checking server...')
+        self.sync_from_server(quiet=True)
+    
+    def cache_upload(self, data, store, etag=None):
+        """Write an upload to the local cache on the worker pool"""
+        summary = {key: value for key, value in data.items() if key != 'equipment_records'}
+        task = self.api.call(self.cache.put, summary, store, etag)
+        task.signals.failed.connect(lambda error: print(f'Could not cache upload {summary["id"]}: {error}'))
+    
+    def sync_from_server(self, quiet=False):
+        """
+        Fetch the latest upload from the server, transferring records only when
+        they are not already cached with the server's current ETag.
+        Quiet syncs (at startup) report in the status bar instead of message boxes.
+        """
+        self.sync_btn.setEnabled(False)
+        
+        # Only the latest upload's summary is needed to decide what to fetch
+        headers = {'If-None-Match': self.sync_etag} if self.sync_etag and self.current_data else {}
+        task = self.api.get('/history/', params={'limit': 1}, headers=headers)
+        self.track_task(task, 'Syncing from server...')
+        task.signals.finished.connect(lambda result: self.on_sync_finished(result, quiet))
+        task.signals.failed.connect(lambda error: self.on_sync_error(error, quiet, offline=True))
+        task.signals.cancelled.connect(lambda: self.on_task_cancelled(self.sync_btn))
+    
+    def on_sync_finished(self, result, quiet=False):
+        """Open the latest upload named by a history response"""
+        if result.status_code == 304:
+            self.sync_btn.setEnabled(True)
+            self.statusBar().showMessage('Already up to date - no new uploads on server')
+        elif result.status_code == 200:
+            self.sync_etag = result.headers.get('ETag')
+            history = result.json().get('history', [])
             
-            if response.status_code == 200:
-                data = response.json()
-                history = data.get('history', [])
-                
-                if history:
-                    # Load the most recent upload
-                    self.current_data = history[0]
-                    self.update_display()
-                    self.statusBar().showMessage(f'Synced successfully! Loaded {len(history)} recent uploads.')
-                    QMessageBox.information(self, 'Sync Complete', f'Loaded latest upload (ID: {self.current_data["id"]})')
-                else:
-                    self.statusBar().showMessage('No data available on server')
-                    QMessageBox.information(self, 'Sync Complete', 'No uploads found on server')
+            if history:
+                self.open_upload(history[0]['id'], quiet)
             else:
-                raise Exception('Failed to fetch data from server')
-                
-        except Exception as e:
-            self.statusBar().showMessage('Sync failed')
-            QMessageBox.critical(self, 'Sync Error', f'Failed to sync from server: {str(e)}')
-    
-    def update_display(self):
-        """Update all display elements with current data"""
+                self.sync_btn.setEnabled(True)
+                self.statusBar().showMessage('No data available on server')
+                if not quiet:
+                    QMessageBox.information(self, 'Sync Complete', 'No uploads found on server')
+        else:
+            self.on_sync_error(result.error_message('Failed to fetch data from server'), quiet)
+    
+    def open_upload(self, upload_id, quiet=False):
+        """Show an upload from the local cache when possible, then revalidate it with the server"""
+        task = self.api.call(self.cache.get, upload_id)
+        task.signals.finished.connect(lambda cached: self.on_cache_lookup(upload_id, cached, quiet))
+        task.signals.failed.connect(lambda error: self.on_cache_lookup(upload_id, None, quiet))
+    
+    def on_cache_lookup(self, upload_id, cached, quiet):
+        """Display a cache hit immediately and ask the server whether it is still current"""
+        headers = {}
+        if cached is not None:
+            summary, store, etag = cached
+            if not self.current_data or self.current_data.get('id') != upload_id:
+                self.current_data = summary
+                self.update_display(store)
+            if etag:
+                headers['If-None-Match'] = etag
+        
+        task = self.api.get(f'/upload/{upload_id}/', headers=headers)
+        self.track_task(task, f'Fetching upload {upload_id}...')
+        task.signals.finished.connect(lambda result: self.on_upload_detail_finished(upload_id, result, quiet))
+        task.signals.failed.connect(lambda error: self.on_sync_error(error, quiet, offline=True))
+        task.signals.cancelled.connect(lambda: self.on_task_cancelled(self.sync_btn))
+    
+    def on_upload_detail_finished(self, upload_id, result, quiet):
+        """Keep the cached copy on 304; otherwise convert, cache and show the new records"""
+        if result.status_code == 304:
+            self.sync_btn.setEnabled(True)
+            self.statusBar().showMessage(f'Up to date - showing upload (ID: {upload_id}) from local cache')
+        elif result.status_code == 200:
+            data = result.json()
+            records = data.pop('equipment_records', [])
+            etag = result.headers.get('ETag')
+            # Column conversion and the cache write stay off the GUI thread
+            task = self.api.call(self.build_upload_store, data, records, etag)
+            task.signals.finished.connect(lambda store: self.on_upload_store_ready(data, store, quiet))
+            task.signals.failed.connect(lambda error: self.on_sync_error(error, quiet))
+        else:
+            self.on_sync_error(result.error_message('Failed to fetch data from server'), quiet)
+    
+    def build_upload_store(self, data, records, etag):
+        """Runs on the worker pool: build the columnar store and cache completed uploads"""
+        store = RecordStore.from_records(records)
+        if data.get('status') == STATUS_COMPLETED:
+            self.cache.put(data, store, etag)
+        return store
+    
+    def on_upload_store_ready(self, data, store, quiet):
+        """Show a freshly downloaded upload"""
+        self.sync_btn.setEnabled(True)
+        self.current_data = data
+        self.update_display(store)
+        self.statusBar().showMessage(f'Synced successfully! Loaded latest upload (ID: {data["id"]}).')
+        if not quiet:
+            QMessageBox.information(self, 'Sync Complete', f'Loaded latest upload (ID: {data["id"]})')
+    
+    def on_sync_error(self, error_msg, quiet=False, offline=False):
+        """Handle sync failure; without a connection the upload already shown stays usable"""
+        self.sync_btn.setEnabled(True)
+        if offline and self.current_data:
+            self.statusBar().showMessage(f'Offline - showing cached upload (ID: {self.current_data["id"]})')
+            return
+        self.statusBar().showMessage('Sync failed')
+        if not quiet:
+            QMessageBox.critical(self, 'Sync Error', f'Failed to sync from server: {error_msg}')
+    
+    def update_display(self, store=None):
+        """
+        Update all display elements with current data.
+        store holds the records when they are already in columnar form (e.g. from the local cache).
+        """
         if not self.current_data:
             return
         
@@ -241,60 +461,68 @@ class ChemicalEquipmentVisualizer(QMainWindow):
         self.download_pdf_btn.setEnabled(True)
         
         # Update data table
-        self.populate_table()
+        self.populate_table(store)
         
         # Update charts
         self.update_charts()
     
-    def populate_table(self):
-        """Populate data table with equipment records"""
-        equipment_records = self.current_data.get('equipment_records', [])
-        
-        self.data_table.setRowCount(len(equipment_records))
-        
-        for row, record in enumerate(equipment_records):
-            self.data_table.setItem(row, 0, QTableWidgetItem(record.get('equipment_name', '')))
-            self.data_table.setItem(row, 1, QTableWidgetItem(record.get('equipment_type', '')))
-            self.data_table.setItem(row, 2, QTableWidgetItem(f"{record.get('flowrate', 0):.2f}"))
-            self.data_table.setItem(row, 3, QTableWidgetItem(f"{record.get('pressure', 0):.2f}"))
-            self.data_table.setItem(row, 4, QTableWidgetItem(f"{record.get('temperature', 0):.2f}"))
+    def populate_table(self, store=None):
+        """Load equipment records into the table model's columnar store"""
+        if store is None:
+            store = RecordStore.from_records(self.current_data.get('equipment_records', []))
+        
+        # Offer the types of this upload, keeping the selection when it still exists
+        selected_type = self.type_filter_combo.currentText()
+        self.type_filter_combo.blockSignals(True)
+        self.type_filter_combo.clear()
+        self.type_filter_combo.addItem('All types')
+        self.type_filter_combo.addItems(store.types)
+        self.type_filter_combo.setCurrentIndex(max(self.type_filter_combo.findText(selected_type), 0))
+        self.type_filter_combo.blockSignals(False)
+        
+        self.table_model.set_store(store)
+        self.apply_table_filter()
+    
+    def apply_table_filter(self):
+        """Filter the table by name text and equipment type"""
+        equipment_type = self.type_filter_combo.currentText() if self.type_filter_combo.currentIndex() > 0 else None
+        self.table_model.set_filter(self.name_filter_edit.text(), equipment_type)
+        self.row_count_label.setText(f'{self.table_model.rowCount():,} of {len(self.table_model.store):,} records')
     
     def update_charts(self):
         """Update Matplotlib charts with current data"""
-        # Update bar chart - Equipment type distribution
-        self.bar_chart_canvas.axes.clear()
-        type_dist = self.current_data.get('equipment_type_distribution_json', {})
+        # Update bar chart - Equipment type distribution (bar heights are updated in place)
+        type_dist = self.current_data.get('equipment_type_distribution_json', {}) or {}
+        self.bar_chart.update(list(type_dist.keys()), list(type_dist.values()))
         
-        if type_dist:
-            types = list(type_dist.keys())
-            counts = list(type_dist.values())
-            
-            colors = ['#3498db', '#e74c3c', '#f39c12', '#2ecc71', '#9b59b6', '#1abc9c']
-            self.bar_chart_canvas.axes.bar(types, counts, color=colors[:len(types)])
-            self.bar_chart_canvas.axes.set_xlabel('Equipment Type')
-            self.bar_chart_canvas.axes.set_ylabel('Count')
-            self.bar_chart_canvas.axes.set_title('Equipment Type Distribution')
-            self.bar_chart_canvas.axes.tick_params(axis='x', rotation=45)
-        
-        self.bar_chart_canvas.figure.tight_layout()
-        self.bar_chart_canvas.draw()
-        
-        # Update scatter plot - Pressure vs Temperature
-        self.scatter_chart_canvas.axes.clear()
-        equipment_records = self.current_data.get('equipment_records', [])
-        
-        if equipment_records:
-            pressures = [r.get('pressure', 0) for r in equipment_records]
-            temperatures = [r.get('temperature', 0) for r in equipment_records]
-            
-            self.scatter_chart_canvas.axes.scatter(pressures, temperatures, alpha=0.6, c='#2ecc71', s=50)
-            self.scatter_chart_canvas.axes.set_xlabel('Pressure (bar)')
-            self.scatter_chart_canvas.axes.set_ylabel('Temperature (°C)')
-            self.scatter_chart_canvas.axes.set_title('Pressure vs Temperature Analysis')
-            self.scatter_chart_canvas.axes.grid(True, alpha=0.3)
+        # Update scatter plot - Pressure vs Temperature, from downsampled server points
+        self.fetch_scatter_points()
+    
+    def fetch_scatter_points(self):
+        """
+        Request at most MAX_SCATTER_POINTS downsampled scatter points for the current upload.
+        The local records are plotted instead when the server cannot provide them.
+        """
+        if self.scatter_task is not None:
+            self.scatter_task.cancel()
+        
+        upload_id = self.current_data['id']
+        self.scatter_task = self.api.get(f'/upload/{upload_id}/charts/', params={'max_points': MAX_SCATTER_POINTS})
+        self.scatter_task.signals.finished.connect(lambda result: self.on_scatter_finished(upload_id, result))
+        self.scatter_task.signals.failed.connect(lambda error: self.on_scatter_finished(upload_id, None))
+    
+    def on_scatter_finished(self, upload_id, result):
+        """Draw the scatter points once they arrive, unless another upload is shown by now"""
+        if not self.current_data or self.current_data.get('id') != upload_id:
+            return
         
-        self.scatter_chart_canvas.figure.tight_layout()
-        self.scatter_chart_canvas.draw()
+        if result is not None and result.status_code == 200:
+            scatter = result.json()['scatter']
+            self.scatter_chart.update(scatter['pressure'], scatter['temperature'])
+        else:
+            # Every local record, from the table's columnar store
+            store = self.table_model.store
+            self.scatter_chart.update(store.numeric['pressure'], store.numeric['temperature'])
     
     def download_pdf(self):
         """Download PDF report for current upload"""
@@ -304,32 +532,42 @@ class ChemicalEquipmentVisualizer(QMainWindow):
         
         upload_id = self.current_data.get('id')
         
-        try:
-            self.statusBar().showMessage('Downloading PDF report...')
-            
-            response = requests.get(f'{API_BASE_URL}/report/{upload_id}/')
-            
-            if response.status_code == 200:
-                # Save PDF file
-                save_path, _ = QFileDialog.getSaveFileName(
-                    self,
-                    'Save PDF Report',
-                    f'equipment_report_{upload_id}.pdf',
-                    'PDF Files (*.pdf)'
-                )
-                
-                if save_path:
-                    with open(save_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    self.statusBar().showMessage('PDF downloaded successfully!')
-                    QMessageBox.information(self, 'Success', f'PDF report saved to: {save_path}')
-            else:
-                raise Exception('Failed to generate PDF report')
-                
-        except Exception as e:
-            self.statusBar().showMessage('PDF download failed')
-            QMessageBox.critical(self, 'Download Error', f'Failed to download PDF: {str(e)}')
+        # Choose the destination first, so the report streams straight to disk
+        save_path, _ = QFileDialog.getSaveFileName(
+            self,
+            'Save PDF Report',
+            f'equipment_report_{upload_id}.pdf',
+            'PDF Files (*.pdf)'
+        )
+        if not save_path:
+            return
+        
+        self.download_pdf_btn.setEnabled(False)
+        task = self.track_task(self.api.download(f'/report/{upload_id}/', save_path), 'Downloading PDF report...')
+        task.signals.finished.connect(lambda result: self.on_pdf_finished(result, save_path))
+        task.signals.failed.connect(self.on_pdf_error)
+        task.signals.cancelled.connect(lambda: self.on_task_cancelled(self.download_pdf_btn))
+    
+    def on_pdf_finished(self, result, save_path):
+        """Report the outcome of a PDF download"""
+        if result.status_code != 200:
+            self.on_pdf_error(result.error_message('Failed to generate PDF report'))
+            return
+        
+        self.download_pdf_btn.setEnabled(True)
+        self.statusBar().showMessage('PDF downloaded successfully!')
+        QMessageBox.information(self, 'Success', f'PDF report saved to: {save_path}')
+    
+    def on_pdf_error(self, error_msg):
+        """Handle PDF download failure"""
+        self.download_pdf_btn.setEnabled(True)
+        self.statusBar().showMessage('PDF download failed')
+        QMessageBox.critical(self, 'Download Error', f'Failed to download PDF: {error_msg}')
+    
+    def closeEvent(self, event):
+        """Cancel outstanding requests before the window closes"""
+        self.api.shutdown()
+        super().closeEvent(event)
 
 
 def main():
@@ -0,0 +1,176 @@
+"""
+Equipment record table for the Chemical Equipment Parameter Visualizer desktop app
+Keeps records in NumPy columns and exposes them to a QTableView, formatting only the cells Qt asks for
+"""
+
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+# (record key, header label) in display order
+TABLE_COLUMNS = [
+    ('equipment_name', 'Equipment Name'),
+    ('equipment_type', 'Type'),
+    ('flowrate', 'Flowrate'),
+    ('pressure', 'Pressure (bar)'),
+    ('temperature', 'Temperature (°C)'),
+]
+NUMERIC_COLUMNS = ['flowrate', 'pressure', 'temperature']
+
+
+class RecordStore:
+    """
+    Equipment records held column-wise: names as an object array, types as
+    integer codes into a sorted list of type names and parameters as float64.
+    """
+
+    def __init__(self, names, type_codes, types, numeric):
+        self.names = names
+        self.type_codes = type_codes
+        self.types = types
+        self.numeric = numeric
+        self._name_ranks = None
+        self._lower_names = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Build a store from a {record key: [values]} mapping."""
+        names = np.asarray(columns.get('equipment_name', []), dtype=object)
+        raw_types = np.asarray(columns.get('equipment_type', []), dtype=str)
+        # np.unique sorts the type names, so code order is alphabetical order
+        types, type_codes = np.unique(raw_types, return_inverse=True)
+        numeric = {
+            key: np.asarray(columns.get(key, []), dtype=np.float64)
+            for key in NUMERIC_COLUMNS
+        }
+        return cls(names, type_codes, list(types), numeric)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a store from API record dicts, one pass per column."""
+        count = len(records)
+        columns = {
+            'equipment_name': [record.get('equipment_name', '') for record in records],
+            'equipment_type': [record.get('equipment_type', '') for record in records],
+        }
+        for key in NUMERIC_COLUMNS:
+            columns[key] = np.fromiter((record.get(key, 0) for record in records), dtype=np.float64, count=count)
+        return cls.from_columns(columns)
+
+    def sort_keys(self, key):
+        """Array whose argsort orders rows by the given column."""
+        if key == 'equipment_name':
+            if self._name_ranks is None:
+                # Rank names once; later sorts compare integers instead of strings
+                _, self._name_ranks = np.unique(self.names.astype(str), return_inverse=True)
+            return self._name_ranks
+        if key == 'equipment_type':
+            return self.type_codes
+        return self.numeric[key]
+
+    def name_contains(self, text):
+        """Boolean mask of rows whose name contains text, ignoring case."""
+        if self._lower_names is None:
+            self._lower_names = np.char.lower(self.names.astype(str))
+        return np.char.find(self._lower_names, text.lower()) >= 0
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Read-only table model over a RecordStore.
+
+    The model owns an index array mapping visible rows to store rows; sorting
+    and filtering rebuild that array with vectorized NumPy operations and the
+    view only asks data() for the rows on screen, so no per-cell objects exist.
+    """
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self._store = store if store is not None else RecordStore.from_columns({})
+        self._rows = np.arange(len(self._store))
+        self._sort_column = None
+        self._sort_order = Qt.AscendingOrder
+        self._name_filter = ''
+        self._type_filter = None
+
+    @property
+    def store(self):
+        return self._store
+
+    def set_store(self, store):
+        """Show a new set of records, keeping the current sort and filters."""
+        self.beginResetModel()
+        self._store = store
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(TABLE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return TABLE_COLUMNS[section][1]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = TABLE_COLUMNS[index.column()][0]
+
+        if role == Qt.DisplayRole:
+            row = self._rows[index.row()]
+            if key == 'equipment_name':
+                return self._store.names[row]
+            if key == 'equipment_type':
+                return self._store.types[self._store.type_codes[row]]
+            return f'{self._store.numeric[key][row]:.2f}'
+        if role == Qt.TextAlignmentRole and key in NUMERIC_COLUMNS:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Stable sort of the visible rows by one column."""
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._rows = self._sorted(self._rows)
+        self.layoutChanged.emit()
+
+    def set_filter(self, name_text='', equipment_type=None):
+        """
+        Show only rows whose name contains name_text (case-insensitive)
+        and, when given, of one equipment type.
+        """
+        self._name_filter = name_text.strip()
+        self._type_filter = equipment_type or None
+        self.beginResetModel()
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def _visible_rows(self):
+        store = self._store
+        mask = np.ones(len(store), dtype=bool)
+        if self._type_filter is not None:
+            if self._type_filter not in store.types:
+                return np.empty(0, dtype=np.intp)
+            mask &= store.type_codes == store.types.index(self._type_filter)
+        if self._name_filter:
+            mask &= store.name_contains(self._name_filter)
+        return self._sorted(np.flatnonzero(mask))
+
+    def _sorted(self, rows):
+        if self._sort_column is None or len(rows) == 0:
+            return rows
+        keys = self._store.sort_keys(TABLE_COLUMNS[self._sort_column][0])[rows]
+        order = np.argsort(keys, kind='stable')
+        if self._sort_order == Qt.DescendingOrder:
+            order = order[::-1]
+        return rows[order]
@@ -9,7 +9,7 @@ import FileUpload from './components/FileUpload';
 import DataTable from './components/DataTable';
 import Charts from './components/Charts';
 import Statistics from './components/Statistics';
-import { downloadPDFReport, getUploadHistory } from './services/api';
+import { downloadPDFReport, getUploadDetail, getUploadHistory } from './services/api';
 import './App.css';
 
 function App() {
@@ -85,10 +85,17 @@ function App() {
   /**
    * Load data from upload history
    */
-  const loadHistoricalData = (historyItem) => {
-    setCurrentData(historyItem);
-    setSuccess('Historical data loaded successfully');
-    setTimeout(() => setSuccess(null), 3000);
+  const loadHistoricalData = async (historyItem) => {
+    // History entries carry only metadata; fetch the records for the selected upload
+    try {
+      const detail = await getUploadDetail(historyItem.id);
+      setCurrentData(detail);
+      setSuccess('Historical data loaded successfully');
+      setTimeout(() => setSuccess(null), 3000);
+    } catch (err) {
+      setError(err.error || 'Failed to load historical data');
+      setTimeout(() => setError(null), 8000);
+    }
   };
 
   return (
@@ -3,9 +3,12 @@
  * Displays data visualizations using Chart.js
  * - Bar chart for equipment type distribution
  * - Scatter plot for Pressure vs Temperature
+ *
+ * Scatter points come from the /charts/ endpoint, which downsamples large
+ * uploads on the server so the chart always draws a fixed number of points.
  */
 
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import {
   Chart as ChartJS,
   CategoryScale,
@@ -18,6 +21,10 @@ import {
   Legend,
 } from 'chart.js';
 import { Bar, Scatter } from 'react-chartjs-2';
+import { getUploadCharts } from '../services/api';
+
+// Scatter points requested from the server, whatever the upload size
+const MAX_SCATTER_POINTS = 2000;
 
 // Register Chart.js components
 ChartJS.register(
@@ -32,8 +39,30 @@ ChartJS.register(
 );
 
 const Charts = ({ data }) => {
+  const [chartData, setChartData] = useState(null);
+  const uploadId = data?.id;
+
+  /**
+   * Fetch downsampled chart data whenever another upload is shown
+   */
+  useEffect(() => {
+    if (!uploadId) {
+      return undefined;
+    }
+    let cancelled = false;
+    setChartData(null);
+    getUploadCharts(uploadId, { max_points: MAX_SCATTER_POINTS })
+      .then((response) => {
+        if (!cancelled) setChartData(response);
+      })
+      .catch((err) => console.error('Failed to fetch chart data:', err));
+    return () => {
+      cancelled = true;
+    };
+  }, [uploadId]);
+
   // Check if data is available
-  if (!data || !data.equipment_records || data.equipment_records.length === 0) {
+  if (!data || !data.total_equipment_count) {
     return (
       <div className="alert alert-warning">
         No data available for visualization. Upload a CSV file to see charts.
@@ -79,10 +108,14 @@ const Charts = ({ data }) => {
    * Prepare data for pressure vs temperature scatter plot
    */
   const prepareScatterData = () => {
-    const scatterPoints = data.equipment_records.map((record) => ({
-      x: record.pressure,
-      y: record.temperature,
-    }));
+    // Fall back to the records in hand until the downsampled points arrive
+    const scatter = chartData?.scatter;
+    const scatterPoints = scatter
+      ? scatter.pressure.map((pressure, index) => ({ x: pressure, y: scatter.temperature[index] }))
+      : (data.equipment_records || []).slice(0, MAX_SCATTER_POINTS).map((record) => ({
+          x: record.pressure,
+          y: record.temperature,
+        }));
 
     return {
       datasets: [
@@ -141,7 +174,9 @@ const Charts = ({ data }) => {
       },
       title: {
         display: true,
-        text: 'Pressure vs Temperature Analysis',
+        text: chartData && chartData.scatter.count < chartData.total_count
+          ? `Pressure vs Temperature Analysis (${chartData.scatter.count.toLocaleString()} of ${chartData.total_count.toLocaleString()} points)`
+          : 'Pressure vs Temperature Analysis',
         font: {
           size: 16,
         },
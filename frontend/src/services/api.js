@@ -40,12 +40,13 @@ export const uploadCSV = async (file) => {
 };
 
 /**
- * Fetch upload history (last 5 uploads)
+ * Fetch upload history (metadata and statistics only, no equipment records)
+ * @param {Object} params - Optional query parameters (limit, offset, include, fields)
  * @returns {Promise} Array of recent uploads with metadata
  */
-export const getUploadHistory = async () => {
+export const getUploadHistory = async (params = {}) => {
   try {
-    const response = await apiClient.get('/history/');
+    const response = await apiClient.get('/history/', { params });
     return response.data;
   } catch (error) {
     throw error.response?.data || { error: 'Failed to fetch upload history' };
@@ -66,6 +67,21 @@ export const getUploadDetail = async (uploadId) => {
   }
 };
 
+/**
+ * Fetch fixed-size chart data for a specific upload
+ * @param {number} uploadId - ID of the upload to retrieve chart data for
+ * @param {Object} params - Optional query parameters (bins, grid_size, max_points, sampling)
+ * @returns {Promise} Histograms, density grid and downsampled scatter points
+ */
+export const getUploadCharts = async (uploadId, params = {}) => {
+  try {
+    const response = await apiClient.get(`/upload/${uploadId}/charts/`, { params });
+    return response.data;
+  } catch (error) {
+    throw error.response?.data || { error: 'Failed to fetch chart data' };
+  }
+};
+
 /**
  * Download PDF report for a specific upload
  * @param {number} uploadId - ID of the upload to generate report for
@@ -109,6 +125,7 @@ export default {
   uploadCSV,
   getUploadHistory,
   getUploadDetail,
+  getUploadCharts,
   downloadPDFReport,
   healthCheck,
 };